@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Generate random ballots for elections and label them with the vote rules.
+
+Usage: python scripts/ballot-fixtures.py [--count N] [--seed S] [--invalid-share X]
+                                         [--format npz|jsonl] [--out DIR] [--bench] [election ...]
+
+Elections are data file names or slugs (default: every election with list
+votes). For each, --count ballots are generated (see ballot_engine.py),
+evaluated and written to DIR/<slug>.<format>:
+  npz    the ballot arrays plus the evaluation results, for Python
+  jsonl  one {"state": VoteState, "expected": DerivedVoteState} per line,
+         for feeding the app's calculateDerivedState() directly
+--bench only reports generation and evaluation throughput.
+
+Ballots are generated, evaluated and written a chunk at a time, so memory
+stays bounded for any --count; the .npz arrays are filled on disk and
+zipped up at the end.
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from ballot_engine import Election
+from election_validate import load_configs, select_elections
+from pipeline import DATA_DIR, PROJECT_ROOT
+
+DEFAULT_OUT = PROJECT_ROOT / ".cache" / "ballot-fixtures"
+
+
+def write_jsonl(f, election, batch, result):
+    for i in range(len(batch["votes"])):
+        line = {"state": election.to_vote_state(batch, i), "expected": election.derived_state(result, i)}
+        f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+class NpzColumns:
+    """The arrays of an .npz file, n rows each, filled a chunk at a time.
+    They are .npy files memory-mapped in a scratch directory; save() zips
+    them up the way np.savez_compressed() does."""
+
+    def __init__(self, n, scratch):
+        self.n = n
+        self.scratch = Path(scratch)
+        self.arrays = {}
+        self.filled = 0
+
+    def append(self, arrays):
+        rows = 0
+        for key, a in arrays.items():
+            if key not in self.arrays:
+                self.arrays[key] = np.lib.format.open_memmap(
+                    self.scratch / f"{key}.npy", mode="w+", dtype=a.dtype, shape=(self.n, *a.shape[1:]),
+                )
+            self.arrays[key][self.filled:self.filled + len(a)] = a
+            rows = len(a)
+        self.filled += rows
+
+    def save(self, path, **extra):
+        keys = [*self.arrays, *extra]
+        for a in self.arrays.values():
+            a.flush()
+        self.arrays.clear()
+        for key, a in extra.items():
+            np.save(self.scratch / f"{key}.npy", a)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+            for key in keys:
+                zf.write(self.scratch / f"{key}.npy", f"{key}.npy")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("elections", nargs="*", help="data files or slugs (default: all with list votes)")
+    ap.add_argument("--count", type=int, default=100_000, help="ballots per election")
+    ap.add_argument("--seed", type=int, default=0, help="random seed")
+    ap.add_argument("--invalid-share", type=float, default=0.2, help="share of over-limit ballots to aim for")
+    ap.add_argument("--format", choices=["npz", "jsonl"], default="npz")
+    ap.add_argument("--out", default=str(DEFAULT_OUT), help=f"output directory (default: {DEFAULT_OUT})")
+    ap.add_argument("--bench", action="store_true", help="only measure throughput")
+    args = ap.parse_args()
+    if args.count < 1:
+        ap.error("--count must be at least 1")
+
+    try:
+        selected = select_elections(args.elections, load_configs())
+    except ValueError as e:
+        ap.error(str(e))
+
+    out_dir = Path(args.out)
+    if not args.bench:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    for slug, data_file, config in selected:
+        with open(DATA_DIR / data_file, encoding="utf-8") as f:
+            data = json.load(f)
+        try:
+            election = Election(data, config["allowMultipleListVotes"])
+        except ValueError as e:
+            print(f"{slug:24s} skipped: {e}")
+            continue
+        rng = np.random.default_rng([args.seed, *slug.encode()])
+        path = out_dir / f"{slug}.{args.format}"
+
+        with contextlib.ExitStack() as stack:
+            sink = None
+            if not args.bench and args.format == "npz":
+                sink = NpzColumns(args.count, stack.enter_context(tempfile.TemporaryDirectory(dir=out_dir)))
+            elif not args.bench:
+                sink = stack.enter_context(open(path, "w", encoding="utf-8"))
+
+            generate = evaluate = 0.0
+            n_valid = 0
+            chunks = election.iter_random_ballots(args.count, rng, args.invalid_share)
+            while True:
+                start = time.perf_counter()
+                batch = next(chunks, None)
+                generated = time.perf_counter()
+                if batch is None:
+                    break
+                result = election.evaluate(batch, per_candidate=not args.bench)
+                evaluated = time.perf_counter()
+                generate += generated - start
+                evaluate += evaluated - generated
+                n_valid += int(result["isValid"].sum())
+
+                if isinstance(sink, NpzColumns):
+                    sink.append({**batch, **result})
+                elif sink:
+                    write_jsonl(sink, election, batch, result)
+                # Drop this chunk before the next one is generated
+                del batch, result
+
+            if isinstance(sink, NpzColumns):
+                sink.save(path, candidate_ids=np.array(election.candidate_ids),
+                          list_numbers=election.list_numbers)
+
+        rates = (f"generate {args.count / generate:>10,.0f}/s  "
+                 f"evaluate {args.count / evaluate:>10,.0f}/s")
+        print(f"{slug:24s} {election.n_candidates:5d} candidates  "
+              f"{n_valid / args.count:6.1%} valid  {rates}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""Batch evaluation of ballots with the app's voting rules, using NumPy.
+
+This mirrors calculateDerivedState() in src/utils/voteCalculator.ts (and
+the reducer in src/hooks/useVoteState.ts that produces its input), so the
+app's logic can be fuzzed and test corpora precomputed without a browser:
+
+  - Kumulieren: up to maxPerCandidate Stimmen per candidate
+  - Kopfleiste (Hessen): the one crossed list gets the Stimmen left over by
+    individual votes, one per eligible candidate top to bottom, repeated
+    until the candidates have maxPerCandidate each
+  - Listenkreuze (Bayern, allowMultipleListVotes): one Stimme per eligible
+    candidate of each crossed list; with individual votes only a single
+    list cross counts, for the Reststimmen (§75 GLKrWO)
+  - Streichen: struck candidates of a crossed list get no list Stimmen;
+    candidates with individual votes don't either
+  - the ballot is over the limit when more than totalStimmen are used
+    (Bayern: see the overLimitBasis rules in voteCalculator.ts)
+
+A batch of B ballots for an election with C candidates and L lists is a
+dict of arrays:
+  votes   (B, C) uint8   individual Stimmen per candidate
+  lists   (B, L) bool    list crosses
+  struck  (B, C) bool    struck candidates (only effective on crossed lists)
+Candidates are in file order: list by list, each by position. Election
+converts between batches and the app's VoteState JSON.
+"""
+
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("numpy is not installed: pip install numpy")
+
+# Ballots generated per step; bounds the temporary (B, C) arrays
+GENERATE_CHUNK = 1 << 14
+
+
+class Election:
+    """The candidate layout of one election data file, as arrays."""
+
+    def __init__(self, data, allow_multiple_list_votes=False):
+        if not isinstance(data, dict) or "parties" not in data:
+            raise ValueError("not a list election (needs totalStimmen and parties)")
+        self.total_stimmen = data["totalStimmen"]
+        self.max_per_candidate = data["maxPerCandidate"]
+        self.allow_multiple_list_votes = allow_multiple_list_votes
+
+        parties = data["parties"]
+        self.list_numbers = np.array([p["listNumber"] for p in parties], dtype=np.int32)
+        self.list_size = np.array([len(p["candidates"]) for p in parties], dtype=np.int32)
+        self.list_start = np.concatenate([[0], np.cumsum(self.list_size)[:-1]]).astype(np.int32)
+        self.list_end = self.list_start + self.list_size
+        # party index of every candidate
+        self.party = np.repeat(np.arange(len(parties), dtype=np.int32), self.list_size)
+        self.candidate_ids = [c["id"] for p in parties for c in p["candidates"]]
+        self.positions = np.array([c["position"] for p in parties for c in p["candidates"]], dtype=np.int32)
+        self._index = {cid: i for i, cid in enumerate(self.candidate_ids)}
+        self._list_index = {int(n): i for i, n in enumerate(self.list_numbers)}
+
+    @property
+    def n_candidates(self):
+        return len(self.candidate_ids)
+
+    @property
+    def n_lists(self):
+        return len(self.list_numbers)
+
+    def empty(self, n):
+        """A batch of n blank ballots."""
+        return {
+            "votes": np.zeros((n, self.n_candidates), dtype=np.uint8),
+            "lists": np.zeros((n, self.n_lists), dtype=bool),
+            "struck": np.zeros((n, self.n_candidates), dtype=bool),
+        }
+
+    # -----------------------------------------------------------------------
+    # Evaluation
+    # -----------------------------------------------------------------------
+
+    def _list_sums(self, values):
+        """Per-list sums of a (B, C) array of small counts, as (B, L)."""
+        if values.dtype == bool:
+            values = values.view(np.uint8)
+        out = np.zeros((len(values), self.n_lists), dtype=np.int32)
+        nonempty = self.list_end > self.list_start
+        if nonempty.any():
+            out[:, nonempty] = np.add.reduceat(values, self.list_start[nonempty], axis=1, dtype=np.uint16)
+        return out
+
+    def evaluate(self, batch, per_candidate=False):
+        """Evaluate a batch. Returns a dict of arrays named like the fields
+        of DerivedVoteState, plus listStimmen (B, L), the Stimmen each list
+        cross gave out, and overCumulated (B,), whether a candidate has more
+        than maxPerCandidate votes. isValid is False for those too (the
+        app's reducer never produces them).
+
+        Validity and totals only need per-list counts; with per_candidate
+        the (B, C) candidateStimmen each candidate ends up with is added.
+        """
+        votes = batch["votes"]
+        lists = batch["lists"]
+        total, m = self.total_stimmen, self.max_per_candidate
+
+        individual = votes.sum(axis=1, dtype=np.int32)
+        n_selected = lists.sum(axis=1, dtype=np.int32)
+        list_votes = self._list_sums(votes)
+        # Eligible for list Stimmen: on a crossed list, not struck, no own votes
+        free = (votes == 0) & ~batch["struck"]
+        n_eligible = np.where(lists, self._list_sums(free), 0)
+
+        if self.allow_multiple_list_votes:
+            rest = np.maximum(total - individual, 0)[:, None]
+            list_alloc = np.where(
+                (individual == 0)[:, None],
+                n_eligible,
+                # §75.5a: one list cross takes the Reststimmen, one each;
+                # §75.5c: with several list crosses they are ignored
+                np.where((n_selected == 1)[:, None], np.minimum(n_eligible, rest), 0),
+            )
+        else:
+            # Each crossed list cycles the full remaining budget, up to
+            # maxPerCandidate per eligible candidate
+            budget = np.maximum(total - individual, 0)[:, None]
+            list_alloc = np.minimum(budget, m * n_eligible)
+
+        list_total = list_alloc.sum(axis=1, dtype=np.int32)
+        used = individual + list_total
+        if self.allow_multiple_list_votes:
+            basis = np.where(individual > 0, individual, np.where(n_selected > 1, list_total, 0))
+        else:
+            basis = used
+        over_cumulated = (votes > m).any(axis=1)
+
+        result = {
+            "totalStimmenUsed": used,
+            "stimmenRemaining": total - used,
+            "stimmenPerParty": list_votes + list_alloc,
+            "listStimmen": list_alloc,
+            "isValid": (basis <= total) & ~over_cumulated,
+            "isComplete": used == total,
+            "isOverLimit": basis > total,
+            "overCumulated": over_cumulated,
+        }
+        if per_candidate:
+            result["candidateStimmen"] = votes + self._distribute(lists, free, n_eligible, list_alloc)
+        return result
+
+    def _distribute(self, lists, free, n_eligible, list_alloc):
+        """Spread each list's Stimmen over its eligible candidates, top to
+        bottom, one per pass (Kopfleiste cycling). Returns (B, C) uint8."""
+        eligible = free & self._per_candidate(lists)
+        cs = np.cumsum(eligible, axis=1, dtype=np.int16)
+        before = np.zeros(n_eligible.shape, dtype=np.int16)
+        inner = self.list_start > 0
+        before[:, inner] = cs[:, self.list_start[inner] - 1]
+        # 0-based rank among the eligible candidates of the same list
+        rank = cs - self._per_candidate(before) - 1
+        # Every eligible candidate gets the full passes, the first `extra`
+        # one more
+        passes, extra = np.divmod(list_alloc.astype(np.int16), np.maximum(n_eligible, 1).astype(np.int16))
+        alloc = self._per_candidate(passes.astype(np.uint8)) + (rank < self._per_candidate(extra))
+        return alloc * eligible
+
+    def _per_candidate(self, per_list):
+        """Expand a (B, L) array to (B, C), each list's value for its candidates."""
+        return np.repeat(per_list, self.list_size, axis=1)
+
+    # -----------------------------------------------------------------------
+    # Random ballots
+    # -----------------------------------------------------------------------
+
+    def random_ballots(self, n, rng, invalid_share=0.2):
+        """Generate n random ballots, roughly invalid_share of them over the
+        limit. Mixes list-only, individual-only and combined ballots with
+        strikes; label them with evaluate()."""
+        chunks = list(self.iter_random_ballots(n, rng, invalid_share))
+        return {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+
+    def iter_random_ballots(self, n, rng, invalid_share=0.2):
+        """random_ballots() one batch of up to GENERATE_CHUNK ballots at a
+        time, for counts whose arrays would not fit in memory at once. The
+        ballots are the same as random_ballots() draws from the same rng."""
+        if not n:
+            yield self.empty(0)
+        for start in range(0, n, GENERATE_CHUNK):
+            yield self._random_chunk(min(GENERATE_CHUNK, n - start), rng, invalid_share)
+
+    def _random_chunk(self, n, rng, invalid_share):
+        total, m = self.total_stimmen, self.max_per_candidate
+        n_c, n_l = self.n_candidates, self.n_lists
+        batch = self.empty(n)
+        invalid = rng.random(n) < invalid_share
+
+        # 0: list only, 1: individual only, 2: both
+        kind = rng.integers(0, 3, n)
+        has_votes = kind > 0
+        has_list = kind != 1
+
+        # Individual budget: up to totalStimmen, or beyond it for invalid ones
+        target = np.where(
+            invalid,
+            rng.integers(total + 1, total + total // 2 + 2, n),
+            rng.integers(1, total + 1, n),
+        )
+        target = np.where(has_votes, np.minimum(target, m * n_c), 0)
+        # Candidates get 1..m votes with a probability aimed slightly above
+        # the target, then votes past the target are dropped
+        p = np.minimum(1.0, 1.25 * target / ((m + 1) / 2 * max(n_c, 1)))
+        values = rng.integers(1, m + 1, (n, n_c), dtype=np.uint8)
+        values *= rng.random((n, n_c), dtype=np.float32) < p[:, None]
+        keep = np.cumsum(values, axis=1, dtype=np.int32) <= target[:, None]
+        batch["votes"] = values * keep
+
+        if n_l:
+            first = rng.integers(0, n_l, n)
+            batch["lists"][np.arange(n), first] = has_list
+            if self.allow_multiple_list_votes:
+                # Some ballots cross more lists; with no individual votes
+                # that makes them invalid once they exceed totalStimmen
+                extra = (rng.random((n, n_l)) < 2 / n_l) & has_list[:, None]
+                extra &= (rng.random(n) < np.where(invalid, 0.5, 0.1))[:, None]
+                batch["lists"] |= extra
+
+        strike_rate = rng.random(n) * 0.2
+        batch["struck"] = (rng.random((n, n_c), dtype=np.float32) < strike_rate[:, None]) & self._per_candidate(batch["lists"])
+        return batch
+
+    # -----------------------------------------------------------------------
+    # VoteState conversion
+    # -----------------------------------------------------------------------
+
+    def to_vote_state(self, batch, i):
+        """Ballot i of a batch as the app's VoteState."""
+        votes, lists, struck = batch["votes"][i], batch["lists"][i], batch["struck"][i]
+        ln = self.list_numbers
+        candidate_votes = {
+            self.candidate_ids[c]: {
+                "candidateId": self.candidate_ids[c],
+                "partyListNumber": int(ln[self.party[c]]),
+                "stimmen": int(votes[c]),
+            }
+            for c in np.flatnonzero(votes)
+        }
+        struck_by_list = {}
+        for c in np.flatnonzero(struck):
+            struck_by_list.setdefault(int(self.party[c]), []).append(self.candidate_ids[c])
+        list_selections = {
+            str(int(ln[j])): {
+                "partyListNumber": int(ln[j]),
+                "isSelected": bool(lists[j]),
+                "struckCandidateIds": struck_by_list.get(j, []),
+            }
+            for j in range(self.n_lists)
+            if lists[j] or j in struck_by_list
+        }
+        return {"candidateVotes": candidate_votes, "listSelections": list_selections}
+
+    def from_vote_states(self, states):
+        """A batch from a sequence of VoteState dicts."""
+        batch = self.empty(len(states))
+        for i, state in enumerate(states):
+            for vote in state.get("candidateVotes", {}).values():
+                batch["votes"][i, self._index[vote["candidateId"]]] = vote["stimmen"]
+            for selection in state.get("listSelections", {}).values():
+                j = self._list_index[selection["partyListNumber"]]
+                batch["lists"][i, j] = selection["isSelected"]
+                for cid in selection["struckCandidateIds"]:
+                    batch["struck"][i, self._index[cid]] = True
+        return batch
+
+    def derived_state(self, result, i):
+        """Ballot i of an evaluate() result as the app's DerivedVoteState."""
+        per_party = result["stimmenPerParty"][i]
+        return {
+            "totalStimmenUsed": int(result["totalStimmenUsed"][i]),
+            "stimmenRemaining": int(result["stimmenRemaining"][i]),
+            "stimmenPerParty": {
+                str(int(self.list_numbers[j])): int(v) for j, v in enumerate(per_party) if v > 0
+            },
+            "isValid": bool(result["isValid"][i]),
+            "isComplete": bool(result["isComplete"][i]),
+            "isOverLimit": bool(result["isOverLimit"][i]),
+        }
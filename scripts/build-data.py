@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Rebuild public/data from source documents, skipping up-to-date jobs.
+
+Usage: python scripts/build-data.py [--force] [--dry-run] [job ...]
+
+Staleness is decided from the build manifest (see pipeline.py) before any
+parser runs, so a no-op build only stats files and never imports
+pdfplumber. Jobs reading what a rebuilt job wrote (kopfleiste) are checked
+again once it has run. Jobs whose source PDFs are not available locally are
+skipped and their committed outputs are left untouched.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline import (
+    JOBS, PROJECT_ROOT, SCRIPTS_DIR, completed_jobs, dependents, job_outputs, job_status, load_manifest,
+    plan_runs, record_job, save_manifest,
+)
+
+
+def execute(run):
+    """Run a planned command. Returns the jobs of the run that succeeded:
+    all of them, none if an expected output is missing and, after a failed
+    batch run, those whose outputs were all written (see data_writer.py)."""
+    cmd = [sys.executable, str(SCRIPTS_DIR / run["script"]), *run["args"]]
+    print(f"\n$ {' '.join(cmd[1:])}", flush=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "written"
+        env = dict(os.environ, DATA_WRITTEN_LOG=str(log))
+        if subprocess.run(cmd, cwd=PROJECT_ROOT, env=env).returncode != 0:
+            if not JOBS[run["jobs"][0]].get("batch") or not log.exists():
+                return []
+            return completed_jobs(run["jobs"], log.read_text("utf-8").splitlines())
+    missing = [p for name in run["jobs"] for p in job_outputs(JOBS[name]) if not os.path.exists(p)]
+    for path in missing:
+        print(f"ERROR: expected output not written: {path}")
+    return [] if missing else run["jobs"]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("jobs", nargs="*", help=f"jobs to consider (default: all): {', '.join(JOBS)}")
+    ap.add_argument("--force", action="store_true", help="rebuild even if up to date")
+    ap.add_argument("--dry-run", action="store_true", help="only report what would run")
+    args = ap.parse_args()
+
+    unknown = [j for j in args.jobs if j not in JOBS]
+    if unknown:
+        ap.error(f"unknown job(s): {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    manifest = load_manifest()
+    stale, missing = [], []
+    for name in args.jobs or JOBS:
+        status, detail = job_status(name, manifest)
+        if status == "missing":
+            missing.append((name, detail))
+        elif status == "stale" or args.force:
+            stale.append((name, detail or "forced"))
+
+    for name, detail in missing:
+        print(f"  skip   {name:22s} {detail}")
+    if missing:
+        print("  (registered sources can be downloaded with scripts/fetch-sources.py)")
+    for name, detail in stale:
+        print(f"  stale  {name:22s} {detail}")
+
+    if not stale or args.dry_run:
+        save_manifest(manifest)
+        n_fresh = len(args.jobs or JOBS) - len(stale) - len(missing)
+        print(f"{n_fresh} up to date, {len(stale)} stale, {len(missing)} skipped "
+              f"({time.perf_counter() - start:.2f}s)")
+        return 0
+
+    failed = []
+    ran = []
+    pending = [name for name, _ in stale]
+    skipped = {name for name, _ in missing}
+    while pending:
+        for run in plan_runs(pending):
+            succeeded = execute(run)
+            for name in run["jobs"]:
+                if name in succeeded:
+                    record_job(name, manifest)
+                else:
+                    failed.append(name)
+        ran.extend(pending)
+        # Outputs just written may make jobs that were fresh stale
+        pending = []
+        for name in dependents(ran, [n for n in args.jobs or JOBS if n not in skipped]):
+            status, detail = job_status(name, manifest)
+            if status == "stale":
+                print(f"  stale  {name:22s} {detail}")
+                pending.append(name)
+    save_manifest(manifest)
+
+    print(f"\nRebuilt {len(ran) - len(failed)} job(s) in {time.perf_counter() - start:.1f}s")
+    if failed:
+        print(f"FAILED: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
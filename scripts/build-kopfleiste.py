@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Precompute the Kopfleiste list-vote distribution of every list.
+
+Usage: python scripts/build-kopfleiste.py [--trials N] [election ...]
+
+A list cross (Hessen) spreads the Stimmen not given individually over the
+list top to bottom, one per candidate and pass, up to maxPerCandidate
+each, skipping struck candidates and candidates with individual votes
+(calculateListVoteDistribution() in src/utils/voteCalculator.ts). With E
+candidates left and a budget of B Stimmen, the one at rank r among them
+gets
+
+    q + (1 if r < x else 0)    where (q, x) = divmod(min(B, maxPerCandidate * E), E)
+
+For every Hessen list election this writes public/data/kopfleiste/<dataFile>
+with per list:
+  distribution  Stimmen per candidate (file order) of a list cross alone:
+                full totalStimmen, nothing struck
+  cumulative    its prefix sums; cumulative[k] is what the first k
+                candidates get, cumulative[-1] the list's total
+A candidate's rank under strikes or individual votes is its index minus the
+number of skipped candidates above it, a prefix sum over the skip mask.
+
+Before writing, every list is checked against a port of
+calculateListVoteDistribution() for every budget from 0 to totalStimmen,
+with nothing skipped and with --trials random skip patterns.
+"""
+
+import argparse
+import json
+import random
+import sys
+
+from data_writer import summary, write_data
+from election_validate import load_configs, select_elections
+from pipeline import DATA_DIR, KOPFLEISTE_DIR
+
+
+def distribute(skipped, budget, max_per_candidate):
+    """Closed form: Stimmen per candidate of a list with the given skip mask."""
+    eligible = len(skipped) - sum(skipped)
+    if eligible == 0:
+        return [0] * len(skipped)
+    q, x = divmod(min(max(budget, 0), max_per_candidate * eligible), eligible)
+    out, rank = [], 0
+    for skip in skipped:
+        if skip:
+            out.append(0)
+        else:
+            out.append(q + (rank < x))
+            rank += 1
+    return out
+
+
+def reference_distribute(skipped, budget):
+    """calculateListVoteDistribution() as written in the app: at most three
+    passes over the eligible candidates, one Stimme each."""
+    allocation = [0] * len(skipped)
+    eligible = [i for i, skip in enumerate(skipped) if not skip]
+    remaining = budget
+    for _ in range(3):
+        if remaining <= 0:
+            break
+        any_allocated = False
+        for i in eligible:
+            if allocation[i] < 3 and remaining > 0:
+                allocation[i] += 1
+                remaining -= 1
+                any_allocated = True
+            if remaining == 0:
+                break
+        if not any_allocated:
+            break
+    return allocation
+
+
+def check_party(party, total, max_per_candidate, rng, trials):
+    """Problems found comparing distribute() with the reference."""
+    n = len(party["candidates"])
+    masks = [[False] * n]
+    for _ in range(trials):
+        rate = rng.random()
+        masks.append([rng.random() < rate for _ in range(n)])
+    problems = []
+    for skipped in masks:
+        for budget in range(total + 1):
+            if distribute(skipped, budget, max_per_candidate) != reference_distribute(skipped, budget):
+                problems.append(f"list {party['listNumber']}: budget {budget}, "
+                                f"{sum(skipped)} skipped: distribution differs")
+                break
+    return problems
+
+
+def kopfleiste_table(data):
+    total, m = data["totalStimmen"], data["maxPerCandidate"]
+    parties = []
+    for party in data["parties"]:
+        distribution = distribute([False] * len(party["candidates"]), total, m)
+        cumulative = [0]
+        for stimmen in distribution:
+            cumulative.append(cumulative[-1] + stimmen)
+        parties.append({
+            "listNumber": party["listNumber"],
+            "candidateCount": len(party["candidates"]),
+            "distribution": distribution,
+            "cumulative": cumulative,
+        })
+    return {"totalStimmen": total, "maxPerCandidate": m, "parties": parties}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("elections", nargs="*", help="data files or slugs (default: all Hessen list elections)")
+    ap.add_argument("--trials", type=int, default=20, help="random skip patterns checked per list")
+    args = ap.parse_args()
+
+    try:
+        selected = select_elections(args.elections, load_configs())
+    except ValueError as e:
+        ap.error(str(e))
+
+    failed = False
+    for slug, data_file, config in selected:
+        if config["allowMultipleListVotes"]:
+            continue
+        with open(DATA_DIR / data_file, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or "parties" not in data:
+            continue
+        rng = random.Random(slug)
+        problems = [
+            p for party in data["parties"]
+            for p in check_party(party, data["totalStimmen"], data["maxPerCandidate"], rng, args.trials)
+        ]
+        if problems:
+            failed = True
+            print(f"{slug}: {len(problems)} list(s) differ from the reference:")
+            for p in problems:
+                print(f"  {p}")
+            continue
+        write_data(KOPFLEISTE_DIR / data_file, kopfleiste_table(data))
+
+    summary()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Declarative corrections applied to parsed election data before writing.
+
+Some Wahlvorschläge can't be parsed perfectly: candidates at column or
+page boundaries leak into the neighbouring list or get lost. Instead of
+patching the output after the fact, the fixes are kept as data in
+scripts/corrections/<output file name>, e.g.:
+
+    {
+      "idPrefix": "stvv",
+      "operations": [
+        {"op": "truncate", "list": 9, "count": 14},
+        {"op": "insert", "list": 4, "candidates": [{"position": 93, ...}]},
+        {"op": "move", "list": 14, "position": 26, "toList": 12, "toPosition": 39},
+        {"op": "rename", "list": 3, "position": 7, "lastName": "...", "firstName": "..."},
+        {"op": "dedupe", "list": 22}
+      ]
+    }
+
+Operations run in order on the in-memory data and are idempotent, so the
+overlay can be replayed on every build:
+  truncate  keep the first `count` candidates of a list
+  insert    add candidates whose position is not taken yet
+  move      move a candidate to another list/position, unless already there
+  rename    overwrite name/profession fields of one candidate
+  dedupe    drop repeated copies of a list, keeping the first
+
+Afterwards the touched lists are re-sorted by position, ids are rebuilt as
+<idPrefix>-<list>-<position>, candidateCount is updated and the parties
+are sorted by list number. Every op may carry a "note" for the record.
+
+An op whose list or candidate is not in the data (the parser or the
+Wahlvorschlag changed under the overlay) is skipped and reported as an
+error in election_validate's (level, message) form; the parser then does
+not write that file, and writes the others.
+"""
+
+import json
+from pathlib import Path
+
+from election_validate import print_problems
+
+CORRECTIONS_DIR = Path(__file__).resolve().parent / "corrections"
+
+CANDIDATE_FIELDS = ("lastName", "firstName", "profession")
+
+
+def overlay_path(name):
+    """Path of the corrections overlay for a data file name."""
+    return CORRECTIONS_DIR / name
+
+
+def load_overlay(name):
+    """Load the overlay for a data file, or None if it has none."""
+    path = overlay_path(name)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _find_list(parties, list_number):
+    for party in parties:
+        if party["listNumber"] == list_number:
+            return party
+    return None
+
+
+def _find_candidate(party, position):
+    for c in party["candidates"]:
+        if c["position"] == position:
+            return c
+    return None
+
+
+def _label(c):
+    return f"#{c['position']} {c['lastName']}, {c['firstName']}"
+
+
+def apply_corrections(data, overlay):
+    """Apply an overlay to election data in place. Returns a list of
+    human-readable descriptions of the changes actually made (empty when
+    the data already had all corrections) and a list of problems for the
+    ops that could not be applied."""
+    parties = data["parties"]
+    applied = []
+    problems = []
+    touched = set()
+
+    for op in overlay["operations"]:
+        kind = op["op"]
+        list_number = op["list"]
+
+        if kind == "dedupe":
+            copies = [p for p in parties if p["listNumber"] == list_number]
+            if len(copies) > 1:
+                drop = {id(p) for p in copies[1:]}
+                parties[:] = [p for p in parties if id(p) not in drop]
+                applied.append(f"Liste {list_number}: dropped {len(copies) - 1} duplicate(s)")
+            continue
+
+        party = _find_list(parties, list_number)
+        if party is None:
+            problems.append(("error", f"correction {kind}: unknown list {list_number}"))
+            continue
+
+        if kind == "truncate":
+            extra = party["candidates"][op["count"]:]
+            if extra:
+                del party["candidates"][op["count"]:]
+                touched.add(list_number)
+                dropped = _label(extra[0]) if len(extra) == 1 else f"{_label(extra[0])} .. {_label(extra[-1])}"
+                applied.append(f"Liste {list_number}: truncated to {op['count']} "
+                               f"(dropped {len(extra)}: {dropped})")
+
+        elif kind == "insert":
+            for new in op["candidates"]:
+                if _find_candidate(party, new["position"]) is None:
+                    party["candidates"].append({
+                        "id": "",
+                        "position": new["position"],
+                        **{f: new.get(f, "") for f in CANDIDATE_FIELDS},
+                    })
+                    touched.add(list_number)
+                    applied.append(f"Liste {list_number}: inserted {_label(new)}")
+
+        elif kind == "move":
+            target = _find_list(parties, op.get("toList", list_number))
+            if target is None:
+                problems.append(("error", f"correction move: unknown list {op['toList']}"))
+                continue
+            c = _find_candidate(party, op["position"])
+            if c is not None and _find_candidate(target, op["toPosition"]) is None:
+                party["candidates"].remove(c)
+                c["position"] = op["toPosition"]
+                target["candidates"].append(c)
+                touched.update((list_number, target["listNumber"]))
+                applied.append(f"Liste {list_number} #{op['position']}: moved to "
+                               f"Liste {target['listNumber']} #{op['toPosition']}")
+
+        elif kind == "rename":
+            c = _find_candidate(party, op["position"])
+            if c is None:
+                problems.append(("error", f"correction rename: Liste {list_number} "
+                                          f"has no position {op['position']}"))
+                continue
+            changes = {f: op[f] for f in CANDIDATE_FIELDS if f in op and c[f] != op[f]}
+            if changes:
+                c.update(changes)
+                touched.add(list_number)
+                applied.append(f"Liste {list_number}: renamed {_label(c)}")
+
+        else:
+            raise ValueError(f"unknown correction op {kind!r}")
+
+    prefix = overlay.get("idPrefix")
+    for party in parties:
+        if party["listNumber"] in touched:
+            party["candidates"].sort(key=lambda c: c["position"])
+            if prefix:
+                for c in party["candidates"]:
+                    c["id"] = f"{prefix}-{party['listNumber']}-{c['position']}"
+        party["candidateCount"] = len(party["candidates"])
+    parties.sort(key=lambda p: p["listNumber"])
+    return applied, problems
+
+
+def apply_overlay(name, data):
+    """Apply the overlay for data file `name`, if any, and print what changed.
+    Returns True if every correction could be applied."""
+    overlay = load_overlay(name)
+    if overlay is None:
+        return True
+    applied, problems = apply_corrections(data, overlay)
+    print(f"Corrections: {name}: {len(applied)} change(s) from {overlay_path(name).name}")
+    for line in applied:
+        print(f"  {line}")
+    return print_problems(problems)
@@ -0,0 +1,114 @@
+"""Canonical, atomic, write-if-changed output for public/data.
+
+Every parser writes its JSON through write_data(). The data is serialized
+canonically (fixed key order, lists of parties/candidates/Wahlkreise sorted
+by their number, two-space indent, trailing newline), so the same parse
+always yields the same bytes. The file is only replaced when those bytes
+differ from what is on disk, via a temp file and os.replace(), so readers
+never see a half-written file and unchanged outputs keep their mtime (no
+Vite reload, no cache invalidation downstream).
+
+When DATA_WRITTEN_LOG names a file, the absolute path of every output
+written or found unchanged is appended to it, one per line. build-data.py
+uses it to tell which jobs of a failed batch run did get their outputs.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# Keys in this order first, anything else after them alphabetically
+KEY_ORDER = [
+    "number", "election", "type", "name", "date",
+    "totalStimmen", "maxPerCandidate", "parties", "wahlkreise", "landeslisten",
+    "listNumber", "id", "party", "position", "lastName", "firstName",
+    "fullName", "shortName", "candidateCount", "profession", "birthYear", "birthPlace",
+    "candidates",
+]
+_KEY_RANK = {k: i for i, k in enumerate(KEY_ORDER)}
+
+# A list of objects that all carry one of these keys is sorted by it
+SORT_KEYS = ["listNumber", "number", "position"]
+
+# Files written by this process, for summary()
+STATS = {"changed": [], "unchanged": []}
+
+WRITTEN_LOG = os.environ.get("DATA_WRITTEN_LOG")
+
+
+def _key_rank(key):
+    return (_KEY_RANK.get(key, len(KEY_ORDER)), key)
+
+
+def canonical(value):
+    """Return a copy of value with dict keys and object lists in canonical order."""
+    if isinstance(value, dict):
+        return {k: canonical(value[k]) for k in sorted(value, key=_key_rank)}
+    if isinstance(value, list):
+        items = [canonical(v) for v in value]
+        if items and all(isinstance(v, dict) for v in items):
+            for sort_key in SORT_KEYS:
+                if all(isinstance(v.get(sort_key), int) for v in items):
+                    items.sort(key=lambda v: v[sort_key])
+                    break
+        return items
+    return value
+
+
+def serialize(data):
+    """Canonical UTF-8 bytes for data."""
+    return (json.dumps(canonical(data), ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def _sha256(data):
+    return hashlib.sha256(data).digest()
+
+
+def write_data(path, data):
+    """Write data to path if its canonical form differs from the file's
+    content. Returns True if the file was (re)written."""
+    return write_bytes(path, serialize(data))
+
+
+def write_bytes(path, content):
+    """Atomically replace path with content unless it holds those bytes
+    already. Returns True if the file was (re)written."""
+    path = Path(os.path.normpath(path))
+
+    try:
+        if path.stat().st_size == len(content) and _sha256(path.read_bytes()) == _sha256(content):
+            STATS["unchanged"].append(str(path))
+            _log_written(path)
+            print(f"Unchanged: {path}")
+            return False
+    except OSError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    STATS["changed"].append(str(path))
+    _log_written(path)
+    print(f"Wrote: {path}")
+    return True
+
+
+def _log_written(path):
+    if WRITTEN_LOG:
+        with open(WRITTEN_LOG, "a", encoding="utf-8") as f:
+            f.write(os.path.abspath(path) + "\n")
+
+
+def summary():
+    """Print how many outputs changed."""
+    changed, unchanged = len(STATS["changed"]), len(STATS["unchanged"])
+    print(f"Outputs: {changed} changed, {unchanged} unchanged")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Decode share links from log files into per-election vote matrices.
+
+Usage: python scripts/decode-share-links.py [--out DIR] [--top N] [log ...]
+
+Reads log files (or stdin) line by line, finds every share URL in them
+(.../<slug>#b=... and legacy #v= links, see share_codec.py), decodes them
+in bulk and writes one DIR/<slug>.npz per election: the ballot arrays of
+ballot_engine.py plus their evaluation, e.g. for pattern analysis in a
+notebook. Prints per election the number of ballots, the valid share, the
+most crossed lists and the candidates with the most individual votes.
+"""
+
+import argparse
+import fileinput
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ballot_engine import Election
+from election_validate import load_configs
+from pipeline import DATA_DIR, PROJECT_ROOT
+from share_codec import decode_log, to_batch
+
+DEFAULT_OUT = PROJECT_ROOT / ".cache" / "share-links"
+
+
+def legacy_batch(election, states):
+    """Batch from decoded #v= VoteStates, dropping the ones naming unknown
+    candidates or lists. Returns (batch, dropped)."""
+    batch = election.from_vote_states([])
+    kept = []
+    for state in states:
+        try:
+            kept.append(election.from_vote_states([state]))
+        except KeyError:
+            continue
+    if kept:
+        batch = {key: np.concatenate([b[key] for b in kept]) for key in batch}
+    return batch, len(states) - len(kept)
+
+
+def summarize(slug, election, data, batch, result, top):
+    n = len(batch["votes"])
+    print(f"{slug}: {n} ballot(s), {result['isValid'].mean():.1%} valid, "
+          f"{batch['lists'].any(axis=1).mean():.1%} with a list cross")
+    names = {p["listNumber"]: p["shortName"] for p in data["parties"]}
+    crossed = batch["lists"].sum(axis=0)
+    for j in np.argsort(-crossed, kind="stable")[:top]:
+        if crossed[j]:
+            ln = int(election.list_numbers[j])
+            print(f"  list {ln:3d} {names[ln]:20s} {crossed[j]:8d} crosses")
+    candidates = {c["id"]: c for p in data["parties"] for c in p["candidates"]}
+    voted = (batch["votes"] > 0).sum(axis=0)
+    for c in np.argsort(-voted, kind="stable")[:top]:
+        if voted[c]:
+            cand = candidates[election.candidate_ids[c]]
+            label = f"{cand['lastName']}, {cand['firstName']}"
+            print(f"  {election.candidate_ids[c]:14s} {label:30s} {voted[c]:8d} ballots with votes")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("logs", nargs="*", help="log files (default: stdin)")
+    ap.add_argument("--out", default=str(DEFAULT_OUT), help=f"output directory (default: {DEFAULT_OUT})")
+    ap.add_argument("--top", type=int, default=5, help="lists and candidates to show per election")
+    args = ap.parse_args()
+
+    configs = load_configs()
+    slugs_by_code = {
+        c["shareTypeCode"]: c["slug"] for c in configs.values() if c["shareTypeCode"] is not None
+    }
+    by_slug = {c["slug"]: (data_file, c) for data_file, c in configs.items()}
+
+    start = time.perf_counter()
+    with fileinput.input(args.logs, encoding="utf-8", errors="replace") as lines:
+        parsed, slugs, legacy, stats = decode_log(lines, slugs_by_code)
+    print(f"{stats['links']} link(s) decoded in {time.perf_counter() - start:.1f}s: "
+          f"{stats['malformed']} malformed, {stats['codeMismatch']} with a share code "
+          f"not matching their URL")
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    legacy_by_slug = {}
+    for slug, state in legacy:
+        legacy_by_slug.setdefault(slug, []).append(state)
+
+    unknown = sum(slug is None for slug in slugs)
+    for slug in sorted({slug for slug in slugs if slug is not None} | set(legacy_by_slug)):
+        if slug not in by_slug:
+            unknown += len(legacy_by_slug.get(slug, []))
+            continue
+        data_file, config = by_slug[slug]
+        with open(DATA_DIR / data_file, encoding="utf-8") as f:
+            data = json.load(f)
+        try:
+            election = Election(data, config["allowMultipleListVotes"])
+        except ValueError as e:
+            print(f"{slug}: skipped: {e}")
+            continue
+
+        records = np.flatnonzero((slugs == slug) & parsed["ok"])
+        batch, unmatched = to_batch(election, parsed, records)
+        old, dropped = legacy_batch(election, legacy_by_slug.get(slug, []))
+        batch = {key: np.concatenate([batch[key], old[key]]) for key in batch}
+        if not len(batch["votes"]):
+            # Only malformed links or legacy ones naming unknown candidates
+            print(f"{slug}: no ballots, skipped" + (f" ({dropped} legacy link(s) dropped)" if dropped else ""))
+            continue
+        result = election.evaluate(batch, per_candidate=True)
+
+        summarize(slug, election, data, batch, result, args.top)
+        if unmatched or dropped:
+            print(f"  {unmatched} vote(s)/strike(s) naming no candidate, {dropped} legacy link(s) dropped")
+        np.savez_compressed(
+            out_dir / f"{slug}.npz", **batch, **result,
+            candidate_ids=np.array(election.candidate_ids), list_numbers=election.list_numbers,
+        )
+    if unknown:
+        print(f"{unknown} link(s) for no known election")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Show what changed in the election data between two builds.
+
+Usage: python scripts/diff-elections.py [--json OUT] [--only FILE ...] [--where] [OLD [NEW]]
+
+OLD and NEW are each a data directory, a single JSON file or a git
+revision. Defaults: OLD=HEAD, NEW=public/data (the working tree), so a
+plain run shows what the last parser run changed compared to the commit.
+With --where every changed candidate is listed with the page and box of
+the source document it was read from, taken from the provenance sidecars
+in public/data/provenance (see provenance.py).
+
+Examples:
+  python scripts/diff-elections.py
+  python scripts/diff-elections.py HEAD~3 HEAD
+  python scripts/diff-elections.py --only frankfurt-stvv.json HEAD~1
+  python scripts/diff-elections.py --where
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from election_diff import diff_data, is_empty, load_source, summarize
+from pipeline import DATA_DIR
+from provenance import by_position, load_sidecar
+
+
+def locations(name, old, new):
+    """{(listNumber, position): source location} of a file's candidates in
+    the new data, and of those only in the old data (removed ones)."""
+    sidecar = load_sidecar(name)
+    return {**by_position(old, sidecar), **by_position(new, sidecar)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("old", nargs="?", default="HEAD", help="directory, file or git revision (default: HEAD)")
+    ap.add_argument("new", nargs="?", default=str(DATA_DIR), help="directory, file or git revision (default: public/data)")
+    ap.add_argument("--only", metavar="FILE", action="append", help="only compare this data file (repeatable)")
+    ap.add_argument("--json", metavar="OUT", help="write the full diff as JSON ('-' for stdout)")
+    ap.add_argument("--where", action="store_true",
+                    help="list changed candidates with their source page and box")
+    args = ap.parse_args()
+
+    names = set(args.only) if args.only else None
+    try:
+        old = load_source(args.old, names)
+        new = load_source(args.new, names)
+    except ValueError as e:
+        ap.error(str(e))
+    if len(old) == 1 and len(new) == 1 and os.path.isfile(args.old) and os.path.isfile(args.new):
+        # Two explicit files: compare them whatever they are called
+        old = {next(iter(new)): next(iter(old.values()))}
+    elif os.path.isfile(args.old) or os.path.isfile(args.new):
+        single = Path(args.old if os.path.isfile(args.old) else args.new).name
+        old = {k: v for k, v in old.items() if k == single}
+        new = {k: v for k, v in new.items() if k == single}
+
+    report = {}
+    for name in sorted(old.keys() | new.keys()):
+        if name not in old:
+            report[name] = {"status": "added"}
+        elif name not in new:
+            report[name] = {"status": "removed"}
+        else:
+            diff = diff_data(old[name], new[name])
+            if not is_empty(diff):
+                report[name] = {"status": "changed", **diff}
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for name, entry in report.items():
+        if entry["status"] == "changed":
+            where = locations(name, old[name], new[name]) if args.where else None
+            print(summarize(name, entry, where))
+        else:
+            print(f"{name}: file {entry['status']}")
+    print(f"\n{len(report)} of {len(old.keys() | new.keys())} file(s) changed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
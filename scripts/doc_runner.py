@@ -0,0 +1,234 @@
+"""Supervised per-document workers for large batches of PDFs.
+
+A ProcessPoolExecutor has no way to stop a task: one document caught in a
+pathological pdfplumber layout holds its worker forever, and a worker
+killed by the OOM killer breaks the whole pool. run_documents() instead
+gives every document its own forked worker process, at most `workers` at
+a time, and supervises them from this process:
+
+  time    a worker still running DOC_TIMEOUT seconds after it started is
+          killed
+  memory  a worker whose RSS grows past PDF_MAX_RSS_MB is killed (PdfDocument
+          enforces the same ceiling between pages from the inside; this
+          also catches a worker stuck within one page)
+  crash   a worker that exits without a result (segfault, OOM kill)
+
+A killed or crashed document is retried up to DOC_RETRIES times, queued
+behind the documents that have not run yet, so the rest of the batch
+keeps going. An exception raised by the work itself is not retried: it
+would only happen again.
+
+Documents that still fail are quarantined in .cache/quarantine.json with
+their error, per document and function (the same PDF may be read by
+several parsers), and skipped by later runs until the PDF, the script
+defining the function or one of pipeline.SHARED_MODULES changes (or the
+entry is deleted). Each failure is reported to the caller as a
+DocumentFailed result, so one bad document costs its own output and
+nothing else.
+
+With workers=1 (e.g. under keep_warm()) documents run in this process,
+unsupervised and without quarantine, as before.
+"""
+
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import wait
+
+from pdf_extract import MAX_RSS_MB, PDF_WORKERS
+from pipeline import PROJECT_ROOT, SCRIPTS_DIR, SHARED_MODULES
+
+DOC_TIMEOUT = float(os.environ.get("PDF_DOC_TIMEOUT", 600))
+DOC_RETRIES = int(os.environ.get("PDF_DOC_RETRIES", 1))
+QUARANTINE_PATH = PROJECT_ROOT / ".cache" / "quarantine.json"
+
+# How often running workers are checked against their budgets
+POLL_SECONDS = 0.5
+
+
+class DocumentFailed(Exception):
+    """A document that could not be processed: error message, attempts made
+    and whether it was skipped because of an earlier quarantine."""
+
+    def __init__(self, path, error, attempts, quarantined=False):
+        super().__init__(error.splitlines()[0] + (" (quarantined)" if quarantined else ""))
+        self.path = path
+        self.error = error
+        self.attempts = attempts
+        self.quarantined = quarantined
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _code_path(func):
+    return getattr(sys.modules.get(func.__module__), "__file__", None)
+
+
+def _quarantine_key(path, func):
+    return f"{path} | {os.path.basename(_code_path(func) or '')}:{func.__qualname__}"
+
+
+def _code_stamps(func):
+    return [_stamp(_code_path(func)), *(_stamp(SCRIPTS_DIR / m) for m in SHARED_MODULES)]
+
+
+def load_quarantine():
+    try:
+        with open(QUARANTINE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_quarantine(quarantine):
+    QUARANTINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = QUARANTINE_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(quarantine, f, indent=1, sort_keys=True, ensure_ascii=False)
+    os.replace(tmp, QUARANTINE_PATH)
+
+
+def _still_quarantined(entry, path, func):
+    return entry is not None and entry["pdf"] == _stamp(path) and entry["code"] == _code_stamps(func)
+
+
+def _rss_mb(pid):
+    """Resident set size of a child process in MB, or None without procfs."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _worker(conn, func, args):
+    try:
+        result = ("ok", func(*args))
+    except BaseException as e:
+        result = ("error", f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+    try:
+        conn.send(result)
+    except Exception as e:
+        # e.g. an unpicklable result
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+def _start(func, path, args):
+    ctx = multiprocessing.get_context("fork" if sys.platform.startswith("linux") else None)
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_worker, args=(send, func, (path, *args)), daemon=True)
+    proc.start()
+    send.close()
+    return proc, recv
+
+
+def _kill(proc):
+    proc.kill()
+    proc.join()
+
+
+def run_documents(func, paths, args=(), workers=PDF_WORKERS, timeout=DOC_TIMEOUT,
+                  max_rss_mb=MAX_RSS_MB, retries=DOC_RETRIES):
+    """Run func(path, *args) for every path under the time and memory budget.
+
+    func must be a module-level function and its result picklable; it runs
+    in a daemon process, so it cannot start worker processes itself. Yields
+    (path, result) in completion order; result is a DocumentFailed for a
+    document that failed or is still quarantined.
+    """
+    if workers <= 1:
+        # Nothing tells a hang or a crash from a slow document here, so
+        # nothing is quarantined
+        for path in dict.fromkeys(paths):
+            try:
+                result = func(path, *args)
+            except Exception as e:
+                result = DocumentFailed(path, f"{type(e).__name__}: {e}", 1)
+            yield path, result
+        return
+
+    quarantine = load_quarantine()
+    dirty = False
+    pending = deque()
+    for path in dict.fromkeys(paths):
+        entry = quarantine.get(_quarantine_key(path, func))
+        if _still_quarantined(entry, path, func):
+            yield path, DocumentFailed(path, entry["error"], entry["attempts"], quarantined=True)
+        else:
+            pending.append((path, 1))
+
+    def finish(path, result, attempts):
+        nonlocal dirty
+        key = _quarantine_key(path, func)
+        if isinstance(result, DocumentFailed):
+            quarantine[key] = {
+                "error": result.error, "attempts": attempts, "pdf": _stamp(path),
+                "code": _code_stamps(func), "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            dirty = True
+        elif quarantine.pop(key, None) is not None:
+            dirty = True
+        return path, result
+
+    running = {}  # recv connection -> (path, attempt, proc, deadline)
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                path, attempt = pending.popleft()
+                proc, recv = _start(func, path, args)
+                running[recv] = (path, attempt, proc, time.monotonic() + timeout)
+
+            for recv in wait(list(running), timeout=POLL_SECONDS):
+                path, attempt, proc, _ = running.pop(recv)
+                try:
+                    status, value = recv.recv()
+                except EOFError:
+                    proc.join()
+                    status, value = "killed", f"worker exited with code {proc.exitcode}"
+                recv.close()
+                proc.join()
+                if status == "ok":
+                    yield finish(path, value, attempt)
+                elif status == "error":
+                    yield finish(path, DocumentFailed(path, value, attempt), attempt)
+                elif attempt <= retries:
+                    print(f"  [{os.path.basename(path)}] {value}, retrying", flush=True)
+                    pending.append((path, attempt + 1))
+                else:
+                    yield finish(path, DocumentFailed(path, value, attempt), attempt)
+
+            now = time.monotonic()
+            for recv, (path, attempt, proc, deadline) in list(running.items()):
+                rss = _rss_mb(proc.pid) if max_rss_mb else None
+                if now > deadline:
+                    reason = f"timed out after {timeout:.0f}s"
+                elif rss is not None and rss > max_rss_mb:
+                    reason = f"RSS {rss:.0f} MB exceeds ceiling {max_rss_mb:.0f} MB"
+                else:
+                    continue
+                _kill(proc)
+                recv.close()
+                del running[recv]
+                if attempt <= retries:
+                    print(f"  [{os.path.basename(path)}] {reason}, killed and retrying", flush=True)
+                    pending.append((path, attempt + 1))
+                else:
+                    yield finish(path, DocumentFailed(path, reason, attempt), attempt)
+    finally:
+        for recv, (_, _, proc, _) in running.items():
+            _kill(proc)
+            recv.close()
+        if dirty:
+            save_quarantine(quarantine)
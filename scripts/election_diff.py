@@ -0,0 +1,275 @@
+"""Structured diff between two builds of an election data file.
+
+Both sides are flattened to candidate rows keyed by (listNumber, position),
+sorted, and merged in a single pass. A per-list name index on each side
+tells a candidate who moved within the list (repositioned) apart from one
+who was replaced (renamed) or dropped (removed).
+
+All three data layouts in public/data are understood:
+  - {"parties": [{"listNumber", "candidates": [{"position", ...}]}]}
+  - bw-landtagswahl: {"wahlkreise": [{"number", "candidates": [...]}]},
+    each Wahlkreis is treated as a list, candidates by their order in it
+  - bare lists [{"listNumber", "candidates": [{"id", "name"}]}], candidates
+    by their order in the list
+
+Either side of a comparison can be a data directory, a single file or a
+git revision (read straight from the object store, no checkout needed).
+"""
+
+import json
+import subprocess
+from pathlib import Path
+
+from textnorm import nfc
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_REL = "public/data"
+
+# Top-level fields compared as-is
+META_FIELDS = ["election", "name", "totalStimmen", "maxPerCandidate", "type", "date"]
+
+
+def load_source(source, names=None):
+    """Load {filename: data} from a directory, a JSON file or a git revision.
+
+    names restricts which files are read.
+    """
+    path = Path(source)
+    if path.is_file():
+        return {path.name: json.loads(path.read_text(encoding="utf-8"))}
+    if path.is_dir():
+        return {
+            f.name: json.loads(f.read_text(encoding="utf-8"))
+            for f in sorted(path.glob("*.json"))
+            if names is None or f.name in names
+        }
+    return _load_git(source, names)
+
+
+def _load_git(rev, names=None):
+    """Read every public/data/*.json at a git revision with one
+    `git cat-file --batch` process."""
+    listing = subprocess.run(
+        ["git", "ls-tree", "--name-only", f"{rev}:{DATA_REL}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if listing.returncode != 0:
+        raise ValueError(f"not a file, directory or git revision: {rev}")
+    files = [
+        f for f in listing.stdout.split()
+        if f.endswith(".json") and (names is None or f in names)
+    ]
+    request = "".join(f"{rev}:{DATA_REL}/{f}\n" for f in files).encode()
+    out = subprocess.run(
+        ["git", "cat-file", "--batch"], cwd=PROJECT_ROOT,
+        input=request, capture_output=True, check=True,
+    ).stdout
+
+    result = {}
+    offset = 0
+    for f in files:
+        header_end = out.index(b"\n", offset)
+        size = int(out[offset:header_end].split()[2])
+        body = out[header_end + 1:header_end + 1 + size]
+        result[f] = json.loads(body)
+        offset = header_end + 1 + size + 1
+    return result
+
+
+def _list_name(party):
+    return party.get("shortName") or party.get("name") or party.get("fullName") or ""
+
+
+def flatten(data):
+    """Flatten election data into (meta, lists, rows).
+
+    lists: {listNumber: {"name", "candidateCount"}}
+    rows:  [((listNumber, position), candidate)] sorted by key, where each
+           candidate has lastName, firstName and profession
+    """
+    meta = {}
+    lists = {}
+    rows = []
+
+    if isinstance(data, dict) and "wahlkreise" in data:
+        meta = {k: data[k] for k in META_FIELDS if k in data}
+        for wk in data["wahlkreise"]:
+            lists[wk["number"]] = {"name": wk.get("name", ""), "candidateCount": len(wk["candidates"])}
+            for pos, c in enumerate(wk["candidates"], 1):
+                rows.append(((wk["number"], pos), {
+                    "lastName": c.get("lastName", ""),
+                    "firstName": c.get("firstName", ""),
+                    "profession": c.get("profession", ""),
+                }))
+    else:
+        if isinstance(data, dict):
+            meta = {k: data[k] for k in META_FIELDS if k in data}
+            parties = data.get("parties", [])
+        else:
+            parties = data
+        for party in parties:
+            candidates = party.get("candidates", [])
+            lists[party["listNumber"]] = {
+                "name": _list_name(party),
+                "candidateCount": len(candidates),
+            }
+            for i, c in enumerate(candidates, 1):
+                rows.append(((party["listNumber"], c.get("position", i)), {
+                    "lastName": c.get("lastName", c.get("name", "")),
+                    "firstName": c.get("firstName", ""),
+                    "profession": c.get("profession", ""),
+                }))
+
+    rows.sort(key=lambda r: r[0])
+    return meta, lists, rows
+
+
+def _person(list_number, c):
+    return (list_number, nfc(c["lastName"]).strip(), nfc(c["firstName"]).strip())
+
+
+def _index(rows):
+    """{(listNumber, lastName, firstName): [positions]}"""
+    idx = {}
+    for (list_number, pos), c in rows:
+        idx.setdefault(_person(list_number, c), []).append(pos)
+    return idx
+
+
+def _label(c):
+    return f"{c['lastName']}, {c['firstName']}" if c["firstName"] else c["lastName"]
+
+
+def diff_data(old, new):
+    """Diff two parsed election files. Returns a dict with "meta", "lists"
+    and "candidates" changes; every value is empty when nothing changed."""
+    old_meta, old_lists, old_rows = flatten(old)
+    new_meta, new_lists, new_rows = flatten(new)
+    old_idx = _index(old_rows)
+    new_idx = _index(new_rows)
+
+    candidates = {k: [] for k in ("added", "removed", "renamed", "repositioned", "professionChanged")}
+
+    def moved_to(person, pos, idx):
+        """Position the person holds on the other side, if it differs."""
+        others = [p for p in idx.get(person, ()) if p != pos]
+        return others[0] if others else None
+
+    def visit_old(key, c):
+        person = _person(key[0], c)
+        target = moved_to(person, key[1], new_idx)
+        if target is not None:
+            candidates["repositioned"].append({
+                "listNumber": key[0], "name": _label(c), "from": key[1], "to": target,
+            })
+            return True
+        return False
+
+    i = j = 0
+    while i < len(old_rows) or j < len(new_rows):
+        ok = old_rows[i][0] if i < len(old_rows) else None
+        nk = new_rows[j][0] if j < len(new_rows) else None
+
+        if nk is None or (ok is not None and ok < nk):
+            key, c = old_rows[i]
+            if not visit_old(key, c):
+                candidates["removed"].append({"listNumber": key[0], "position": key[1], "name": _label(c)})
+            i += 1
+        elif ok is None or nk < ok:
+            key, c = new_rows[j]
+            if moved_to(_person(key[0], c), key[1], old_idx) is None:
+                candidates["added"].append({"listNumber": key[0], "position": key[1], "name": _label(c)})
+            j += 1
+        else:
+            key, oc = old_rows[i]
+            nc = new_rows[j][1]
+            old_person, new_person = _person(key[0], oc), _person(key[0], nc)
+            if old_person == new_person:
+                if oc["profession"] != nc["profession"]:
+                    candidates["professionChanged"].append({
+                        "listNumber": key[0], "position": key[1], "name": _label(nc),
+                        "old": oc["profession"], "new": nc["profession"],
+                    })
+            else:
+                old_moved = visit_old(key, oc)
+                new_moved = moved_to(new_person, key[1], old_idx) is not None
+                if not old_moved and not new_moved:
+                    candidates["renamed"].append({
+                        "listNumber": key[0], "position": key[1], "old": _label(oc), "new": _label(nc),
+                    })
+                else:
+                    if not old_moved:
+                        candidates["removed"].append({"listNumber": key[0], "position": key[1], "name": _label(oc)})
+                    if not new_moved:
+                        candidates["added"].append({"listNumber": key[0], "position": key[1], "name": _label(nc)})
+            i += 1
+            j += 1
+
+    lists = []
+    for list_number in sorted(old_lists.keys() | new_lists.keys()):
+        o, n = old_lists.get(list_number), new_lists.get(list_number)
+        if o is None:
+            lists.append({"listNumber": list_number, "change": "added", "name": n["name"],
+                          "new": n["candidateCount"]})
+        elif n is None:
+            lists.append({"listNumber": list_number, "change": "removed", "name": o["name"],
+                          "old": o["candidateCount"]})
+        elif o != n:
+            lists.append({"listNumber": list_number, "change": "changed", "name": n["name"],
+                          "oldName": o["name"], "old": o["candidateCount"], "new": n["candidateCount"]})
+
+    meta = {
+        k: {"old": old_meta.get(k), "new": new_meta.get(k)}
+        for k in sorted(old_meta.keys() | new_meta.keys())
+        if old_meta.get(k) != new_meta.get(k)
+    }
+
+    return {"meta": meta, "lists": lists, "candidates": candidates}
+
+
+def is_empty(diff):
+    return not diff["meta"] and not diff["lists"] and not any(diff["candidates"].values())
+
+
+def candidate_changes(diff):
+    """Yield ((listNumber, position), description) for every changed
+    candidate, at their position in the new data (the old one if removed)."""
+    c = diff["candidates"]
+    for e in c["added"]:
+        yield (e["listNumber"], e["position"]), f"added {e['name']}"
+    for e in c["removed"]:
+        yield (e["listNumber"], e["position"]), f"removed {e['name']}"
+    for e in c["renamed"]:
+        yield (e["listNumber"], e["position"]), f"renamed {e['old']} -> {e['new']}"
+    for e in c["repositioned"]:
+        yield (e["listNumber"], e["to"]), f"moved {e['name']} from #{e['from']}"
+    for e in c["professionChanged"]:
+        yield (e["listNumber"], e["position"]), f"profession of {e['name']}: {e['old']!r} -> {e['new']!r}"
+
+
+def summarize(name, diff, where=None):
+    """One-paragraph human-readable summary of a file diff. With where
+    ({(listNumber, position): source location}), every changed candidate
+    is listed too, with its location where known."""
+    c = diff["candidates"]
+    counts = [
+        f"+{len(c['added'])}", f"-{len(c['removed'])}",
+        f"{len(c['renamed'])} renamed", f"{len(c['repositioned'])} moved",
+        f"{len(c['professionChanged'])} profession",
+    ]
+    lines = [f"{name}: {', '.join(counts)}"]
+    for field, change in diff["meta"].items():
+        lines.append(f"  {field}: {change['old']!r} -> {change['new']!r}")
+    for lst in diff["lists"]:
+        if lst["change"] == "added":
+            lines.append(f"  list {lst['listNumber']} {lst['name']}: new, {lst['new']} candidates")
+        elif lst["change"] == "removed":
+            lines.append(f"  list {lst['listNumber']} {lst['name']}: removed ({lst['old']} candidates)")
+        else:
+            name_change = f" (was {lst['oldName']})" if lst["oldName"] != lst["name"] else ""
+            lines.append(f"  list {lst['listNumber']} {lst['name']}{name_change}: {lst['old']} -> {lst['new']}")
+    if where is not None:
+        for key, change in sorted(candidate_changes(diff), key=lambda item: item[0]):
+            location = f"  @ {where[key]}" if key in where else ""
+            lines.append(f"  list {key[0]} #{key[1]} {change}{location}")
+    return "\n".join(lines)
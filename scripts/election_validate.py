@@ -0,0 +1,332 @@
+"""Validation of election data files against the app's schema and invariants.
+
+The schemas mirror the TypeScript interfaces the app loads the JSON into
+(src/types/index.ts, LandtagswahlBallot.tsx). They are written as plain
+nested specs and compiled once into checker functions at import time.
+
+On top of the schema every file is checked for:
+  - positions 1..n without gaps or duplicates in each list
+  - unique candidate ids
+  - candidateCount == len(candidates)
+  - totalStimmen/maxPerCandidate matching src/elections/*/config.ts
+  - no person (name + profession) appearing twice in one election; only
+    a warning for candidates without a profession, who may be namesakes
+  - official per-list candidate counts, where known (EXPECTED_COUNTS)
+
+Problems are returned as (level, message) tuples with level "error" or
+"warning". Parsers call check_output() on their result before writing;
+scripts/validate-data.py runs the same checks over all of public/data.
+"""
+
+import json
+import re
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ELECTIONS_DIR = PROJECT_ROOT / "src" / "elections"
+
+# Stop reporting schema errors for a file after this many
+MAX_SCHEMA_ERRORS = 20
+
+# Official candidate counts per list, from the published Wahlvorschläge
+_FRANKFURT_STVV = {
+    1: 93, 2: 58, 3: 93, 4: 93, 5: 97, 6: 42, 7: 39, 8: 74,
+    9: 14, 10: 58, 11: 46, 12: 46, 13: 46, 14: 25, 15: 7,
+    16: 90, 17: 32, 18: 32, 19: 27, 20: 3, 21: 34, 22: 16,
+}
+_FRANKFURT_KAV = {
+    1: 13, 2: 3, 3: 20, 4: 13, 5: 16, 6: 13, 7: 15, 8: 15, 9: 16,
+    10: 15, 11: 37, 12: 14, 13: 15, 14: 20, 15: 18, 16: 12, 17: 14,
+    18: 18, 19: 24, 20: 13, 21: 16, 22: 19, 23: 14, 24: 16, 25: 13, 26: 9,
+}
+EXPECTED_COUNTS = {
+    "frankfurt-stvv.json": _FRANKFURT_STVV,
+    "stvv-candidates.json": _FRANKFURT_STVV,
+    "frankfurt-kav.json": _FRANKFURT_KAV,
+    "kav-candidates.json": _FRANKFURT_KAV,
+    "wiesbaden-stvv.json": {
+        1: 81,   # CDU: 101-181
+        2: 35,   # AfD: 201-235
+        3: 81,   # SPD: 301-381
+        4: 54,   # GRÜNE: 401-454
+        5: 79,   # FDP: 501-579
+        6: 36,   # DIE LINKE: 601-636
+        7: 28,   # Volt: 701-728
+        8: 40,   # PRO AUTO: 801-840
+        9: 28,   # BLW: 901-928
+        10: 18,  # Die PARTEI: 1001-1018
+        11: 39,  # Die Gerechtigkeitspartei: 1101-1139
+        12: 29,  # BSW: 1201-1229
+        13: 37,  # FWG: 1301-1337
+        14: 3,   # PdF: 1401-1403
+        15: 74,  # FREIE WÄHLER: 1501-1574
+    },
+}
+
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+# A spec is a type (str, int), a one-element list [item_spec] or a dict of
+# field -> spec. Field names ending in "?" are optional.
+
+CANDIDATE = {
+    "id": str, "position": int, "lastName": str, "firstName": str, "profession": str,
+    "birthYear?": int, "birthPlace?": str,
+}
+PARTY = {
+    "listNumber": int, "shortName": str, "fullName": str, "candidateCount": int,
+    "candidates": [CANDIDATE],
+}
+ELECTION = {
+    "election?": str, "name?": str, "totalStimmen": int, "maxPerCandidate": int,
+    "parties": [PARTY],
+}
+LANDTAGSWAHL = {
+    "election": str, "type": str, "name": str, "date": str,
+    "wahlkreise": [{
+        "number": int, "name": str,
+        "candidates": [{
+            "id": str, "party": str, "lastName": str, "firstName": str,
+            "profession": str, "birthYear": int,
+        }],
+    }],
+    "landeslisten": [{
+        "listNumber": int, "shortName": str, "fullName": str,
+        "candidates": [{"position": int, "lastName": str, "firstName": str, "profession": str}],
+    }],
+}
+
+_TYPE_NAMES = {str: "string", int: "integer"}
+
+
+def compile_schema(spec):
+    """Compile a spec into check(value, path, errors)."""
+    if isinstance(spec, list):
+        check_item = compile_schema(spec[0])
+
+        def check_list(value, path, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected array, got {type(value).__name__}")
+                return
+            for i, item in enumerate(value):
+                check_item(item, f"{path}[{i}]", errors)
+        return check_list
+
+    if isinstance(spec, dict):
+        fields = [
+            (name.rstrip("?"), name.endswith("?"), compile_schema(sub))
+            for name, sub in spec.items()
+        ]
+        known = {name for name, _, _ in fields}
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: expected object, got {type(value).__name__}")
+                return
+            for name, optional, check in fields:
+                if name in value:
+                    check(value[name], f"{path}.{name}", errors)
+                elif not optional:
+                    errors.append(f"{path}: missing field '{name}'")
+            for name in value.keys() - known:
+                errors.append(f"{path}: unexpected field '{name}'")
+        return check_object
+
+    type_name = _TYPE_NAMES[spec]
+
+    def check_scalar(value, path, errors):
+        # bool is an int subclass but never valid here
+        if not isinstance(value, spec) or isinstance(value, bool):
+            errors.append(f"{path}: expected {type_name}, got {json.dumps(value, ensure_ascii=False)[:40]}")
+    return check_scalar
+
+
+check_election = compile_schema(ELECTION)
+check_landtagswahl = compile_schema(LANDTAGSWAHL)
+
+
+# ---------------------------------------------------------------------------
+# Election configs
+# ---------------------------------------------------------------------------
+
+_CONFIG_FIELD_RE = re.compile(
+    r"^\s*(slug|shareTypeCode|dataFile|totalStimmen|maxPerCandidate|allowListVote|allowMultipleListVotes"
+    r"|themeColor|themeColorDark):\s*'?([\w.#-]+)'?,",
+    re.M,
+)
+
+
+def load_configs():
+    """Read {dataFile: {"slug", "path", "shareTypeCode", "totalStimmen",
+    "maxPerCandidate", "allowListVote", "allowMultipleListVotes",
+    "themeColor", "themeColorDark"}} from the election configs in
+    src/elections/*/config.ts."""
+    configs = {}
+    for path in sorted(ELECTIONS_DIR.glob("*/config.ts")):
+        fields = dict(_CONFIG_FIELD_RE.findall(path.read_text(encoding="utf-8")))
+        if "dataFile" not in fields:
+            continue
+        configs[fields["dataFile"]] = {
+            "slug": fields.get("slug", path.parent.name),
+            "path": path,
+            "shareTypeCode": int(fields["shareTypeCode"]) if "shareTypeCode" in fields else None,
+            "totalStimmen": int(fields["totalStimmen"]) if "totalStimmen" in fields else None,
+            "maxPerCandidate": int(fields["maxPerCandidate"]) if "maxPerCandidate" in fields else None,
+            "allowListVote": fields.get("allowListVote") == "true",
+            "allowMultipleListVotes": fields.get("allowMultipleListVotes") == "true",
+            "themeColor": fields.get("themeColor"),
+            "themeColorDark": fields.get("themeColorDark"),
+        }
+    return configs
+
+
+def select_elections(names, configs):
+    """[(slug, data file, config)] for elections given as data file names or
+    slugs; by default every election with list votes."""
+    by_slug = {c["slug"]: (data_file, c) for data_file, c in configs.items()}
+    selected = []
+    for name in names or sorted(by_slug):
+        if name in configs:
+            data_file, config = name, configs[name]
+        elif name in by_slug:
+            data_file, config = by_slug[name]
+        else:
+            raise ValueError(f"unknown election: {name}")
+        if names or config["allowListVote"]:
+            selected.append((config["slug"], data_file, config))
+    return selected
+
+
+# ---------------------------------------------------------------------------
+# Invariants
+# ---------------------------------------------------------------------------
+
+def _list_label(party):
+    return f"Liste {party.get('listNumber')} ({party.get('shortName', '?')})"
+
+
+def _check_parties(parties, expected_counts, problems):
+    seen_ids = {}
+    seen_people = {}
+    for party in parties:
+        label = _list_label(party)
+        candidates = party.get("candidates", [])
+
+        if not candidates:
+            problems.append(("warning", f"{label}: no candidates"))
+        if "candidateCount" in party and party["candidateCount"] != len(candidates):
+            problems.append(("error", f"{label}: candidateCount {party['candidateCount']} "
+                                      f"!= {len(candidates)} candidates"))
+        if expected_counts and party.get("listNumber") in expected_counts:
+            expected = expected_counts[party["listNumber"]]
+            if len(candidates) != expected:
+                problems.append(("error", f"{label}: {len(candidates)} candidates, "
+                                          f"official list has {expected}"))
+
+        positions = [c.get("position") for c in candidates]
+        if positions and positions != list(range(1, len(positions) + 1)):
+            top = max([len(positions)] + [p for p in positions if isinstance(p, int)])
+            missing = sorted(set(range(1, top + 1)) - set(positions))
+            dupes = sorted(p for p, n in Counter(positions).items() if n > 1)
+            detail = []
+            if missing:
+                detail.append(f"missing {missing[:10]}")
+            if dupes:
+                detail.append(f"duplicated {dupes[:10]}")
+            if not detail:
+                detail.append("out of order")
+            problems.append(("error", f"{label}: positions not contiguous: {', '.join(detail)}"))
+
+        for c in candidates:
+            cid = c.get("id")
+            if cid in seen_ids:
+                problems.append(("error", f"{label}: duplicate id {cid!r} (also in {seen_ids[cid]})"))
+            else:
+                seen_ids[cid] = label
+
+            person = (c.get("lastName", ""), c.get("firstName", ""), c.get("profession", ""))
+            where = f"{label} #{c.get('position')}"
+            if person in seen_people:
+                # Without a profession namesakes cannot be told apart
+                # (voteIT exports have none), so that is only a warning
+                level = "error" if person[2] else "warning"
+                problems.append((level, f"{where}: {person[0]}, {person[1]} already on "
+                                        f"{seen_people[person]}"))
+            else:
+                seen_people[person] = where
+
+
+def validate_data(name, data, config=None, expected_counts=None):
+    """Validate one parsed data file. Returns [(level, message)].
+
+    name is the file name in public/data; it selects EXPECTED_COUNTS when
+    expected_counts is not given. config is the entry from load_configs().
+    """
+    if expected_counts is None:
+        expected_counts = EXPECTED_COUNTS.get(name)
+    problems = []
+    errors = []
+
+    if isinstance(data, dict) and "wahlkreise" in data:
+        check_landtagswahl(data, "$", errors)
+        problems.extend(("error", e) for e in errors[:MAX_SCHEMA_ERRORS])
+        for wk in data.get("wahlkreise", []):
+            if not wk.get("candidates"):
+                problems.append(("warning", f"Wahlkreis {wk.get('number')}: no candidates"))
+        ids = [c.get("id") for wk in data.get("wahlkreise", []) for c in wk.get("candidates", [])]
+        if len(ids) != len(set(ids)):
+            problems.append(("error", f"{len(ids) - len(set(ids))} duplicate candidate id(s)"))
+        return problems
+
+    check_election(data, "$", errors)
+    problems.extend(("error", e) for e in errors[:MAX_SCHEMA_ERRORS])
+    if len(errors) > MAX_SCHEMA_ERRORS:
+        problems.append(("error", f"... {len(errors) - MAX_SCHEMA_ERRORS} more schema errors"))
+    if not isinstance(data, dict) or not isinstance(data.get("parties"), list):
+        return problems
+
+    _check_parties(data["parties"], expected_counts, problems)
+
+    if config:
+        for field in ("totalStimmen", "maxPerCandidate"):
+            if config[field] is not None and data.get(field) != config[field]:
+                problems.append(("error", f"{field} is {data.get(field)}, "
+                                          f"config {config['slug']} says {config[field]}"))
+    return problems
+
+
+def validate_file(path, configs):
+    """Load and validate one file. Returns (file name, [(level, message)])."""
+    path = Path(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return path.name, [("error", f"cannot load: {e}")]
+    return path.name, validate_data(path.name, data, configs.get(path.name))
+
+
+def print_problems(problems, indent="  ", file=None):
+    """Print problems one per line. Returns True if there were no errors."""
+    for level, message in problems:
+        print(f"{indent}{level.upper()}: {message}", file=file)
+    return not any(level == "error" for level, _ in problems)
+
+
+@lru_cache(maxsize=None)
+def _configs():
+    return load_configs()
+
+
+def check_output(name, data, file=None):
+    """Validate a parser's output before it is written and print the result.
+    Returns True if there were no errors."""
+    problems = validate_data(name, data, _configs().get(name))
+    if not problems:
+        print(f"Validation: {name} OK", file=file)
+        return True
+    print(f"Validation: {name}", file=file)
+    return print_problems(problems, file=file)
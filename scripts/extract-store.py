@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Fill and query the SQLite store of extracted PDF pages.
+
+Usage: python scripts/extract-store.py ingest [pdf ...]
+       python scripts/extract-store.py lines REGEX [--limit N]
+       python scripts/extract-store.py mention WORD [--limit N]
+       python scripts/extract-store.py sql "SELECT ..."
+       python scripts/extract-store.py stats
+
+ingest extracts the given PDFs (default: every locally available PDF
+input of the pipeline jobs) into .cache/extract.sqlite, one supervised
+worker per document (see doc_runner.py); documents already stored, by
+content hash, are skipped. Parsers then read them from the store instead
+of the PDF (see extract_store.py).
+
+lines prints every stored line matching a regex, mention every page
+mentioning a word (full-text index), both as path:page: text with
+1-based page numbers. sql runs any query; REGEXP is available.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import extract_store
+from doc_runner import DocumentFailed, run_documents
+from pipeline import JOBS, job_inputs
+
+SOURCES = """
+    SELECT s.path, x.page + 1, x.text FROM ({inner}) x
+      JOIN (SELECT document_id, MIN(path) AS path FROM sources GROUP BY document_id) s
+     USING (document_id)
+"""
+
+
+def _ingest(pdf_path):
+    conn = extract_store.connect()
+    try:
+        # Documents run in parallel already, so don't shard their pages too
+        return extract_store.ingest(pdf_path, conn, workers=1)[1]
+    finally:
+        conn.close()
+
+
+def cmd_ingest(conn, args):
+    paths = args.pdfs or sorted({
+        str(p) for job in JOBS.values() for p in job_inputs(job) if str(p).endswith(".pdf")
+    })
+    missing = [p for p in paths if not os.path.exists(p)]
+    paths = [p for p in paths if p not in missing]
+    start = time.perf_counter()
+    failed = 0
+    for path, result in run_documents(_ingest, paths):
+        if isinstance(result, DocumentFailed):
+            failed += 1
+            print(f"  FAILED  {path}: {result}")
+        elif result:
+            print(f"  stored  {path} ({result} pages)")
+        else:
+            print(f"  known   {path}")
+    print(f"{len(paths)} document(s) in {time.perf_counter() - start:.1f}s, {failed} failed"
+          + (f", {len(missing)} not available locally" if missing else ""))
+    return 1 if failed else 0
+
+
+def _print_rows(rows, started):
+    n = 0
+    for path, page, text in rows:
+        print(f"{path}:{page}: {text}")
+        n += 1
+    print(f"({n} row(s), {(time.perf_counter() - started) * 1e3:.1f} ms)", file=sys.stderr)
+    return 0
+
+
+def cmd_lines(conn, args):
+    started = time.perf_counter()
+    inner = "SELECT document_id, page, idx, text FROM lines WHERE text REGEXP ?"
+    return _print_rows(conn.execute(
+        SOURCES.format(inner=inner) + " ORDER BY s.path, x.page, x.idx LIMIT ?",
+        (args.regex, args.limit)), started)
+
+
+def cmd_mention(conn, args):
+    started = time.perf_counter()
+    if extract_store.has_fts(conn):
+        inner = ("SELECT l.document_id, l.page, MIN(l.idx) AS idx, l.text FROM line_search "
+                 "JOIN lines l ON l.rowid = line_search.rowid WHERE line_search MATCH ? "
+                 "GROUP BY l.document_id, l.page")
+        word = '"' + args.word.replace('"', '""') + '"'
+    else:
+        inner = ("SELECT document_id, page, MIN(idx) AS idx, text FROM lines WHERE text LIKE ? "
+                 "GROUP BY document_id, page")
+        word = f"%{args.word}%"
+    return _print_rows(conn.execute(
+        SOURCES.format(inner=inner) + " ORDER BY s.path, x.page LIMIT ?", (word, args.limit)), started)
+
+
+def cmd_sql(conn, args):
+    cur = conn.execute(args.query)
+    if cur.description:
+        print("\t".join(d[0] for d in cur.description))
+        for row in cur:
+            print("\t".join("" if v is None else str(v) for v in row))
+    return 0
+
+
+def cmd_stats(conn, args):
+    for table in ("documents", "sources", "pages", "lines", "words", "tables", "cells"):
+        (n,) = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+        print(f"{table:10s} {n:>10,}")
+    for path, pages, at in conn.execute(
+            "SELECT s.path, d.pages, d.extracted_at FROM sources s JOIN documents d USING (document_id) "
+            "ORDER BY s.path"):
+        print(f"  {pages:4d} pages  {at}  {path}")
+    return 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    sub = ap.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("ingest", help="extract PDFs into the store")
+    p.add_argument("pdfs", nargs="*", help="PDFs (default: all pipeline inputs)")
+    p = sub.add_parser("lines", help="stored lines matching a regex")
+    p.add_argument("regex")
+    p.add_argument("--limit", type=int, default=1000)
+    p = sub.add_parser("mention", help="pages mentioning a word")
+    p.add_argument("word")
+    p.add_argument("--limit", type=int, default=1000)
+    p = sub.add_parser("sql", help="run a query")
+    p.add_argument("query")
+    sub.add_parser("stats", help="row counts and stored documents")
+    args = ap.parse_args()
+
+    conn = extract_store.connect()
+    if conn is None:
+        sys.exit("the extraction store is disabled (PDF_STORE=off)")
+    try:
+        return globals()[f"cmd_{args.command}"](conn, args)
+    except sqlite3.Error as e:
+        sys.exit(f"query failed: {e}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""SQLite store of everything extracted from the source PDFs.
+
+Every page's text, words and text lines (with bounding boxes) and table
+cells are kept in .cache/extract.sqlite, keyed by the SHA-256 of the
+document, the extractor version and the page number. The extractor
+version hashes the code the records come from (pdf_extract.py, this
+module) and the installed pdfplumber version, so editing either or
+upgrading pdfplumber re-extracts a document on its next use and drops
+the records of the previous version. Once a document is in the store,
+pdf_extract serves page_text() and extract_pages() from it without
+opening the PDF, and any question about the sources is a query:
+
+    SELECT path, page FROM pages JOIN sources USING (document_id)
+     WHERE text LIKE '%Folgeblatt%'
+
+    SELECT text FROM lines WHERE text REGEXP '^\\d{3} '
+
+Tables (one row per document / page / item):
+  documents  document_id, sha256, extractor, pages, extracted_at
+  sources    path, size, mtime_ns, document_id: where a document was seen;
+             lets a lookup skip hashing an unchanged file
+  pages      document_id, page, width, height, text
+  lines      document_id, page, idx, text, x0, top, x1, bottom
+  words      document_id, page, idx, text, x0, top, x1, bottom
+  tables     document_id, page, tbl, x0, top, x1, bottom
+  cells      document_id, page, tbl, row, col, text (NULL for an empty cell)
+  line_search  FTS5 index over lines.text, where SQLite has FTS5
+
+Pages are 0-based, as in map_pages(). REGEXP is Python's re.search.
+The database runs in WAL mode, so parsers read while another process
+ingests. PDF_STORE overrides the path; PDF_STORE=off disables the store.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from functools import lru_cache
+from importlib import metadata
+
+import pdf_extract
+from pdf_extract import extract_page, map_pages
+from pipeline import PROJECT_ROOT, sha256_file
+
+_env = os.environ.get("PDF_STORE", "")
+STORE_PATH = None if _env == "off" else (_env or str(PROJECT_ROOT / ".cache" / "extract.sqlite"))
+
+# Stored in PRAGMA user_version; a store with another one is rebuilt
+SCHEMA_VERSION = 2
+
+TABLES = ("line_search", "cells", "tables", "words", "lines", "pages", "sources", "documents")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    document_id INTEGER PRIMARY KEY, sha256 TEXT NOT NULL, extractor TEXT NOT NULL,
+    pages INTEGER NOT NULL, extracted_at TEXT NOT NULL,
+    UNIQUE (sha256, extractor)
+);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,
+    document_id INTEGER NOT NULL REFERENCES documents
+);
+CREATE TABLE IF NOT EXISTS pages (
+    document_id INTEGER NOT NULL REFERENCES documents, page INTEGER NOT NULL,
+    width REAL, height REAL, text TEXT NOT NULL,
+    PRIMARY KEY (document_id, page)
+);
+CREATE TABLE IF NOT EXISTS lines (
+    document_id INTEGER NOT NULL, page INTEGER NOT NULL, idx INTEGER NOT NULL,
+    text TEXT NOT NULL, x0 REAL, top REAL, x1 REAL, bottom REAL
+);
+CREATE INDEX IF NOT EXISTS lines_page ON lines (document_id, page);
+CREATE INDEX IF NOT EXISTS lines_text ON lines (text);
+CREATE TABLE IF NOT EXISTS words (
+    document_id INTEGER NOT NULL, page INTEGER NOT NULL, idx INTEGER NOT NULL,
+    text TEXT NOT NULL, x0 REAL, top REAL, x1 REAL, bottom REAL
+);
+CREATE INDEX IF NOT EXISTS words_page ON words (document_id, page);
+CREATE INDEX IF NOT EXISTS words_text ON words (text);
+CREATE TABLE IF NOT EXISTS tables (
+    document_id INTEGER NOT NULL, page INTEGER NOT NULL, tbl INTEGER NOT NULL,
+    x0 REAL, top REAL, x1 REAL, bottom REAL,
+    PRIMARY KEY (document_id, page, tbl)
+);
+CREATE TABLE IF NOT EXISTS cells (
+    document_id INTEGER NOT NULL, page INTEGER NOT NULL, tbl INTEGER NOT NULL,
+    row INTEGER NOT NULL, col INTEGER NOT NULL, text TEXT
+);
+CREATE INDEX IF NOT EXISTS cells_page ON cells (document_id, page, tbl);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS line_search
+    USING fts5(text, content='lines', content_rowid='rowid');
+"""
+
+
+@lru_cache(maxsize=256)
+def _regex(pattern):
+    return re.compile(pattern)
+
+
+def _regexp(pattern, value):
+    return value is not None and _regex(pattern).search(value) is not None
+
+
+@lru_cache(maxsize=None)
+def _version(stamps, pdfplumber_version):
+    h = hashlib.sha256(pdfplumber_version.encode())
+    for path in (pdf_extract.__file__, __file__):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def extractor_version():
+    """Hash of pdf_extract.py, this module and the installed pdfplumber
+    version (read from its metadata, so pdfplumber is not imported)."""
+    try:
+        pdfplumber_version = metadata.version("pdfplumber")
+    except metadata.PackageNotFoundError:
+        pdfplumber_version = "none"
+    stamps = tuple((st.st_size, st.st_mtime_ns) for st in map(os.stat, (pdf_extract.__file__, __file__)))
+    return _version(stamps, pdfplumber_version)
+
+
+def _migrate(conn):
+    """Drop the tables of a store written with another SCHEMA_VERSION; it
+    is a cache, everything in it is extracted again."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            for table in TABLES:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def connect(path=None):
+    """Open (and create) the store. Returns a connection, or None when the
+    store is disabled."""
+    path = path or STORE_PATH
+    if path is None:
+        return None
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.create_function("REGEXP", 2, _regexp, deterministic=True)
+    _migrate(conn)
+    conn.executescript(SCHEMA)
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        pass  # SQLite without FTS5: mentions fall back to LIKE
+    return conn
+
+
+def has_fts(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'line_search'").fetchone() is not None
+
+
+def document_id(conn, pdf_path):
+    """Id of the document with the content of pdf_path stored by the current
+    extractor version, or None. Only hashes the file when its size or mtime
+    changed since last seen."""
+    path = os.path.abspath(pdf_path)
+    st = os.stat(path)
+    version = extractor_version()
+    row = conn.execute(
+        "SELECT document_id FROM sources JOIN documents USING (document_id) "
+        "WHERE path = ? AND size = ? AND mtime_ns = ? AND extractor = ?",
+        (path, st.st_size, st.st_mtime_ns, version),
+    ).fetchone()
+    if row:
+        return row[0]
+    row = conn.execute("SELECT document_id FROM documents WHERE sha256 = ? AND extractor = ?",
+                       (sha256_file(path), version)).fetchone()
+    if row is None:
+        return None
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                     (path, st.st_size, st.st_mtime_ns, row[0]))
+    return row[0]
+
+
+def page_record(page):
+    """Everything the store keeps of a page: extract_page() plus words and
+    the page size. Usable with map_pages()."""
+    record = extract_page(page)
+    record["width"], record["height"] = float(page.width), float(page.height)
+    record["words"] = [
+        {k: w[k] for k in ("text", "x0", "top", "x1", "bottom")}
+        for w in page.extract_words()
+    ]
+    return record
+
+
+def _box(item):
+    return item["x0"], item["top"], item["x1"], item["bottom"]
+
+
+def _delete_document(conn, doc_id):
+    if has_fts(conn):
+        conn.execute(
+            "INSERT INTO line_search (line_search, rowid, text) "
+            "SELECT 'delete', rowid, text FROM lines WHERE document_id = ?",
+            (doc_id,),
+        )
+    for table in TABLES[1:]:
+        conn.execute(f"DELETE FROM {table} WHERE document_id = ?", (doc_id,))
+
+
+def ingest(pdf_path, conn, workers=None):
+    """Extract a PDF into the store unless its content is there already
+    from the current extractor version. Returns (document id, pages
+    extracted; 0 if it was stored)."""
+    doc_id = document_id(conn, pdf_path)
+    if doc_id is not None:
+        return doc_id, 0
+    path = os.path.abspath(pdf_path)
+    st = os.stat(path)
+    sha = sha256_file(path)
+    version = extractor_version()
+    kwargs = {} if workers is None else {"workers": workers}
+    records = map_pages(path, page_record, **kwargs)
+
+    with conn:
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO documents (sha256, extractor, pages, extracted_at) VALUES (?, ?, ?, ?)",
+            (sha, version, len(records), time.strftime("%Y-%m-%dT%H:%M:%S")),
+        )
+        if cur.rowcount == 0:
+            # Stored meanwhile by another process
+            doc_id = conn.execute("SELECT document_id FROM documents WHERE sha256 = ? AND extractor = ?",
+                                  (sha, version)).fetchone()[0]
+            conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                         (path, st.st_size, st.st_mtime_ns, doc_id))
+            return doc_id, 0
+        doc_id = cur.lastrowid
+        # Records of earlier extractor versions are never served again
+        for (old_id,) in conn.execute("SELECT document_id FROM documents WHERE sha256 = ? AND extractor != ?",
+                                      (sha, version)).fetchall():
+            _delete_document(conn, old_id)
+        conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                     (path, st.st_size, st.st_mtime_ns, doc_id))
+        for page, r in enumerate(records):
+            conn.execute("INSERT INTO pages VALUES (?, ?, ?, ?, ?)",
+                         (doc_id, page, r["width"], r["height"], r["text"]))
+            conn.executemany(
+                "INSERT INTO lines VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(doc_id, page, i, line["text"], *_box(line)) for i, line in enumerate(r["lines"])],
+            )
+            conn.executemany(
+                "INSERT INTO words VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(doc_id, page, i, w["text"], *_box(w)) for i, w in enumerate(r["words"])],
+            )
+            for t, table in enumerate(r["tables"]):
+                conn.execute("INSERT INTO tables VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (doc_id, page, t, *table["bbox"]))
+                conn.executemany(
+                    "INSERT INTO cells VALUES (?, ?, ?, ?, ?, ?)",
+                    [(doc_id, page, t, i, j, cell)
+                     for i, row in enumerate(table["rows"]) for j, cell in enumerate(row)],
+                )
+        if has_fts(conn):
+            conn.execute(
+                "INSERT INTO line_search (rowid, text) SELECT rowid, text FROM lines WHERE document_id = ?",
+                (doc_id,),
+            )
+    return doc_id, len(records)
+
+
+def page_texts(conn, doc_id):
+    """[page text] of a stored document, in page order."""
+    return [text for (text,) in conn.execute(
+        "SELECT text FROM pages WHERE document_id = ? ORDER BY page", (doc_id,))]
+
+
+def load_pages(conn, doc_id):
+    """The stored pages of a document in extract_page() form (text, lines,
+    tables), plus words, width and height."""
+    pages = [
+        {"text": text, "width": width, "height": height, "lines": [], "words": [], "tables": []}
+        for text, width, height in conn.execute(
+            "SELECT text, width, height FROM pages WHERE document_id = ? ORDER BY page", (doc_id,))
+    ]
+    for kind in ("lines", "words"):
+        for page, text, x0, top, x1, bottom in conn.execute(
+                f"SELECT page, text, x0, top, x1, bottom FROM {kind} WHERE document_id = ? "
+                f"ORDER BY page, idx", (doc_id,)):
+            pages[page][kind].append({"text": text, "x0": x0, "top": top, "x1": x1, "bottom": bottom})
+    tables = {}
+    for page, tbl, x0, top, x1, bottom in conn.execute(
+            "SELECT page, tbl, x0, top, x1, bottom FROM tables WHERE document_id = ? "
+            "ORDER BY page, tbl", (doc_id,)):
+        tables[page, tbl] = {"bbox": (x0, top, x1, bottom), "rows": []}
+        pages[page]["tables"].append(tables[page, tbl])
+    for page, tbl, row, text in conn.execute(
+            "SELECT page, tbl, row, text FROM cells WHERE document_id = ? "
+            "ORDER BY page, tbl, row, col", (doc_id,)):
+        rows = tables[page, tbl]["rows"]
+        while len(rows) <= row:
+            rows.append([])
+        rows[row].append(text)
+    return pages
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Download or refresh the source documents listed in scripts/sources.json.
+
+Usage: python scripts/fetch-sources.py [--force] [--pin] [--workers N] [source ...]
+
+Sources are fetched concurrently into the local mirror (.cache/sources, see
+sources.py) and copied to the paths the parsers read. Already-mirrored
+sources are revalidated with conditional requests, so a refresh of an
+unchanged source costs one round trip. Afterwards, build-data.py reruns
+whatever changed.
+
+--pin stores the SHA-256 of every fetched source in sources.json; later
+downloads with a different hash are rejected. A source without a pinned
+hash is accepted as served and named in a warning: pin it once the
+document has been checked against the published one.
+"""
+
+import argparse
+import sys
+import time
+
+from sources import FETCH_WORKERS, fetch_all, load_registry, save_registry
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    registry = load_registry()
+    ap.add_argument("sources", nargs="*", help=f"sources to fetch (default: all): {', '.join(registry)}")
+    ap.add_argument("--force", action="store_true", help="download even if the mirror is current")
+    ap.add_argument("--pin", action="store_true", help="record the fetched hashes in sources.json")
+    ap.add_argument("--workers", type=int, default=FETCH_WORKERS, help="concurrent downloads")
+    args = ap.parse_args()
+
+    unknown = [s for s in args.sources if s not in registry]
+    if unknown:
+        ap.error(f"unknown source(s): {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    results = fetch_all(registry, args.sources, workers=args.workers, force=args.force)
+
+    failed = []
+    for r in results:
+        state = r["state"] or {}
+        if r["status"] == "error":
+            failed.append(r["name"])
+            print(f"  error      {r['name']:22s} {r['detail']}")
+            continue
+        print(f"  {r['status']:10s} {r['name']:22s} {state['size'] / 2**20:7.1f} MB  "
+              f"{state['sha256'][:12]}  {r['seconds']:.1f}s")
+        if args.pin:
+            registry[r["name"]]["sha256"] = state["sha256"]
+
+    if args.pin:
+        save_registry(registry)
+    else:
+        unpinned = [r["name"] for r in results if r["status"] != "error" and not registry[r["name"]].get("sha256")]
+        if unpinned:
+            print(f"WARNING: not pinned, so not verified: {', '.join(unpinned)} (see --pin)")
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    print(f"{len(results)} source(s): "
+          f"{', '.join(f'{n} {status}' for status, n in sorted(counts.items()))} "
+          f"({time.perf_counter() - start:.1f}s)")
+    if failed:
+        print(f"FAILED: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
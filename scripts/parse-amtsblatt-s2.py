@@ -1,27 +1,45 @@
 #!/usr/bin/env python3
 """
-Parse the Amtsblatt S2 PDF to extract STVV and KAV candidate data.
+Parse the Amtsblatt S2 PDF to extract STVV, Ortsbeirat and KAV candidate data.
 
 The PDF has a two-column layout. We use pdfplumber to crop each page into
-left and right halves, extract text from each, and concatenate left+right
-per page to get candidates in order.
-
-Sections:
-  I.  Wahl zur Stadtverordnetenversammlung (STVV) — pages 1–19 (before "II. Wahl")
-  II. Wahl der Ortsbeiräte — skipped
-  III. Wahl der KAV — pages 48–55 (after "III. Wahl" marker)
+left and right halves and extract text from each. The document is read in
+one pass: every page's columns are extracted once, in parallel, and the
+column texts are then routed in reading order to the section they belong
+to, switching at the section headings:
+
+  I.   Wahl zur Stadtverordnetenversammlung (STVV) — from page 1
+  II.  Wahl der Ortsbeiräte — from "II. Wahl der Ortsbeiräte"
+  III. Wahl der KAV — from "III. Wahl der Kommunalen ..."
+  — up to the closing "Frankfurt am Main, 23.01.2026"
+
+Each section's text then goes to its handler. The Ortsbeirat section is
+split further at its "Ortsbezirk N" headings, and the Ortsbezirke are
+parsed in parallel; each one becomes its own election file, corrected and
+validated like the STVV and KAV. The number of seats (= Stimmen) comes
+from ORTSBEIRAT_SEATS; the count announced in the Ortsbezirk's preamble
+only cross-checks it, and an Ortsbezirk where the two disagree (or one
+missing from the table) is reported and not written.
 
 Output:
   public/data/stvv-candidates.json
   public/data/kav-candidates.json
+  public/data/ortsbeirat-<N>-candidates.json
+  and a provenance sidecar for each (see provenance.py)
 """
 
-import json
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import pdfplumber
+import pdf_extract
+from corrections import apply_overlay
+from data_writer import write_data
+from election_validate import check_output, print_problems
+from pdf_extract import map_pages, page_count
+from provenance import write_sidecar
+from textnorm import clean_cell, split_nobility, strip_nickname
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -32,31 +50,26 @@ PROJECT_DIR = SCRIPT_DIR.parent
 PDF_PATH = PROJECT_DIR / "Amtsblatt S2 Wahlvorschlaege.pdf"
 OUTPUT_DIR = PROJECT_DIR / "public" / "data"
 
-# STVV pages to scan (0-indexed): pages 1–19 (indices 0–18)
-STVV_PAGE_RANGE = range(0, 19)
-# KAV pages to scan (0-indexed): pages 48–56 (indices 47–55)
-KAV_PAGE_RANGE = range(47, 56)
-
-# Section boundary markers in the extracted text
-STVV_END_MARKER = "II. Wahl der Ortsbeiräte"
-KAV_START_MARKER = "III. Wahl der Kommunalen"
-KAV_END_MARKER = "Frankfurt am Main, 23.01.2026"
-
-# Title prefixes to strip from candidate names (order matters: longest first)
-TITLE_PREFIXES = [
-    "Prof. Dr. Dr.",
-    "Dr. Dr.",
-    "Prof. Dr.",
-    "Prof.",
-    "Dr.",
+# Section headings in reading order: (section, heading at a line start).
+# Text before the first heading is STVV; after the last one is ignored.
+SECTION_MARKERS = [
+    ("ortsbeirat", re.compile(r"^II\. Wahl der Ortsbeiräte", re.M)),
+    ("kav", re.compile(r"^III\. Wahl der Kommunalen", re.M)),
+    (None, re.compile(r"^Frankfurt am Main, 23\.01\.2026", re.M)),
 ]
 
-# Lowercase name prefixes (nobility particles, etc.)
-LOWERCASE_NAME_PREFIXES = [
-    "von der", "von den", "van der", "van den",
-    "von", "van", "de", "della", "del", "di", "el", "al",
-]
+# Sub-sections of the Ortsbeirat section: "Ortsbezirk 3 (Nordend)"
+ORTSBEZIRK_HEADING = re.compile(r"^Ortsbezirk (\d+)\b[ \t]*(.*)$", re.M)
+
+# Seats (= Stimmen) of each Ortsbeirat, as fixed by the Hauptsatzung
+ORTSBEIRAT_SEATS = {
+    1: 19, 2: 19, 3: 19, 4: 19, 5: 19, 6: 19, 7: 19, 8: 19,
+    9: 19, 10: 19, 11: 19, 12: 15, 13: 9, 14: 9, 15: 11, 16: 15,
+}
 
+# Seats of an Ortsbeirat as announced before its lists, e.g.
+# "Zu wählen sind 19 Mitglieder"; checked against ORTSBEIRAT_SEATS
+SEATS_ANNOUNCEMENT = re.compile(r"(\d+)\s+(?:Mitglieder|Vertreterinnen und Vertreter|Vertreter)\b")
 
 # ---------------------------------------------------------------------------
 # PDF text extraction
@@ -72,56 +85,46 @@ def extract_columns(page):
     return lt, rt
 
 
-def get_section_text(pdf, page_range, start_marker=None, end_marker=None):
+def extract_all_columns():
     """
-    Concatenate column text for given pages, then optionally trim to
-    the text between start_marker and end_marker.
+    Extract the column text of every page, sharding the pages across
+    worker processes. Returns [(left, right)] in page order.
     """
-    all_text = ""
-    for i in page_range:
-        lt, rt = extract_columns(pdf.pages[i])
-        all_text += lt + "\n" + rt + "\n"
-
-    if start_marker:
-        idx = all_text.find(start_marker)
-        if idx >= 0:
-            all_text = all_text[idx:]
-        else:
-            print(f"WARNING: Could not find start marker '{start_marker}'")
+    return map_pages(PDF_PATH, extract_columns, range(page_count(PDF_PATH)))
 
-    if end_marker:
-        idx = all_text.find(end_marker)
-        if idx >= 0:
-            all_text = all_text[:idx]
-        else:
-            print(f"WARNING: Could not find end marker '{end_marker}'")
 
-    return all_text
+def route_sections(columns):
+    """
+    Walk the column texts in reading order (per page left, then right) and
+    split them at the section headings. Returns {section: text}; raises
+    ValueError if a heading is missing, since the text after it would end
+    up in the wrong section.
+    """
+    texts = {"stvv": []}
+    section = "stvv"
+    markers = iter(SECTION_MARKERS)
+    pending = next(markers, None)
+    for page_columns in columns:
+        for text in page_columns:
+            text += "\n"
+            while pending and (m := pending[1].search(text)):
+                if section:
+                    texts[section].append(text[:m.start()])
+                section, text = pending[0], text[m.start():]
+                if section:
+                    texts[section] = []
+                pending = next(markers, None)
+            if section:
+                texts[section].append(text)
+    if pending:
+        raise ValueError(f"section marker not found: {pending[1].pattern}")
+    return {name: "".join(parts) for name, parts in texts.items()}
 
 
 # ---------------------------------------------------------------------------
 # Parsing logic
 # ---------------------------------------------------------------------------
 
-def strip_title(name_str):
-    """Remove academic/professional title prefixes from a name string."""
-    s = name_str.strip()
-    for prefix in TITLE_PREFIXES:
-        if s.startswith(prefix + " "):
-            s = s[len(prefix):].strip()
-            break  # only strip the first (longest) matching prefix
-    return s
-
-
-def strip_nickname(name_str):
-    """Remove parenthetical nicknames like (\u201eBäppi La Belle\u201c) from name."""
-    # Match „..." style (German quotation marks inside parens)
-    s = re.sub(r'\s*\(\u201e[^\u201c]*\u201c\)\s*', '', name_str)
-    # Match ("...") style
-    s = re.sub(r'\s*\(\u201e[^)]*\)\s*', '', s)
-    return s.strip()
-
-
 def parse_candidate_name(raw_text):
     """
     Parse a candidate name from the raw text after the position number.
@@ -136,7 +139,7 @@ def parse_candidate_name(raw_text):
     Returns: dict with lastName, firstName, profession
     """
     # Keep academic titles (Dr., Prof.) as they appear on the official ballot
-    text = raw_text.strip()
+    text = clean_cell(raw_text)
     # Strip nickname in parens
     text = strip_nickname(text)
     # Remove trailing comma if present
@@ -187,9 +190,8 @@ def is_candidate_start(line):
     if rest.startswith("Dr.") or rest.startswith("Prof."):
         return True, pos, rest
     # Lowercase nobility/name prefixes: von, van, de, della, etc.
-    for prefix in LOWERCASE_NAME_PREFIXES:
-        if rest.startswith(prefix + " "):
-            return True, pos, rest
+    if split_nobility(rest)[0]:
+        return True, pos, rest
 
     return False, 0, ""
 
@@ -336,30 +338,60 @@ def parse_candidates(lines, election_type, list_num):
     return candidates
 
 
-# ---------------------------------------------------------------------------
-# Validation
-# ---------------------------------------------------------------------------
+def split_ortsbezirke(section_text):
+    """
+    Split the Ortsbeirat section at its "Ortsbezirk N" headings. A heading
+    repeated on a later page continues the same Ortsbezirk. Returns
+    [(number, name, text)] in order of first appearance.
+    """
+    matches = list(ORTSBEZIRK_HEADING.finditer(section_text))
+    bezirke = {}
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(section_text)
+        number = int(m.group(1))
+        name = m.group(2).strip().strip("()").strip()
+        if number not in bezirke:
+            bezirke[number] = [name, []]
+        elif name and not bezirke[number][0]:
+            bezirke[number][0] = name
+        bezirke[number][1].append(section_text[m.end():end])
+    return [(number, name, "\n".join(parts)) for number, (name, parts) in bezirke.items()]
 
-def validate_candidates(parties):
-    """Check that candidate positions are sequential starting from 1."""
-    issues = []
-    for party in parties:
-        positions = [c["position"] for c in party["candidates"]]
-        if not positions:
-            issues.append(
-                f"  Liste {party['listNumber']} ({party['shortName']}): NO CANDIDATES"
-            )
-            continue
-        expected = list(range(1, max(positions) + 1))
-        if positions != expected:
-            missing = set(expected) - set(positions)
-            extra = set(positions) - set(expected)
-            issues.append(
-                f"  Liste {party['listNumber']} ({party['shortName']}): "
-                f"expected 1-{max(positions)}, got {len(positions)} entries. "
-                f"Missing: {sorted(missing)}, Extra: {sorted(extra)}"
-            )
-    return issues
+
+def parse_ortsbezirk(number, name, text):
+    """
+    Parse one Ortsbezirk's lists into an election dict. totalStimmen is
+    None for an Ortsbezirk missing from ORTSBEIRAT_SEATS. Returns
+    (election dict, seats announced in the preamble or None).
+    """
+    first_list = re.search(r'^Liste \d+$', text, re.MULTILINE)
+    announced = SEATS_ANNOUNCEMENT.search(text[:first_list.start() if first_list else len(text)])
+    data = {
+        "election": f"ortsbeirat-{number}",
+        "name": f"Ortsbeirat {number}" + (f" ({name})" if name else ""),
+        "totalStimmen": ORTSBEIRAT_SEATS.get(number),
+        "maxPerCandidate": 3,
+        "parties": parse_parties(text, f"obr{number}"),
+    }
+    return data, int(announced.group(1)) if announced else None
+
+
+def parse_ortsbeiraete(section_text):
+    """
+    Parse all Ortsbezirke of the Ortsbeirat section, fanned out to worker
+    processes (at most PDF_WORKERS). Returns {number: election dict} and
+    {number: seats announced in the preamble or None}.
+    """
+    bezirke = split_ortsbezirke(section_text)
+    workers = min(pdf_extract.PDF_WORKERS, len(bezirke))
+    if workers <= 1:
+        results = [parse_ortsbezirk(*b) for b in bezirke]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parse_ortsbezirk, *zip(*bezirke)))
+    ortsbeiraete = {number: data for (number, _, _), (data, _) in zip(bezirke, results)}
+    announced = {number: seats for (number, _, _), (_, seats) in zip(bezirke, results)}
+    return ortsbeiraete, announced
 
 
 # ---------------------------------------------------------------------------
@@ -373,12 +405,17 @@ def main():
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    pdf = pdfplumber.open(str(PDF_PATH))
-    print(f"Opened PDF: {PDF_PATH.name} ({len(pdf.pages)} pages)")
+    print(f"Opened PDF: {PDF_PATH.name} ({page_count(PDF_PATH)} pages)")
+    try:
+        sections = route_sections(extract_all_columns())
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    stvv_text = sections["stvv"]
+    kav_text = sections["kav"]
 
     # --- STVV Section ---
     print("\n=== Parsing STVV (Stadtverordnetenversammlung) ===")
-    stvv_text = get_section_text(pdf, STVV_PAGE_RANGE, end_marker=STVV_END_MARKER)
     stvv_parties = parse_parties(stvv_text, "stvv")
 
     print(f"\nSTVV Parties found: {len(stvv_parties)}")
@@ -394,19 +431,8 @@ def main():
         )
     print(f"{'TOTAL':>28} {'':<55} {total_stvv:>10}")
 
-    issues = validate_candidates(stvv_parties)
-    if issues:
-        print("\nSTVV Validation Issues:")
-        for issue in issues:
-            print(issue)
-    else:
-        print("\nSTVV: All candidate positions are sequential. OK.")
-
     # --- KAV Section ---
     print("\n=== Parsing KAV (Kommunale Ausländer- und Ausländerinnenvertretung) ===")
-    kav_text = get_section_text(
-        pdf, KAV_PAGE_RANGE, start_marker=KAV_START_MARKER, end_marker=KAV_END_MARKER
-    )
     kav_parties = parse_parties(kav_text, "kav")
 
     print(f"\nKAV Parties found: {len(kav_parties)}")
@@ -422,13 +448,16 @@ def main():
         )
     print(f"{'TOTAL':>28} {'':<55} {total_kav:>10}")
 
-    issues = validate_candidates(kav_parties)
-    if issues:
-        print("\nKAV Validation Issues:")
-        for issue in issues:
-            print(issue)
-    else:
-        print("\nKAV: All candidate positions are sequential. OK.")
+    # --- Ortsbeiräte Section ---
+    print("\n=== Parsing Ortsbeiräte ===")
+    ortsbeiraete, announced = parse_ortsbeiraete(sections["ortsbeirat"])
+    print(f"\nOrtsbezirke found: {len(ortsbeiraete)}")
+    print(f"{'Bezirk':>6} {'Name':<60} {'Seats':>5} {'Lists':>5} {'Candidates':>10}")
+    print("-" * 90)
+    for number, data in ortsbeiraete.items():
+        seats = data["totalStimmen"] if data["totalStimmen"] is not None else "?"
+        count = sum(len(p["candidates"]) for p in data["parties"])
+        print(f"{number:>6} {data['name']:<60} {seats:>5} {len(data['parties']):>5} {count:>10}")
 
     # --- Write JSON ---
     # STVV: 93 seats (voters get 93 Stimmen)
@@ -452,13 +481,44 @@ def main():
     stvv_path = OUTPUT_DIR / "stvv-candidates.json"
     kav_path = OUTPUT_DIR / "kav-candidates.json"
 
-    with open(stvv_path, "w", encoding="utf-8") as f:
-        json.dump(stvv_json, f, ensure_ascii=False, indent=2)
-    print(f"\nWrote {stvv_path}")
+    print()
+    # Every file is one section of the Amtsblatt: its candidates are
+    # located from the section's heading on
+    headings = {name: regex.pattern.lstrip("^") for name, regex in SECTION_MARKERS if name}
+    outputs = {stvv_path: (stvv_json, []), kav_path: (kav_json, [headings["kav"]])}
+    seat_problems = {}
+    for number, data in ortsbeiraete.items():
+        path = OUTPUT_DIR / f"ortsbeirat-{number}-candidates.json"
+        if data["totalStimmen"] is None:
+            print(f"WARNING: {path.name}: Ortsbezirk {number} is not in ORTSBEIRAT_SEATS, not written")
+            continue
+        outputs[path] = (data, [headings["ortsbeirat"], rf"Ortsbezirk {number}\b"])
+        if announced[number] is None:
+            seat_problems[path] = [("warning", f"no number of seats announced for Ortsbezirk {number}")]
+        elif announced[number] != data["totalStimmen"]:
+            seat_problems[path] = [("error", f"{announced[number]} seats announced for Ortsbezirk {number}, "
+                                             f"ORTSBEIRAT_SEATS has {data['totalStimmen']}")]
+
+    # A file with a correction that does not apply, failing validation or
+    # with the wrong number of seats is not written; the others still are
+    invalid = []
+    for path, (data, _) in outputs.items():
+        ok = apply_overlay(path.name, data)
+        ok = check_output(path.name, data) and ok
+        if not print_problems(seat_problems.get(path, [])) or not ok:
+            invalid.append(path)
+
+    print()
+    for path, (data, _) in outputs.items():
+        if path in invalid:
+            print(f"ERROR: {path.name} not written: validation failed")
+        else:
+            write_data(path, data)
 
-    with open(kav_path, "w", encoding="utf-8") as f:
-        json.dump(kav_json, f, ensure_ascii=False, indent=2)
-    print(f"Wrote {kav_path}")
+    print()
+    for path, (data, after) in outputs.items():
+        if path not in invalid:
+            write_sidecar(path, data, [PDF_PATH], after=after)
 
     # --- Print a few sample candidates for verification ---
     print("\n=== Sample STVV candidates ===")
@@ -473,7 +533,8 @@ def main():
         for c in p["candidates"][:3]:
             print(f"    {c['id']}: {c['position']}. {c['lastName']}, {c['firstName']} — {c['profession']}")
 
-    pdf.close()
+    if invalid:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
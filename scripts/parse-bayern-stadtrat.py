@@ -2,19 +2,24 @@
 """Parse Bayern Stadtrat Bekanntmachung PDFs to extract candidate data.
 
 Supports all Bayern top-10 cities.
-Usage: python parse-bayern-stadtrat.py <city>
+Usage: python parse-bayern-stadtrat.py <city> [<city> ...]
+       python parse-bayern-stadtrat.py all
+
+Several cities are processed as one batch: every PDF is extracted
+concurrently by a supervised worker with a time and memory budget (see
+doc_runner.py) and a consolidated summary is printed at the end.
 """
 
-import json
 import re
 import sys
 import os
-
-try:
-    import pdfplumber
-except ImportError:
-    os.system("pip install pdfplumber")
-    import pdfplumber
+import extract_store
+from doc_runner import DocumentFailed, run_documents
+from pdf_extract import PDF_WORKERS, extract_pages, map_pages, page_text
+from data_writer import summary, write_data
+from election_validate import check_output
+from provenance import write_sidecar
+from textnorm import parse_name, split_nobility, split_title
 
 SCRIPT_DIR = os.path.dirname(__file__)
 OUTPUT_DIR = os.path.join(SCRIPT_DIR, "..", "public", "data")
@@ -211,43 +216,16 @@ CITIES = {
 }
 
 
-def parse_name(raw_name: str) -> tuple[str, str]:
-    """Parse 'LastName FirstName' or 'LastName, FirstName' into (lastName, firstName)."""
-    name = raw_name.strip().rstrip(",").strip()
-
-    # Handle academic titles at the start
-    title = ""
-    title_pattern = r'^((?:Prof\.\s*)?Dr\.\s*)'
-    m = re.match(title_pattern, name)
-    if m:
-        title = m.group(1).strip()
-        name = name[m.end():].strip()
-
-    # Try "LastName, FirstName" format first (Nürnberg uses this with bold)
-    if "," in name:
-        parts = name.split(",", 1)
-        last_name = parts[0].strip()
-        first_name = parts[1].strip() if len(parts) > 1 else ""
-    else:
-        # "LastName FirstName" format
-        parts = name.split()
-        if len(parts) == 1:
-            last_name = parts[0]
-            first_name = ""
-        else:
-            last_name = parts[0]
-            first_name = " ".join(parts[1:])
-
-    if title:
-        last_name = f"{title} {last_name}"
-
-    return last_name, first_name
+def extract_text(pdf_path: str, workers: int = PDF_WORKERS) -> str:
+    """Extract all text from PDF, sharding large documents across processes.
 
-
-def extract_text(pdf_path: str) -> str:
-    """Extract all text from PDF."""
-    with pdfplumber.open(pdf_path) as pdf:
-        return "\n".join(page.extract_text() or "" for page in pdf.pages)
+    With the extraction store on, the whole document goes into the store
+    here (in the batch worker reading it), so write_sidecar() loads its
+    lines from there instead of parsing the PDF again in this process.
+    """
+    if extract_store.STORE_PATH is None:
+        return "\n".join(map_pages(pdf_path, page_text, workers=workers))
+    return "\n".join(page["text"] for page in extract_pages(pdf_path, workers))
 
 
 def parse_muenchen(text: str, city_config: dict) -> list[dict]:
@@ -353,11 +331,9 @@ def parse_nuernberg(text: str, city_config: dict) -> list[dict]:
                 profession = ""
 
             # Handle title prefix (Dr., Prof. Dr.)
-            title_match = re.match(r'^((?:apl\.\s*)?(?:Prof\.\s*)?Dr\.(?:\s*med\.)?\s*)', last_name)
-            if title_match:
-                title = title_match.group(1).strip()
-                last_name = last_name[title_match.end():].strip()
-                last_name = f"{title} {last_name}"
+            title, rest = split_title(last_name)
+            if title:
+                last_name = f"{title} {rest}"
 
             # Skip if we already have this position (from Folgeblatt duplicate)
             if any(c["position"] == pos for c in party_candidates[party_num]):
@@ -587,12 +563,7 @@ def parse_standard(text: str, city_config: dict, has_year: bool = True) -> list[
                     continue
 
                 # Strip leading title prefix before name detection
-                title = ""
-                title_pattern = r'^((?:apl\.\s*)?(?:Prof\.\s*)?Dr\.(?:\s*(?:med|phil|jur|rer|Ing)\.)?\s*(?:habil\.\s*)?)'
-                tm = re.match(title_pattern, content)
-                if tm:
-                    title = tm.group(1).strip()
-                    content = content[tm.end():].strip()
+                title, content = split_title(content)
 
                 # Detect format:
                 # A) "LastName, FirstName, Profession" (Bayreuth/Nürnberg-style)
@@ -602,7 +573,7 @@ def parse_standard(text: str, city_config: dict, has_year: bool = True) -> list[
                     first_part = parts[0].strip()
                     second_part = parts[1].strip()
                     # Strip nobiliary particles from space check
-                    name_core = re.sub(r'^(von|van|de|zu)\s+', '', first_part)
+                    name_core = split_nobility(first_part)[1]
                     has_space = " " in name_core
                     if not has_space and second_part and second_part[0].isupper() and \
                        not any(second_part.startswith(p) for p in ['Mitglied', 'Dipl', 'M.', 'B.']):
@@ -763,68 +734,155 @@ def parse_fuerth(text_parts: dict[int, str], city_config: dict) -> list[dict]:
     return parties
 
 
-def main():
-    if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <city>")
-        print(f"  city: {', '.join(CITIES.keys())}")
-        sys.exit(1)
+# Fürth publishes one PDF per Wahlvorschlag: file name -> list number
+FUERTH_PDFS = {
+    "CSU.pdf": 1, "FW.pdf": 2, "AfD.pdf": 3, "Gruene.pdf": 4,
+    "SPD.pdf": 5, "Die-Linke.pdf": 6, "FDP.pdf": 7, "Tierschutzpartei.pdf": 8,
+}
 
-    city = sys.argv[1].lower()
-    if city not in CITIES:
-        print(f"Unknown city: {city}")
-        print(f"Available: {', '.join(CITIES.keys())}")
-        sys.exit(1)
 
+def city_documents(city: str) -> list[tuple[int | None, str]]:
+    """PDFs a city needs, as (list number or None, path) pairs."""
     config = CITIES[city]
-    pdf_path = config["pdf"]
-    print(f"Parsing: {pdf_path}")
+    if config.get("parser", city) == "fuerth":
+        return [(pnum, os.path.join(config["pdf"], fname)) for fname, pnum in FUERTH_PDFS.items()]
+    return [(None, config["pdf"])]
+
 
+def parse_city(city: str, texts: dict) -> list[dict]:
+    """Run the city's parser on its extracted texts (keyed as in city_documents)."""
+    config = CITIES[city]
     parser_type = config.get("parser", city)
 
     if parser_type == "fuerth":
-        # Fürth has separate PDFs per party
-        pdf_dir = config["pdf"]
-        pdf_files = {
-            "CSU.pdf": 1, "FW.pdf": 2, "AfD.pdf": 3, "Gruene.pdf": 4,
-            "SPD.pdf": 5, "Die-Linke.pdf": 6, "FDP.pdf": 7, "Tierschutzpartei.pdf": 8,
-        }
-        text_parts: dict[int, str] = {}
-        for fname, pnum in pdf_files.items():
-            fpath = os.path.join(pdf_dir, fname)
-            text_parts[pnum] = extract_text(fpath)
-        parties = parse_fuerth(text_parts, config)
-    else:
-        text = extract_text(pdf_path)
-        if parser_type == "muenchen":
-            parties = parse_muenchen(text, config)
-        elif parser_type == "nuernberg":
-            parties = parse_nuernberg(text, config)
-        elif parser_type == "augsburg":
-            parties = parse_augsburg(text, config)
-        elif parser_type == "standard":
-            parties = parse_standard(text, config, has_year=True)
-        elif parser_type == "standard_noyear":
-            parties = parse_standard(text, config, has_year=False)
-
+        return parse_fuerth(texts, config)
+
+    text = texts[None]
+    if parser_type == "muenchen":
+        return parse_muenchen(text, config)
+    elif parser_type == "nuernberg":
+        return parse_nuernberg(text, config)
+    elif parser_type == "augsburg":
+        return parse_augsburg(text, config)
+    elif parser_type == "standard":
+        return parse_standard(text, config, has_year=True)
+    elif parser_type == "standard_noyear":
+        return parse_standard(text, config, has_year=False)
+    raise ValueError(f"Unknown parser type: {parser_type}")
+
+
+def write_city(city: str, parties: list[dict]) -> str:
+    """Print the city's totals and warnings and write its output JSON.
+    Raises ValueError if the output fails validation."""
+    config = CITIES[city]
     total_candidates = sum(p["candidateCount"] for p in parties)
     print(f"\nTotal: {len(parties)} parties, {total_candidates} candidates")
 
-    for p in parties:
-        if p["candidateCount"] == 0:
-            print(f"WARNING: {p['shortName']} has 0 candidates!")
-
     output = {
         "totalStimmen": config["stimmen"],
         "maxPerCandidate": 3,
         "parties": parties,
     }
+    if not check_output(config["output"], output):
+        raise ValueError(f"{config['output']} not written: validation failed")
 
     output_path = os.path.join(OUTPUT_DIR, config["output"])
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    write_data(output_path, output)
+    write_sidecar(output_path, output, [path for _, path in city_documents(city)])
+    return output_path
+
+
+def _extract_document(pdf_path: str) -> str:
+    # Batch worker: documents already run in parallel, so don't shard pages too
+    return extract_text(pdf_path, workers=1)
+
+
+def run_single(city: str):
+    """Parse one city whose Bekanntmachung is a single PDF, sharding its pages."""
+    pdf_path = CITIES[city]["pdf"]
+    print(f"Parsing: {pdf_path}")
+    parties = parse_city(city, {None: extract_text(pdf_path)})
+    try:
+        write_city(city, parties)
+    except ValueError as e:
+        sys.exit(f"ERROR: {city}: {e}")
+
+
+def run_batch(cities: list[str], workers: int = PDF_WORKERS) -> bool:
+    """Parse many cities, extracting their documents with doc_runner.
+
+    Every PDF (including each of Fürth's per-party PDFs) is one extraction
+    task with its own time and memory budget, so documents are read
+    concurrently and a stuck or crashing one is killed, retried and finally
+    quarantined without holding up the others. Each city is parsed and
+    written here as soon as all its documents are in (in the order given),
+    followed by a consolidated summary. With workers=1 the documents are
+    extracted in this process instead. Returns True if every city succeeded.
+    """
+    documents = {city: city_documents(city) for city in cities}
+    texts = {}
+    results = {}
+    done = 0
+
+    def finish_city(city):
+        print(f"\n=== {city} ===")
+        try:
+            city_texts = {}
+            for key, path in documents[city]:
+                print(f"Parsing: {path}")
+                if isinstance(texts[path], DocumentFailed):
+                    raise texts[path]
+                city_texts[key] = texts[path]
+            parties = parse_city(city, city_texts)
+            write_city(city, parties)
+            results[city] = parties
+        except Exception as e:
+            print(f"ERROR: {city}: {e}")
+            results[city] = e
+
+    paths = [path for city in cities for _, path in documents[city]]
+    for path, text in run_documents(_extract_document, paths, workers=workers):
+        texts[path] = text
+        while done < len(cities) and all(path in texts for _, path in documents[cities[done]]):
+            finish_city(cities[done])
+            done += 1
+
+    print(f"\n{'City':<14} {'Parties':>7} {'Candidates':>10} {'Empty':>5}  Output")
+    print("-" * 70)
+    ok = True
+    for city in cities:
+        result = results[city]
+        if isinstance(result, Exception):
+            ok = False
+            print(f"{city:<14} {'FAILED':>7}  {type(result).__name__}: {result}")
+            continue
+        n_cand = sum(p["candidateCount"] for p in result)
+        n_empty = sum(1 for p in result if p["candidateCount"] == 0)
+        print(f"{city:<14} {len(result):>7} {n_cand:>10} {n_empty:>5}  {CITIES[city]['output']}")
+    return ok
+
 
-    print(f"\nOutput: {output_path}")
+def main():
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} <city> [<city> ...] | all")
+        print(f"  city: {', '.join(CITIES.keys())}")
+        sys.exit(1)
+
+    args = [a.lower() for a in sys.argv[1:]]
+    cities = list(CITIES) if args == ["all"] else args
+    unknown = [c for c in cities if c not in CITIES]
+    if unknown:
+        print(f"Unknown city: {', '.join(unknown)}")
+        print(f"Available: {', '.join(CITIES.keys())}")
+        sys.exit(1)
+
+    if len(cities) == 1 and len(city_documents(cities[0])) == 1:
+        run_single(cities[0])
+    else:
+        ok = run_batch(cities)
+        summary()
+        if not ok:
+            sys.exit(1)
 
 
 if __name__ == "__main__":
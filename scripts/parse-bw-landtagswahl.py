@@ -9,19 +9,17 @@ Sources:
 Output: public/data/bw-landtagswahl.json
 """
 
-import json
 import re
 import sys
-import urllib.request
 from pathlib import Path
 
-try:
-    import pdfplumber
-except ImportError:
-    print("pip install pdfplumber", file=sys.stderr)
-    sys.exit(1)
+from data_writer import write_data
+from election_validate import check_output
+from pdf_extract import map_pages, page_count, page_text
+from provenance import write_sidecar
+from sources import ensure_source
+from textnorm import clean_cell
 
-PDF_URL = "https://im.baden-wuerttemberg.de/fileadmin/redaktion/m-im/intern/dateien/pdf/20260123_Kreiswahlvorschlaege_nach_70_Wahlkreisen_geordnet.pdf"
 PDF_PATH = Path("/tmp/bw-kreiswahlvorschlaege-2026.pdf")
 OUTPUT = Path(__file__).parent.parent / "public" / "data" / "bw-landtagswahl.json"
 
@@ -65,15 +63,6 @@ _party_pattern = "|".join(
 )
 
 
-def download_pdf():
-    if PDF_PATH.exists():
-        print(f"PDF already downloaded: {PDF_PATH}")
-        return
-    print(f"Downloading PDF...")
-    urllib.request.urlretrieve(PDF_URL, PDF_PATH)
-    print(f"Saved to {PDF_PATH}")
-
-
 def parse_candidate_line(line, wk_number, candidate_idx):
     """
     Parse a B-line (Bewerber) like:
@@ -98,9 +87,9 @@ def parse_candidate_line(line, wk_number, candidate_idx):
             {
                 "id": f"bw-lt-{wk_number}-{candidate_idx}",
                 "party": m.group(2),
-                "lastName": m.group(3).strip(),
-                "firstName": m.group(4).strip(),
-                "profession": m.group(5).strip(),
+                "lastName": clean_cell(m.group(3)),
+                "firstName": clean_cell(m.group(4)),
+                "profession": clean_cell(m.group(5)),
                 "birthYear": int(m.group(6)),
             },
         )
@@ -123,9 +112,9 @@ def parse_candidate_line(line, wk_number, candidate_idx):
             {
                 "id": f"bw-lt-{wk_number}-{candidate_idx}",
                 "party": m2.group(2),
-                "lastName": m2.group(3).strip(),
-                "firstName": m2.group(4).strip(),
-                "profession": m2.group(5).strip(),
+                "lastName": clean_cell(m2.group(3)),
+                "firstName": clean_cell(m2.group(4)),
+                "profession": clean_cell(m2.group(5)),
                 "birthYear": int(m2.group(6)),
             },
         )
@@ -134,57 +123,65 @@ def parse_candidate_line(line, wk_number, candidate_idx):
 
 
 def parse_kreiswahlvorschlaege():
-    """Parse 70 Wahlkreise from PDF (1 page per Wahlkreis)."""
-    pdf = pdfplumber.open(PDF_PATH)
-    assert len(pdf.pages) == 70, f"Expected 70 pages, got {len(pdf.pages)}"
+    """Parse 70 Wahlkreise from PDF (1 page per Wahlkreis).
+
+    Page text is extracted in parallel worker processes, then parsed in
+    page order.
+    """
+    n_pages = page_count(PDF_PATH)
+    assert n_pages == 70, f"Expected 70 pages, got {n_pages}"
 
     wahlkreise = []
+    for page_idx, text in enumerate(map_pages(PDF_PATH, page_text)):
+        wk = parse_wahlkreis_page(text, page_idx)
+        if wk:
+            wahlkreise.append(wk)
+
+    return wahlkreise
 
-    for page_idx, page in enumerate(pdf.pages):
-        text = page.extract_text() or ""
-        lines = text.strip().split("\n")
-
-        # Parse header: "Wahlkreis N Name"
-        wk_number = None
-        wk_name = None
-        for line in lines:
-            m = re.match(r"Wahlkreis\s+(\d+)\s+(.+)", line)
-            if m:
-                wk_number = int(m.group(1))
-                wk_name = m.group(2).strip()
-                break
-
-        if not wk_number:
-            print(f"WARNING: Could not parse Wahlkreis header on page {page_idx + 1}")
+
+def parse_wahlkreis_page(text, page_idx):
+    """Parse one Wahlkreis page's text. Returns the Wahlkreis dict or None."""
+    lines = text.strip().split("\n")
+
+    # Parse header: "Wahlkreis N Name"
+    wk_number = None
+    wk_name = None
+    for line in lines:
+        m = re.match(r"Wahlkreis\s+(\d+)\s+(.+)", line)
+        if m:
+            wk_number = int(m.group(1))
+            wk_name = m.group(2).strip()
+            break
+
+    if not wk_number:
+        print(f"WARNING: Could not parse Wahlkreis header on page {page_idx + 1}")
+        return None
+
+    candidates = []
+    candidate_idx = 0
+
+    for line in lines:
+        # Skip header lines
+        if (
+            line.startswith("Kreiswahlvorschläge")
+            or line.startswith("Wahlkreis")
+            or line.startswith("Nr.")
+            or line.startswith("E ")  # Ersatzbewerber continuation
+        ):
             continue
 
-        candidates = []
-        candidate_idx = 0
-
-        for line in lines:
-            # Skip header lines
-            if (
-                line.startswith("Kreiswahlvorschläge")
-                or line.startswith("Wahlkreis")
-                or line.startswith("Nr.")
-                or line.startswith("E ")  # Ersatzbewerber continuation
-            ):
-                continue
-
-            result = parse_candidate_line(line, wk_number, candidate_idx + 1)
-            if result:
-                _, candidate = result
-                candidate_idx += 1
-                candidates.append(candidate)
-
-        wahlkreise.append({
-            "number": wk_number,
-            "name": wk_name,
-            "candidates": candidates,
-        })
+        result = parse_candidate_line(line, wk_number, candidate_idx + 1)
+        if result:
+            _, candidate = result
+            candidate_idx += 1
+            candidates.append(candidate)
 
-    pdf.close()
-    return wahlkreise
+    return {
+        "number": wk_number,
+        "name": wk_name,
+        "candidates": candidates,
+    }
 
 
 def build_landeslisten(wahlkreise):
@@ -245,7 +242,8 @@ def collect_parties_from_wahlkreise(wahlkreise):
 
 
 def main():
-    download_pdf()
+    # Source "bw-landtagswahl" in sources.json, saved to PDF_PATH
+    ensure_source("bw-landtagswahl")
 
     print("\nParsing Kreiswahlvorschläge (70 Wahlkreise)...")
     wahlkreise = parse_kreiswahlvorschlaege()
@@ -283,12 +281,11 @@ def main():
         "wahlkreise": wahlkreise,
         "landeslisten": landeslisten,
     }
+    if not check_output(OUTPUT.name, output):
+        sys.exit(f"ERROR: {OUTPUT.name} not written: validation failed")
 
-    OUTPUT.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-
-    print(f"\nOutput written to {OUTPUT}")
+    write_data(OUTPUT, output)
+    write_sidecar(OUTPUT, output, [PDF_PATH])
     print(f"  {len(wahlkreise)} Wahlkreise, {total_candidates} candidates")
     print(f"  {len(landeslisten)} Landeslisten")
 
@@ -2,36 +2,38 @@
 """
 Parse Ausländerbeirat (KAV) candidate data for 8 Hessen cities.
 
-Output: public/data/{city}-kav.json for each city.
+Output: public/data/{city}-kav.json for each city, with a provenance
+sidecar for every city read from a PDF (see provenance.py).
 
 Each city's PDF has a different layout, so each gets its own parser.
 """
 
-import json
 import os
 import re
 import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
-import pdfplumber
+from data_writer import summary, write_data
+from election_validate import check_output
+from pdf_extract import PdfDocument, extract_page
+from provenance import ocr_page, write_sidecar
+from textnorm import clean_artifacts, split_comma_name
 
 PROJECT_ROOT = Path(__file__).parent.parent
 OUTPUT_DIR = PROJECT_ROOT / "public" / "data"
 PDF_DIR = Path("/tmp")
 
 
-def clean_text(s):
-    """Clean quadrupled/tripled chars from rendering artifacts."""
-    if not s:
-        return ""
-    s = re.sub(r'(.)\1{3,}', r'\1', s)
-    s = re.sub(r'(.)\1{2}', r'\1', s)
-    return s.strip()
+# Resolution the Marburg pages are rendered at for OCR
+OCR_DPI = 300
 
 
-def write_json(slug, name, stimmen, parties, out_path):
-    """Write election JSON and print summary."""
+def write_json(slug, name, stimmen, parties, out_path, sources=()):
+    """Write election JSON and its provenance sidecar (sources as in
+    write_sidecar(); none for hardcoded data) and print summary. Returns
+    False, writing nothing, if the data fails validation."""
     data = {
         "election": slug,
         "name": name,
@@ -40,12 +42,16 @@ def write_json(slug, name, stimmen, parties, out_path):
         "parties": parties,
     }
     total = sum(p["candidateCount"] for p in parties)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if not check_output(out_path.name, data):
+        print(f"ERROR: {out_path.name} not written: validation failed")
+        return False
+    write_data(out_path, data)
+    if sources:
+        write_sidecar(out_path, data, sources)
     print(f"\n{slug}: {len(parties)} parties, {total} candidates -> {out_path}")
     for p in parties:
         print(f"  Liste {p['listNumber']:2d} ({p['shortName']:25s}): {p['candidateCount']:3d} candidates")
+    return True
 
 
 def parse_table_split_cells(pdf_path, abbrev, party_defs):
@@ -53,13 +59,11 @@ def parse_table_split_cells(pdf_path, abbrev, party_defs):
     Also handles joined 'NNN Name, First' in col 0.
     party_defs: {list_num: (fullName, shortName)}
     """
-    pdf = pdfplumber.open(str(pdf_path))
     all_tables = []
-    for page in pdf.pages:
-        tables = page.extract_tables()
-        if tables:
-            all_tables.extend(tables)
-    pdf.close()
+    with PdfDocument(pdf_path) as doc:
+        for _, page in doc.iter_pages():
+            content = extract_page(page, text=False)
+            all_tables.extend(t["rows"] for t in content["tables"])
 
     parties = {}
     for table in all_tables:
@@ -69,7 +73,7 @@ def parse_table_split_cells(pdf_path, abbrev, party_defs):
         # Find list number from header row
         header = str(table[0][0] or "")
         # Clean artifacts
-        header_clean = clean_text(header)
+        header_clean = clean_artifacts(header)
         # Remove common prefix junk like "e\nz\n", "l\ne\n", "t\nt\ne\nz\nm\n"
         header_clean = re.sub(r'^[a-z\s\n]+', '', header_clean).strip()
 
@@ -90,8 +94,8 @@ def parse_table_split_cells(pdf_path, abbrev, party_defs):
                 continue
 
             # Strategy 1: number in col 0, name in col 1
-            col0 = clean_text(str(row[0] or "")).strip()
-            col1 = clean_text(str(row[1] or "")).strip() if len(row) > 1 else ""
+            col0 = clean_artifacts(str(row[0] or "")).strip()
+            col1 = clean_artifacts(str(row[1] or "")).strip() if len(row) > 1 else ""
 
             if col0 and col1 and re.match(r'^\d{2,4}$', col0) and re.search(r'[A-Za-zÀ-ÿ]', col1):
                 num = int(col0)
@@ -99,13 +103,7 @@ def parse_table_split_cells(pdf_path, abbrev, party_defs):
                 if position == 0:
                     position = num
                 name_str = col1
-                if ',' in name_str:
-                    parts = name_str.split(',', 1)
-                    last_name = parts[0].strip()
-                    first_name = parts[1].strip()
-                else:
-                    last_name = name_str
-                    first_name = ""
+                last_name, first_name = split_comma_name(name_str)
                 candidates.append({
                     "id": f"{abbrev}-kav-{list_num}-{position}",
                     "position": position,
@@ -123,13 +121,7 @@ def parse_table_split_cells(pdf_path, abbrev, party_defs):
                 if position == 0:
                     position = num
                 name_str = m.group(2).strip()
-                if ',' in name_str:
-                    parts = name_str.split(',', 1)
-                    last_name = parts[0].strip()
-                    first_name = parts[1].strip()
-                else:
-                    last_name = name_str
-                    first_name = ""
+                last_name, first_name = split_comma_name(name_str)
                 candidates.append({
                     "id": f"{abbrev}-kav-{list_num}-{position}",
                     "position": position,
@@ -140,20 +132,14 @@ def parse_table_split_cells(pdf_path, abbrev, party_defs):
 
         # Also check header cell for candidates (single-candidate lists like Gießen L1)
         for line in header.split('\n'):
-            line = clean_text(line.strip())
+            line = clean_artifacts(line.strip())
             m = re.match(r'^(\d{3,4})\s+([A-ZÄÖÜa-zäöüÀ-ÿ].+)$', line)
             if m:
                 num = int(m.group(1))
                 position = num % 100
                 name_str = m.group(2).strip()
                 if not any(c['position'] == position for c in candidates):
-                    if ',' in name_str:
-                        parts = name_str.split(',', 1)
-                        last_name = parts[0].strip()
-                        first_name = parts[1].strip()
-                    else:
-                        last_name = name_str
-                        first_name = ""
+                    last_name, first_name = split_comma_name(name_str)
                     candidates.append({
                         "id": f"{abbrev}-kav-{list_num}-{position}",
                         "position": position,
@@ -184,15 +170,14 @@ def parse_table_split_cells(pdf_path, abbrev, party_defs):
 
 def parse_kassel(pdf_path):
     """Parse Kassel KAV - text extraction with heavy artifact cleanup."""
-    pdf = pdfplumber.open(str(pdf_path))
     full_text = ""
-    for page in pdf.pages:
-        text = page.extract_text()
-        if text:
-            full_text += text + "\n"
-    pdf.close()
+    with PdfDocument(pdf_path) as doc:
+        for _, page in doc.iter_pages():
+            text = page.extract_text()
+            if text:
+                full_text += text + "\n"
 
-    cleaned = clean_text(full_text)
+    cleaned = clean_artifacts(full_text)
 
     party_defs = {
         1: ("Gemeinschaft 2000", "G 2000"),
@@ -239,21 +224,28 @@ def parse_kassel(pdf_path):
 
 
 def parse_marburg_ocr(pdf_path):
-    """Parse Marburg KAV via OCR."""
+    """Parse Marburg KAV via OCR. Returns (parties, OCR layout of the pages
+    for the provenance sidecar)."""
     tmpdir = tempfile.mkdtemp()
     subprocess.run(
-        ['pdftoppm', '-png', '-r', '300', '-f', '1', '-l', '2', str(pdf_path), f'{tmpdir}/page'],
+        ['pdftoppm', '-png', '-r', str(OCR_DPI), '-f', '1', '-l', '2', str(pdf_path), f'{tmpdir}/page'],
         check=True, capture_output=True,
     )
 
     full_text = ""
+    ocr_pages = []
     for img in sorted(os.listdir(tmpdir)):
         if img.endswith('.png'):
-            result = subprocess.run(
-                ['tesseract', os.path.join(tmpdir, img), '-', '-l', 'deu'],
+            # One OCR pass, written as plain text and as TSV with word boxes
+            base = os.path.join(tmpdir, img[:-4])
+            subprocess.run(
+                ['tesseract', os.path.join(tmpdir, img), base, '-l', 'deu', 'txt', 'tsv'],
                 capture_output=True, text=True,
             )
-            full_text += result.stdout + "\n"
+            with open(f"{base}.txt", encoding="utf-8") as f:
+                full_text += f.read() + "\n"
+            with open(f"{base}.tsv", encoding="utf-8") as f:
+                ocr_pages.append(ocr_page(f.read(), OCR_DPI))
 
     party_names = {
         1: ("Gruppe ohne Grenzen", "GOG"),
@@ -294,7 +286,7 @@ def parse_marburg_ocr(pdf_path):
         p["candidates"] = deduped
         p["candidateCount"] = len(deduped)
         result.append(p)
-    return result
+    return result, ocr_pages
 
 
 def parse_ruesselsheim_hardcoded():
@@ -373,6 +365,7 @@ def parse_ruesselsheim_hardcoded():
 
 
 def main():
+    ok = True
     # ============================================================
     # DARMSTADT (21 Stimmen, 6 lists)
     # ============================================================
@@ -385,7 +378,8 @@ def main():
         6: ("Progressive Ausländer Union", "PAU"),
     }
     darmstadt = parse_table_split_cells(PDF_DIR / "darmstadt-kav.pdf", "da", da_parties)
-    write_json("darmstadt-kav", "Ausländerbeirat", 21, darmstadt, OUTPUT_DIR / "darmstadt-kav.json")
+    ok &= write_json("darmstadt-kav", "Ausländerbeirat", 21, darmstadt, OUTPUT_DIR / "darmstadt-kav.json",
+                     [PDF_DIR / "darmstadt-kav.pdf"])
 
     # ============================================================
     # FULDA (11 Stimmen, 5 lists)
@@ -398,7 +392,8 @@ def main():
         5: ("Demokratische Union Fulda", "DUF"),
     }
     fulda = parse_table_split_cells(PDF_DIR / "fulda-kav.pdf", "fu", fu_parties)
-    write_json("fulda-kav", "Ausländerbeirat", 11, fulda, OUTPUT_DIR / "fulda-kav.json")
+    ok &= write_json("fulda-kav", "Ausländerbeirat", 11, fulda, OUTPUT_DIR / "fulda-kav.json",
+                     [PDF_DIR / "fulda-kav.pdf"])
 
     # ============================================================
     # GIEßEN (31 Stimmen, 5 lists)
@@ -411,7 +406,8 @@ def main():
         5: ("Ukraine Liste", "UL"),
     }
     giessen = parse_table_split_cells(PDF_DIR / "giessen-kav.pdf", "gi", gi_parties)
-    write_json("giessen-kav", "Ausländerbeirat", 31, giessen, OUTPUT_DIR / "giessen-kav.json")
+    ok &= write_json("giessen-kav", "Ausländerbeirat", 31, giessen, OUTPUT_DIR / "giessen-kav.json",
+                     [PDF_DIR / "giessen-kav.pdf"])
 
     # ============================================================
     # HANAU (15 Stimmen, 2 lists)
@@ -421,19 +417,22 @@ def main():
         2: ("Sozialdemokratische Partei Deutschlands", "SPD"),
     }
     hanau = parse_table_split_cells(PDF_DIR / "hanau-kav.pdf", "ha", ha_parties)
-    write_json("hanau-kav", "Ausländerbeirat", 15, hanau, OUTPUT_DIR / "hanau-kav.json")
+    ok &= write_json("hanau-kav", "Ausländerbeirat", 15, hanau, OUTPUT_DIR / "hanau-kav.json",
+                     [PDF_DIR / "hanau-kav.pdf"])
 
     # ============================================================
     # KASSEL (37 Stimmen, 6 lists)
     # ============================================================
     kassel = parse_kassel(PDF_DIR / "kassel-kav.pdf")
-    write_json("kassel-kav", "Ausländerbeirat", 37, kassel, OUTPUT_DIR / "kassel-kav.json")
+    ok &= write_json("kassel-kav", "Ausländerbeirat", 37, kassel, OUTPUT_DIR / "kassel-kav.json",
+                     [PDF_DIR / "kassel-kav.pdf"])
 
     # ============================================================
     # MARBURG (15 Stimmen, 3 lists)
     # ============================================================
-    marburg = parse_marburg_ocr(PDF_DIR / "marburg-kav.pdf")
-    write_json("marburg-kav", "Ausländerbeirat", 15, marburg, OUTPUT_DIR / "marburg-kav.json")
+    marburg, marburg_ocr = parse_marburg_ocr(PDF_DIR / "marburg-kav.pdf")
+    ok &= write_json("marburg-kav", "Ausländerbeirat", 15, marburg, OUTPUT_DIR / "marburg-kav.json",
+                     [(PDF_DIR / "marburg-kav.pdf", marburg_ocr)])
 
     # ============================================================
     # OFFENBACH (25 Stimmen, 9 lists)
@@ -450,13 +449,18 @@ def main():
         9: ("Türkische Gemeinschaft", "TG"),
     }
     offenbach = parse_table_split_cells(PDF_DIR / "offenbach-kav.pdf", "of", of_parties)
-    write_json("offenbach-kav", "Ausländerbeirat", 25, offenbach, OUTPUT_DIR / "offenbach-kav.json")
+    ok &= write_json("offenbach-kav", "Ausländerbeirat", 25, offenbach, OUTPUT_DIR / "offenbach-kav.json",
+                     [PDF_DIR / "offenbach-kav.pdf"])
 
     # ============================================================
     # RÜSSELSHEIM (21 Stimmen)
     # ============================================================
     ruesselsheim = parse_ruesselsheim_hardcoded()
-    write_json("ruesselsheim-kav", "Ausländerbeirat", 21, ruesselsheim, OUTPUT_DIR / "ruesselsheim-kav.json")
+    ok &= write_json("ruesselsheim-kav", "Ausländerbeirat", 21, ruesselsheim,
+                     OUTPUT_DIR / "ruesselsheim-kav.json")
+    summary()
+    if not ok:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
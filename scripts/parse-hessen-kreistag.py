@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Parse Hessen Kreistagswahl Bekanntmachungen to extract candidate data.
+
+Usage: python parse-hessen-kreistag.py <kreis> [<kreis> ...]
+       python parse-hessen-kreistag.py all
+
+The Landkreise publish their zugelassene Wahlvorschläge as ruled tables
+(Lfd. Nr. | Name | Vorname | Beruf ...), one per list, each under a
+"Wahlvorschlag N: ..." heading. One engine handles them all, driven by
+the per-Kreis entry in KREISE:
+
+  pdf, output, stimmen, id_prefix   source, data file, seats, candidate ids
+  parties       {list number: (shortName, fullName)}; lists not in it are
+                named from their heading
+  header        regex for a list heading, group 1 the list number and
+                group 2 the name (default: HEADER_PATTERN)
+  columns       table columns of position, last name, first name and
+                profession (default: COLUMNS)
+
+Every table is assigned to the nearest list heading above it. A table
+with no heading above it on its page continues the last list of the
+previous page, so continuation tables and pages whose heading and table
+counts differ (a heading at the bottom of a page, its table on the next)
+need no special cases. Rows repeating a position already read (repeated
+header rows) are skipped.
+
+Several Kreise are processed as one batch, every PDF extracted by a
+supervised worker with a time and memory budget (see doc_runner.py),
+with a consolidated summary at the end; a single Kreis has its pages
+sharded instead.
+
+Output: public/data/<output> for each Kreis, and its provenance sidecar.
+"""
+
+import os
+import re
+import sys
+
+from data_writer import summary, write_data
+from doc_runner import DocumentFailed, run_documents
+from election_validate import check_output
+from pdf_extract import PDF_WORKERS, extract_pages
+from provenance import write_sidecar
+from textnorm import clean_cell
+
+SCRIPT_DIR = os.path.dirname(__file__)
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "..", "public", "data")
+
+HEADER_PATTERN = r"Wahlvorschlag\s+(\d+):\s*(.*)"
+COLUMNS = (0, 1, 2, 3)
+
+KREISE = {
+    "dadi": {
+        "name": "Darmstadt-Dieburg",
+        "pdf": "/tmp/dadi-kreistag.pdf",
+        "output": "dadi-kreistag.json",
+        "stimmen": 81,
+        "id_prefix": "dd-kt",
+        "parties": {
+            1:  ("CDU", "Christlich Demokratische Union Deutschlands"),
+            2:  ("AfD", "Alternative für Deutschland"),
+            3:  ("SPD", "Sozialdemokratische Partei Deutschlands"),
+            4:  ("GRÜNE", "BÜNDNIS 90/DIE GRÜNEN"),
+            5:  ("FDP", "Freie Demokratische Partei"),
+            6:  ("Die Linke", "Die Linke"),
+            7:  ("UWG", "Unabhängige Wählergemeinschaften Darmstadt-Dieburg"),
+            8:  ("FREIE WÄHLER", "FREIE WÄHLER"),
+            9:  ("Die PARTEI", "Partei für Arbeit, Rechtsstaat, Tierschutz, Elitenförderung und basisdemokratische Initiative"),
+            10: ("Volt", "Volt Deutschland"),
+            11: ("Tierschutzpartei", "PARTEI MENSCH UMWELT TIERSCHUTZ"),
+            12: ("BSW", "Bündnis Sahra Wagenknecht - Vernunft und Gerechtigkeit"),
+        },
+    },
+}
+
+
+def extract_layout(pdf_path, workers=PDF_WORKERS):
+    """Text lines and tables of every page with their vertical position, as
+    [{"lines": [(top, text)], "tables": [(top, rows)]}]."""
+    return [
+        {
+            "lines": [(line["top"], line["text"]) for line in content["lines"]],
+            "tables": [(t["bbox"][1], t["rows"]) for t in content["tables"]],
+        }
+        for content in extract_pages(pdf_path, workers)
+    ]
+
+
+def assign_tables(pages, header_re):
+    """Walk the pages in order and assign every table to its list.
+
+    Returns ({list number: [table rows]}, {list number: heading name}) with
+    the lists in order of their headings.
+    """
+    tables_by_list = {}
+    names = {}
+    current = None
+    for page_idx, page in enumerate(pages):
+        headers = []
+        for top, text in page["lines"]:
+            m = header_re.match(text)
+            if m:
+                headers.append((top, int(m.group(1))))
+                names.setdefault(int(m.group(1)), m.group(2).strip())
+                tables_by_list.setdefault(int(m.group(1)), [])
+        for top, rows in sorted(page["tables"], key=lambda t: t[0]):
+            above = [num for header_top, num in headers if header_top < top]
+            owner = above[-1] if above else current
+            if owner is None:
+                print(f"  WARNING: page {page_idx + 1}: table before the first list heading, skipped")
+                continue
+            tables_by_list[owner].append(rows)
+        if headers:
+            current = max(headers)[1]
+    return tables_by_list, names
+
+
+def extract_candidates(tables, list_num, config):
+    """Candidate rows of one list's tables, in position order."""
+    pos_col, last_col, first_col, prof_col = config.get("columns", COLUMNS)
+    candidates = {}
+    for table in tables:
+        for row in table:
+            if not row or len(row) <= max(pos_col, last_col, first_col, prof_col) or not row[pos_col]:
+                continue
+            lfd_nr = row[pos_col].strip().replace("\n", "")
+            if not lfd_nr.isdigit():
+                continue  # header row
+            pos = int(lfd_nr)
+            # Skip duplicates (from repeated headers on continuation pages)
+            if pos in candidates:
+                continue
+            candidates[pos] = {
+                "id": f"{config['id_prefix']}-{list_num}-{pos}",
+                "position": pos,
+                "lastName": clean_cell(row[last_col]),
+                "firstName": clean_cell(row[first_col]),
+                "profession": clean_cell(row[prof_col]),
+            }
+    return [candidates[pos] for pos in sorted(candidates)]
+
+
+def parse_kreis(kreis, pages):
+    """Build the parties of a Kreis from its extracted page layouts."""
+    config = KREISE[kreis]
+    header_re = re.compile(config.get("header", HEADER_PATTERN))
+    tables_by_list, names = assign_tables(pages, header_re)
+
+    party_defs = dict(config["parties"])
+    for list_num in tables_by_list.keys() - party_defs.keys():
+        if party_defs:
+            print(f"  WARNING: Wahlvorschlag {list_num} is not in the party table, named from its heading")
+        party_defs[list_num] = (names[list_num], names[list_num])
+
+    parties = []
+    for list_num in sorted(party_defs):
+        short_name, full_name = party_defs[list_num]
+        candidates = extract_candidates(tables_by_list.get(list_num, []), list_num, config)
+        parties.append({
+            "listNumber": list_num,
+            "fullName": full_name,
+            "shortName": short_name,
+            "candidateCount": len(candidates),
+            "candidates": candidates,
+        })
+        print(f"  Liste {list_num}: {short_name} — {len(candidates)} candidates")
+    return parties
+
+
+def write_kreis(kreis, parties):
+    """Print the Kreis's totals, validate and write its output JSON.
+    Raises ValueError if the output fails validation."""
+    config = KREISE[kreis]
+    total_candidates = sum(p["candidateCount"] for p in parties)
+    print(f"\nTotal: {len(parties)} parties, {total_candidates} candidates")
+
+    output = {
+        "totalStimmen": config["stimmen"],
+        "maxPerCandidate": 3,
+        "parties": parties,
+    }
+    if not check_output(config["output"], output):
+        raise ValueError(f"{config['output']} not written: validation failed")
+    path = os.path.join(OUTPUT_DIR, config["output"])
+    write_data(path, output)
+    write_sidecar(path, output, [config["pdf"]])
+
+
+def _extract_document(pdf_path):
+    # Batch worker: documents already run in parallel, so don't shard pages too
+    return extract_layout(pdf_path, workers=1)
+
+
+def run(kreise, workers=PDF_WORKERS):
+    """Parse the given Kreise. One Kreis has its pages sharded across the
+    workers; several are extracted one supervised worker per document (see
+    doc_runner.py), each Kreis parsed and written here as soon as its
+    document is in. Returns {kreis: parties or exception}."""
+    results = {}
+
+    def finish(kreis, pages):
+        config = KREISE[kreis]
+        print(f"\n=== {config['name']} ({kreis}) ===")
+        print(f"Parsing: {config['pdf']}")
+        try:
+            if isinstance(pages, DocumentFailed):
+                raise pages
+            parties = parse_kreis(kreis, pages)
+            write_kreis(kreis, parties)
+            results[kreis] = parties
+        except Exception as e:
+            print(f"ERROR: {kreis}: {e}")
+            results[kreis] = e
+
+    if len(kreise) == 1:
+        kreis = kreise[0]
+        try:
+            pages = extract_layout(KREISE[kreis]["pdf"], workers)
+        except Exception as e:
+            pages = DocumentFailed(KREISE[kreis]["pdf"], f"{type(e).__name__}: {e}", 1)
+        finish(kreis, pages)
+        return results
+
+    # Kreise may share a PDF (e.g. one Bekanntmachung for several); it is
+    # read once
+    by_pdf = {}
+    for kreis in kreise:
+        by_pdf.setdefault(KREISE[kreis]["pdf"], []).append(kreis)
+    for pdf, pages in run_documents(_extract_document, list(by_pdf), workers=workers):
+        for kreis in by_pdf[pdf]:
+            finish(kreis, pages)
+    return results
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} <kreis> [<kreis> ...] | all")
+        print(f"  kreis: {', '.join(KREISE)}")
+        sys.exit(1)
+
+    args = [a.lower() for a in sys.argv[1:]]
+    kreise = list(KREISE) if args == ["all"] else list(dict.fromkeys(args))
+    unknown = [k for k in kreise if k not in KREISE]
+    if unknown:
+        print(f"Unknown Kreis: {', '.join(unknown)}")
+        print(f"Available: {', '.join(KREISE)}")
+        sys.exit(1)
+
+    results = run(kreise)
+    if len(kreise) > 1:
+        print(f"\n{'Kreis':<14} {'Parties':>7} {'Candidates':>10} {'Empty':>5}  Output")
+        print("-" * 70)
+        for kreis in kreise:
+            result = results[kreis]
+            if isinstance(result, Exception):
+                print(f"{kreis:<14} {'FAILED':>7}  {type(result).__name__}: {result}")
+                continue
+            n_cand = sum(p["candidateCount"] for p in result)
+            n_empty = sum(1 for p in result if p["candidateCount"] == 0)
+            print(f"{kreis:<14} {len(result):>7} {n_cand:>10} {n_empty:>5}  {KREISE[kreis]['output']}")
+    summary()
+    if any(isinstance(result, Exception) for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,15 @@
 #!/usr/bin/env python3
 """Parse the München Stadtrat 2026 Bekanntmachung PDF to extract candidate data."""
 
-import json
 import re
 import sys
 import os
 
-try:
-    import pdfplumber
-except ImportError:
-    os.system("pip install pdfplumber")
-    import pdfplumber
+from data_writer import write_data
+from election_validate import check_output
+from pdf_extract import map_pages, page_text
+from provenance import write_sidecar
+from textnorm import parse_name
 
 PDF_PATH = os.environ.get(
     "PDF_PATH",
@@ -58,56 +57,16 @@ KENNWORT_MAP = {
 }
 
 
-def parse_name(raw_name: str) -> tuple[str, str]:
-    """Parse 'LastName FirstName' or 'Dr. LastName FirstName' into (lastName, firstName).
-
-    The PDF format is: "Familienname, Vorname, evtl.: Geburtsname und akademische Grade..."
-    First line: "Baumgärtner Clemens,"
-    So format is: LastName FirstName, (with comma at end, profession on next line)
-
-    Handle titles like Dr., Prof., etc.
-    """
-    # Remove trailing comma if present
-    name = raw_name.strip().rstrip(",").strip()
-
-    # Handle academic titles at the start
-    title = ""
-    title_pattern = r'^((?:Prof\.\s*)?Dr\.\s*)'
-    m = re.match(title_pattern, name)
-    if m:
-        title = m.group(1).strip()
-        name = name[m.end():].strip()
-
-    # Split on first space: "LastName FirstName" or "LastName-Part FirstName"
-    # But be careful with multi-part last names like "Spiegel-Luttringer Annamaria"
-    # or "Dueñas Martin Del Campo Alejandro"
-    parts = name.split()
-    if len(parts) == 1:
-        last_name = parts[0]
-        first_name = ""
-    else:
-        last_name = parts[0]
-        first_name = " ".join(parts[1:])
-
-    # Prepend title to lastName
-    if title:
-        last_name = f"{title} {last_name}"
-
-    return last_name, first_name
-
-
 def extract_candidates(pdf_path: str) -> list[dict]:
     """Extract all parties and candidates from the PDF."""
     parties = []
     current_party_num = None
     current_candidates = []
 
-    with pdfplumber.open(pdf_path) as pdf:
-        full_text = ""
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                full_text += text + "\n"
+    full_text = ""
+    for text in map_pages(pdf_path, page_text):
+        if text:
+            full_text += text + "\n"
 
     # Split by party headers
     # Pattern: "Für die Wahl des Stadtrats wurden beim Wahlvorschlag Nr. X"
@@ -203,26 +162,16 @@ def main():
     if len(parties) != 14:
         print(f"WARNING: Expected 14 parties, got {len(parties)}")
 
-    for p in parties:
-        if p["candidateCount"] == 0:
-            print(f"WARNING: {p['shortName']} has 0 candidates!")
-        # Verify positions are sequential
-        positions = [c["position"] for c in p["candidates"]]
-        expected = list(range(1, len(positions) + 1))
-        if positions != expected:
-            print(f"WARNING: {p['shortName']} positions not sequential: {positions[:5]}...")
-
     output = {
         "totalStimmen": 80,
         "maxPerCandidate": 3,
         "parties": parties,
     }
+    if not check_output(os.path.basename(OUTPUT_PATH), output):
+        sys.exit(f"ERROR: {os.path.basename(OUTPUT_PATH)} not written: validation failed")
 
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-
-    print(f"\nOutput: {OUTPUT_PATH}")
+    write_data(OUTPUT_PATH, output)
+    write_sidecar(OUTPUT_PATH, output, [PDF_PATH])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""Parse voteIT Probestimmzettel HTML exports to extract candidate data.
+
+Usage: python parse-voteit.py <municipality> [<municipality> ...]
+       python parse-voteit.py all
+
+Many Hessian municipalities publish their sample ballot with voteIT, all
+in the same markup: one table per Wahlvorschlag, its name in
+<small id="name-liste-L">, and per candidate K a number cell
+id="stimmzettelposL-kandidatK-nr" and a name cell
+id="stimmzettelposL-kandidatK-nennung1" ("Last, First"). One engine
+handles them all, driven by the per-municipality entry in MUNICIPALITIES:
+
+  html, output, stimmen, id_prefix   source, data file, seats, candidate ids
+  parties       {list number: (shortName, fullName)}; lists not in it are
+                named from the export
+
+The export is read in chunks through an HTML tokenizer that only keeps
+the text of those elements, so a file is never held in memory as a whole
+and the markup around them (attribute order, whitespace, extra classes)
+does not matter. Lists are numbered, and candidates positioned, in ballot
+order; candidates come out in the app's schema directly. The L in the
+element ids is voteIT's own list id, not the ballot number, so each
+list's name is checked against the party table instead: a name that
+belongs to another number there means the ballot order was misread, and
+the municipality is not written.
+
+Each candidate's provenance sidecar entry is the id of the element its
+name was read from (see provenance.py).
+
+Several municipalities are processed as one batch, each export read by a
+supervised worker (see doc_runner.py), with a consolidated summary at the
+end.
+
+Output: public/data/<output> and its provenance sidecar for each
+municipality.
+"""
+
+import os
+import re
+import sys
+from html.parser import HTMLParser
+
+from data_writer import summary, write_data
+from doc_runner import DocumentFailed, run_documents
+from election_validate import check_output
+from pdf_extract import PDF_WORKERS
+from provenance import write_element_sidecar
+from textnorm import split_comma_name
+
+SCRIPT_DIR = os.path.dirname(__file__)
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "..", "public", "data")
+
+# Characters fed to the tokenizer at a time
+CHUNK_SIZE = 1 << 16
+
+MUNICIPALITIES = {
+    "kassel": {
+        "name": "Kassel",
+        "html": "/tmp/kassel-probe.html",
+        "output": "kassel-stvv.json",
+        "stimmen": 71,
+        "id_prefix": "ks-stvv",
+        "parties": {
+            1:  ("CDU", "Christlich Demokratische Union Deutschlands"),
+            2:  ("AfD", "Alternative für Deutschland"),
+            3:  ("SPD", "Sozialdemokratische Partei Deutschlands"),
+            4:  ("GRÜNE", "BÜNDNIS 90/DIE GRÜNEN"),
+            5:  ("FDP", "Freie Demokratische Partei"),
+            6:  ("Die Linke", "DIE LINKE"),
+            7:  ("FREIE WÄHLER", "FREIE WÄHLER"),
+            8:  ("Die PARTEI", "Partei für Arbeit, Rechtsstaat, Tierschutz, Elitenförderung und basisdemokratische Initiative"),
+            9:  ("Ehrenamt und Sport", "Ehrenamt und Sport für Kassel"),
+            10: ("MERA25", "MERA25 – Gemeinsam für Frieden, Solidarität und Freiheit"),
+            11: ("Tierschutzpartei", "PARTEI MENSCH UMWELT TIERSCHUTZ"),
+            12: ("Volt", "Volt Deutschland"),
+            13: ("BSW", "Bündnis Sahra Wagenknecht – Vernunft und Gerechtigkeit"),
+        },
+    },
+    "hanau": {
+        "name": "Hanau",
+        "html": "/tmp/hanau-probe.html",
+        "output": "hanau-stvv.json",
+        "stimmen": 59,
+        "id_prefix": "hu-stvv",
+        "parties": {
+            1:  ("CDU", "Christlich Demokratische Union Deutschlands"),
+            2:  ("AfD", "Alternative für Deutschland"),
+            3:  ("SPD", "Sozialdemokratische Partei Deutschlands"),
+            4:  ("GRÜNE", "BÜNDNIS 90/DIE GRÜNEN"),
+            5:  ("FDP", "Freie Demokratische Partei"),
+            6:  ("BfH", "Bürger für Hanau"),
+            7:  ("Die Linke", "DIE LINKE"),
+            8:  ("Volt", "Volt Deutschland"),
+            9:  ("FW", "FREIE WÄHLER"),
+            10: ("BSW", "Bündnis Sahra Wagenknecht – Vernunft und Gerechtigkeit"),
+            11: ("Team Todenhöfer", "Team Todenhöfer – Die Gerechtigkeitspartei"),
+        },
+    },
+    "offenbach": {
+        "name": "Offenbach",
+        "html": "/tmp/offenbach-probe.html",
+        "output": "offenbach-stvv.json",
+        "stimmen": 71,
+        "id_prefix": "of-stvv",
+        "parties": {
+            1:  ("CDU", "Christlich Demokratische Union Deutschlands"),
+            2:  ("AfD", "Alternative für Deutschland"),
+            3:  ("SPD", "Sozialdemokratische Partei Deutschlands"),
+            4:  ("GRÜNE", "BÜNDNIS 90/DIE GRÜNEN"),
+            5:  ("FDP", "Freie Demokratische Partei"),
+            6:  ("Die Linke", "DIE LINKE"),
+            7:  ("FREIE WÄHLER", "FREIE WÄHLER"),
+            8:  ("BIG", "Bündnis für Innovation & Gerechtigkeit"),
+            9:  ("BSW", "Bündnis Sahra Wagenknecht – Vernunft und Gerechtigkeit"),
+            10: ("Tierschutzpartei", "PARTEI MENSCH UMWELT TIERSCHUTZ"),
+            11: ("Volt", "Volt Deutschland"),
+            12: ("Offenbach für alle", "Offenbach für alle"),
+        },
+    },
+    "giessen": {
+        "name": "Gießen",
+        "html": "/tmp/giessen-probe.html",
+        "output": "giessen-stvv.json",
+        "stimmen": 59,
+        "id_prefix": "gi-stvv",
+        "parties": {
+            1:  ("CDU", "Christlich Demokratische Union Deutschlands"),
+            2:  ("AfD", "Alternative für Deutschland"),
+            3:  ("SPD", "Sozialdemokratische Partei Deutschlands"),
+            4:  ("GRÜNE", "BÜNDNIS 90/DIE GRÜNEN"),
+            5:  ("FDP", "Freie Demokratische Partei"),
+            6:  ("Gigg", "Gießener Grüne im Gespräch"),
+            7:  ("FW", "FREIE WÄHLER"),
+            8:  ("Die PARTEI", "Partei für Arbeit, Rechtsstaat, Tierschutz, Elitenförderung und basisdemokratische Initiative"),
+            9:  ("Volt", "Volt Deutschland"),
+            10: ("GSF", "Gießener Soziales Forum"),
+            11: ("BSW", "Bündnis Sahra Wagenknecht – Vernunft und Gerechtigkeit"),
+            12: ("Die Linke", "DIE LINKE"),
+        },
+    },
+    "marburg": {
+        "name": "Marburg",
+        "html": "/tmp/marburg-probe.html",
+        "output": "marburg-stvv.json",
+        "stimmen": 59,
+        "id_prefix": "mr-stvv",
+        "parties": {
+            1:  ("CDU", "Christlich Demokratische Union Deutschlands"),
+            2:  ("AfD", "Alternative für Deutschland"),
+            3:  ("SPD", "Sozialdemokratische Partei Deutschlands"),
+            4:  ("GRÜNE", "BÜNDNIS 90/DIE GRÜNEN"),
+            5:  ("FDP", "Freie Demokratische Partei"),
+            6:  ("Marburger Linke", "Marburger Linke"),
+            7:  ("KLIMALISTE", "KLIMALISTE Marburg"),
+            8:  ("Die PARTEI", "Partei für Arbeit, Rechtsstaat, Tierschutz, Elitenförderung und basisdemokratische Initiative"),
+            9:  ("WDMR", "Wählerinitiative Die Marburger"),
+            10: ("FREIE WÄHLER", "FREIE WÄHLER"),
+            11: ("Volt", "Volt Deutschland"),
+            12: ("Die Linke", "DIE LINKE"),
+            13: ("Move35", "Move35 – Marburg bewegen"),
+            14: ("APPD", "Anarchistische Pogo-Partei Deutschlands"),
+        },
+    },
+    "fulda": {
+        "name": "Fulda",
+        "html": "/tmp/fulda-probe.html",
+        "output": "fulda-stvv.json",
+        "stimmen": 59,
+        "id_prefix": "fd-stvv",
+        "parties": {
+            1:  ("CDU", "Christlich Demokratische Union Deutschlands"),
+            2:  ("AfD", "Alternative für Deutschland"),
+            3:  ("SPD", "Sozialdemokratische Partei Deutschlands"),
+            4:  ("GRÜNE", "BÜNDNIS 90/DIE GRÜNEN"),
+            5:  ("FDP", "Freie Demokratische Partei"),
+            6:  ("Die Linke", "DIE LINKE"),
+            7:  ("CWE", "Christliche Wählereinheit"),
+            8:  ("Die PARTEI", "Partei für Arbeit, Rechtsstaat, Tierschutz, Elitenförderung und basisdemokratische Initiative"),
+            9:  ("Bündnis C", "Bündnis C – Christen für Deutschland"),
+            10: ("Volt", "Volt Deutschland"),
+            11: ("FREIE WÄHLER", "FREIE WÄHLER"),
+            12: ("FGG", "Fuldaer Grüne Gemeinsam"),
+        },
+    },
+    "ruesselsheim": {
+        "name": "Rüsselsheim",
+        "html": "/tmp/ruesselsheim-probe.html",
+        "output": "ruesselsheim-stvv.json",
+        "stimmen": 45,
+        "id_prefix": "rue-stvv",
+        "parties": {
+            1: ("CDU", "Christlich Demokratische Union Deutschlands"),
+            2: ("AfD", "Alternative für Deutschland"),
+            3: ("SPD", "Sozialdemokratische Partei Deutschlands"),
+            4: ("GRÜNE", "BÜNDNIS 90/DIE GRÜNEN"),
+            5: ("FDP", "Freie Demokratische Partei"),
+            6: ("WsR", "Wir sind Rüsselsheim"),
+            7: ("Abi", "Aktive Bürger Initiative"),
+            8: ("Die Linke/OL", "DIE LINKE / Offene Liste"),
+            9: ("BIS", "Bürgerinitiative Soziales Rüsselsheim"),
+        },
+    },
+}
+
+# Ids of the elements holding a list's name and a candidate's number or name
+LIST_NAME_ID = re.compile(r"name-liste-(\d+)$")
+CANDIDATE_ID = re.compile(r"stimmzettelpos(\d+)-kandidat(\d+)-(nr|nennung1)$")
+
+
+class VoteItParser(HTMLParser):
+    """Collects the list names and candidate cells of a voteIT export.
+
+    lists: {voteIT list id: {"name": str, "candidates": {candidate id:
+    {"nr": str, "nennung1": str, "element": id of the nennung1 element}}}},
+    in order of appearance.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lists = {}
+        self._capture = None  # [tag, depth, target dict, key, text parts]
+
+    def _list(self, list_id):
+        return self.lists.setdefault(list_id, {"name": "", "candidates": {}})
+
+    def handle_starttag(self, tag, attrs):
+        if self._capture:
+            if tag == self._capture[0]:
+                self._capture[1] += 1
+            return
+        element_id = dict(attrs).get("id") or ""
+        if m := LIST_NAME_ID.match(element_id):
+            self._capture = [tag, 0, self._list(m.group(1)), "name", []]
+        elif m := CANDIDATE_ID.match(element_id):
+            candidate = self._list(m.group(1))["candidates"].setdefault(m.group(2), {})
+            if m.group(3) == "nennung1":
+                candidate["element"] = element_id
+            self._capture = [tag, 0, candidate, m.group(3), []]
+
+    def handle_data(self, data):
+        if self._capture:
+            self._capture[4].append(data)
+
+    def handle_endtag(self, tag):
+        if not self._capture or tag != self._capture[0]:
+            return
+        if self._capture[1]:
+            self._capture[1] -= 1
+            return
+        _, _, target, key, parts = self._capture
+        target[key] = " ".join("".join(parts).split())
+        self._capture = None
+
+
+def read_voteit(path):
+    """Stream a voteIT export through VoteItParser. Returns its lists."""
+    parser = VoteItParser()
+    with open(path, encoding="utf-8") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            parser.feed(chunk)
+    parser.close()
+    return parser.lists
+
+
+def _table_number(table, name):
+    """Number of the party table entry whose short or full name is name,
+    or None."""
+    key = " ".join(name.casefold().split())
+    for list_num, names in table.items():
+        if key in (" ".join(n.casefold().split()) for n in names):
+            return list_num
+    return None
+
+
+def build_parties(municipality, lists):
+    """Parties in the app's schema from the lists read by read_voteit(),
+    and {candidate id: element id} for the provenance sidecar. Raises
+    ValueError if a list's name is another number's in the party table."""
+    config = MUNICIPALITIES[municipality]
+    parties = []
+    elements = {}
+    for list_num, ballot_list in enumerate((lst for lst in lists.values() if lst["name"]), 1):
+        table_num = _table_number(config["parties"], ballot_list["name"])
+        if table_num is not None and table_num != list_num:
+            raise ValueError(f"Liste {list_num} ({ballot_list['name']}) is Liste {table_num} "
+                             "in the party table")
+        candidates = []
+        for cand in ballot_list["candidates"].values():
+            if not cand.get("nennung1") or not cand.get("nr", "").isdigit():
+                continue
+            pos = len(candidates) + 1
+            if int(cand["nr"]) != pos:
+                print(f"  WARNING: Liste {list_num}: candidate {cand['nennung1']} "
+                      f"numbered {cand['nr']} at position {pos}")
+            last_name, first_name = split_comma_name(cand["nennung1"])
+            candidate_id = f"{config['id_prefix']}-{list_num}-{pos}"
+            elements[candidate_id] = cand["element"]
+            candidates.append({
+                "id": candidate_id,
+                "position": pos,
+                "lastName": last_name,
+                "firstName": first_name,
+                "profession": "",
+            })
+        if list_num in config["parties"]:
+            short_name, full_name = config["parties"][list_num]
+            if table_num is None:
+                print(f"  WARNING: Liste {list_num}: export name {ballot_list['name']!r} is not "
+                      "in the party table, number not checked")
+        else:
+            print(f"  WARNING: Liste {list_num} is not in the party table, named from the export")
+            short_name = full_name = ballot_list["name"]
+        parties.append({
+            "listNumber": list_num,
+            "fullName": full_name,
+            "shortName": short_name,
+            "candidateCount": len(candidates),
+            "candidates": candidates,
+        })
+        print(f"  Liste {list_num}: {short_name} — {len(candidates)} candidates")
+    return parties, elements
+
+
+def write_municipality(municipality, parties, elements):
+    """Print the municipality's totals, validate and write its output JSON
+    and provenance sidecar. Raises ValueError if the output fails
+    validation."""
+    config = MUNICIPALITIES[municipality]
+    total_candidates = sum(p["candidateCount"] for p in parties)
+    print(f"\nTotal: {len(parties)} parties, {total_candidates} candidates")
+
+    output = {
+        "totalStimmen": config["stimmen"],
+        "maxPerCandidate": 3,
+        "parties": parties,
+    }
+    if not check_output(config["output"], output):
+        raise ValueError(f"{config['output']} not written: validation failed")
+    path = os.path.join(OUTPUT_DIR, config["output"])
+    write_data(path, output)
+    write_element_sidecar(path, output, config["html"], elements)
+
+
+def run(municipalities, workers=PDF_WORKERS):
+    """Parse the given municipalities. Several are read one supervised
+    worker per export (see doc_runner.py), each written here as soon as
+    its export is in. Returns {municipality: parties or exception}."""
+    results = {}
+
+    def finish(municipality, lists):
+        config = MUNICIPALITIES[municipality]
+        print(f"\n=== {config['name']} ({municipality}) ===")
+        print(f"Parsing: {config['html']}")
+        try:
+            if isinstance(lists, DocumentFailed):
+                raise lists
+            parties, elements = build_parties(municipality, lists)
+            write_municipality(municipality, parties, elements)
+            results[municipality] = parties
+        except Exception as e:
+            print(f"ERROR: {municipality}: {e}")
+            results[municipality] = e
+
+    if len(municipalities) == 1:
+        municipality = municipalities[0]
+        try:
+            lists = read_voteit(MUNICIPALITIES[municipality]["html"])
+        except Exception as e:
+            lists = DocumentFailed(MUNICIPALITIES[municipality]["html"], f"{type(e).__name__}: {e}", 1)
+        finish(municipality, lists)
+        return results
+
+    # Municipalities may share an export; it is read once
+    by_html = {}
+    for municipality in municipalities:
+        by_html.setdefault(MUNICIPALITIES[municipality]["html"], []).append(municipality)
+    for html, lists in run_documents(read_voteit, list(by_html), workers=workers):
+        for municipality in by_html[html]:
+            finish(municipality, lists)
+    return results
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} <municipality> [<municipality> ...] | all")
+        print(f"  municipality: {', '.join(MUNICIPALITIES)}")
+        sys.exit(1)
+
+    args = [a.lower() for a in sys.argv[1:]]
+    municipalities = list(MUNICIPALITIES) if args == ["all"] else list(dict.fromkeys(args))
+    unknown = [m for m in municipalities if m not in MUNICIPALITIES]
+    if unknown:
+        print(f"Unknown municipality: {', '.join(unknown)}")
+        print(f"Available: {', '.join(MUNICIPALITIES)}")
+        sys.exit(1)
+
+    results = run(municipalities)
+    if len(municipalities) > 1:
+        print(f"\n{'Municipality':<14} {'Parties':>7} {'Candidates':>10} {'Empty':>5}  Output")
+        print("-" * 70)
+        for municipality in municipalities:
+            result = results[municipality]
+            if isinstance(result, Exception):
+                print(f"{municipality:<14} {'FAILED':>7}  {type(result).__name__}: {result}")
+                continue
+            n_cand = sum(p["candidateCount"] for p in result)
+            n_empty = sum(1 for p in result if p["candidateCount"] == 0)
+            print(f"{municipality:<14} {len(result):>7} {n_cand:>10} {n_empty:>5}  "
+                  f"{MUNICIPALITIES[municipality]['output']}")
+    summary()
+    if any(isinstance(result, Exception) for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 """Parse Wiesbaden Wahlvorschläge PDF to extract STVV candidates."""
 
-import json
 import re
 import sys
+from pathlib import Path
 
-import pdfplumber
+from data_writer import write_data
+from election_validate import check_output
+from pdf_extract import PdfDocument
+from provenance import write_sidecar
+from textnorm import clean_cell
 
 PDF_PATH = "/tmp/wiesbaden-wahlvorschlaege.pdf"
+OUTPUT = Path(__file__).parent.parent / "public" / "data" / "wiesbaden-stvv.json"
 
 # Wiesbaden STVV parties from the PDF (Section I, pages 1-11)
 PARTIES = [
@@ -28,25 +33,6 @@ PARTIES = [
     (15, "FREIE WÄHLER", "FREIE WÄHLER"),
 ]
 
-# Expected candidate counts per party (from the PDF, candidates numbered X01-X81 etc.)
-EXPECTED_COUNTS = {
-    1: 81,   # CDU: 101-181
-    2: 35,   # AfD: 201-235
-    3: 81,   # SPD: 301-381
-    4: 54,   # GRÜNE: 401-454
-    5: 79,   # FDP: 501-579
-    6: 36,   # DIE LINKE: 601-636
-    7: 28,   # Volt: 701-728
-    8: 40,   # PRO AUTO: 801-840
-    9: 28,   # BLW: 901-928
-    10: 18,  # Die PARTEI: 1001-1018
-    11: 39,  # Die Gerechtigkeitspartei: 1101-1139
-    12: 29,  # BSW: 1201-1229
-    13: 37,  # FWG: 1301-1337
-    14: 3,   # PdF: 1401-1403
-    15: 74,  # FREIE WÄHLER: 1501-1574
-}
-
 
 def parse_candidate_line(line, party_num):
     """Parse a candidate line like '101 Georgi, Daniela, Beamtin, geb. 1979 in Tettnang, Wiesbaden'"""
@@ -64,9 +50,9 @@ def parse_candidate_line(line, party_num):
         return None
 
     cand_num = int(m.group(1))
-    last_name = m.group(2).strip()
-    first_name = m.group(3).strip()
-    profession = m.group(4).strip()
+    last_name = clean_cell(m.group(2))
+    first_name = clean_cell(m.group(3))
+    profession = clean_cell(m.group(4))
 
     # Calculate position from candidate number
     base = party_num * 100
@@ -84,16 +70,14 @@ def parse_candidate_line(line, party_num):
 
 
 def main():
-    pdf = pdfplumber.open(PDF_PATH)
-
     # Extract text from pages 1-11 (Section I: Stadtverordnetenwahl)
     # Page 12+ is Section II: Ausländerbeiratswahl
     all_text = ""
-    for page_num in range(11):  # pages 0-10 (1-11 in PDF)
-        page = pdf.pages[page_num]
-        text = page.extract_text()
-        if text:
-            all_text += text + "\n"
+    with PdfDocument(PDF_PATH) as doc:
+        for _, page in doc.iter_pages(range(11)):  # pages 0-10 (1-11 in PDF)
+            text = page.extract_text()
+            if text:
+                all_text += text + "\n"
 
     # Split into lines
     lines = all_text.split('\n')
@@ -167,19 +151,18 @@ def main():
         result["parties"].append(party)
 
     # Validation
-    print("=== Wiesbaden STVV Candidate Counts ===", file=sys.stderr)
+    print("=== Wiesbaden STVV Candidate Counts ===")
     total = 0
     for party in result["parties"]:
         count = party["candidateCount"]
-        expected = EXPECTED_COUNTS.get(party["listNumber"], "?")
-        status = "✓" if count == expected else f"✗ (expected {expected})"
-        print(f"  Nr. {party['listNumber']:2d} {party['shortName']:25s}: {count:3d} candidates {status}", file=sys.stderr)
+        print(f"  Nr. {party['listNumber']:2d} {party['shortName']:25s}: {count:3d} candidates")
         total += count
-    print(f"  Total: {total} candidates", file=sys.stderr)
+    print(f"  Total: {total} candidates")
+    if not check_output(OUTPUT.name, result):
+        sys.exit(f"ERROR: {OUTPUT.name} not written: validation failed")
 
-    # Output JSON
-    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
-    print()
+    write_data(OUTPUT, result)
+    write_sidecar(OUTPUT, result, [PDF_PATH])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,281 @@
+"""Shared PDF extraction helpers for the parse-*.py scripts.
+
+pdfplumber parses a page's layout objects (chars, lines, rects) once and
+caches them on the page. Text lines and table cells are both derived here
+from that single parse, and table detection is skipped entirely on pages
+without ruling lines.
+
+pdfplumber also keeps those objects for every page it has touched until the
+document is closed. PdfDocument walks pages one at a time and releases each
+page after use, so memory stays bounded by the largest page rather than the
+whole document. Set PDF_MAX_RSS_MB to abort a document whose worker grows
+past that ceiling.
+
+Large single documents can be sharded with map_pages(): page ranges are
+fanned out to worker processes that each open the PDF independently, and
+results are merged back in page order. PDF_WORKERS caps the worker count.
+
+Documents in the extraction store (extract_store.py) are not opened at
+all: map_pages(path, page_text) and extract_pages() are answered from it.
+extract_pages() also adds a document it extracts to the store.
+
+For the watch mode, keep_warm() switches to the opposite trade-off: opened
+documents and their parsed pages stay in memory between parser runs in the
+same process, so re-running a parser after a code edit skips pdfminer's
+layout analysis. A document is reopened when its size or mtime changes.
+"""
+
+import os
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+MAX_RSS_MB = float(os.environ.get("PDF_MAX_RSS_MB", 0)) or None
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", 0)) or os.cpu_count() or 1
+
+# Warm documents, {resolved path: {"stamp", "pdf", "results"}}, or None when
+# off. Kept across importlib.reload() so editing this module doesn't drop it.
+_warm = globals().get("_warm")
+if _warm:
+    # Reloaded after an edit: the memoized page functions may have changed
+    for _entry in _warm.values():
+        _entry["results"].clear()
+
+
+def _pdfplumber():
+    # Imported lazily so scripts can decide there is nothing to do without
+    # paying for pdfplumber/pdfminer
+    try:
+        import pdfplumber
+    except ImportError:
+        sys.exit("pdfplumber is not installed: pip install pdfplumber")
+    return pdfplumber
+
+
+def keep_warm():
+    """Keep documents open and their pages parsed for the rest of the process.
+
+    Also runs map_pages() in-process (PDF_WORKERS = 1): worker processes
+    would start cold every time.
+    """
+    global _warm, PDF_WORKERS
+    if _warm is None:
+        _warm = {}
+    PDF_WORKERS = 1
+
+
+def _warm_entry(pdf_path):
+    """The warm copy of a document, (re)opened if the file changed, or None
+    when keep_warm() is off."""
+    if _warm is None:
+        return None
+    key = str(Path(pdf_path).resolve())
+    st = os.stat(key)
+    stamp = (st.st_size, st.st_mtime_ns)
+    entry = _warm.get(key)
+    if entry is None or entry["stamp"] != stamp:
+        if entry is not None:
+            entry["pdf"].close()
+        entry = _warm[key] = {"stamp": stamp, "pdf": _pdfplumber().open(key), "results": {}}
+    return entry
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        # No procfs (macOS): fall back to the peak, which is an upper bound
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class PdfDocument:
+    """A PDF processed page by page with bounded memory.
+
+    Usage:
+        with PdfDocument(path) as doc:
+            for page_idx, page in doc.iter_pages():
+                ...
+
+    Each page's parsed objects are released once the loop moves past it,
+    unless keep_warm() is on. Peak RSS is printed to stderr when the document
+    is closed.
+    """
+
+    def __init__(self, pdf_path, max_rss_mb=MAX_RSS_MB):
+        self.path = Path(pdf_path)
+        self.max_rss_mb = max_rss_mb
+        self.peak_rss_mb = 0.0
+        self.pdf = None
+        self.warm = False
+
+    def __enter__(self):
+        entry = _warm_entry(self.path)
+        self.warm = entry is not None
+        self.pdf = entry["pdf"] if self.warm else _pdfplumber().open(str(self.path))
+        self.peak_rss_mb = current_rss_mb()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.warm:
+            self.pdf.close()
+        self.pdf = None
+        print(f"  [{self.path.name}] peak RSS {self.peak_rss_mb:.0f} MB", file=sys.stderr, flush=True)
+        return False
+
+    def __len__(self):
+        return len(self.pdf.pages)
+
+    def iter_pages(self, indices=None):
+        """Yield (page_idx, page) for the given 0-based indices (default: all),
+        releasing each page's layout objects after the caller is done with it."""
+        if indices is None:
+            indices = range(len(self.pdf.pages))
+        for i in indices:
+            page = self.pdf.pages[i]
+            try:
+                yield i, page
+            finally:
+                if not self.warm:
+                    page.close()
+            # Only once the caller is done with the page: raising in the
+            # finally would replace its exception (or the GeneratorExit)
+            self._check_memory(i)
+
+    def _check_memory(self, page_idx):
+        rss = current_rss_mb()
+        self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        if self.max_rss_mb and rss > self.max_rss_mb:
+            raise MemoryError(
+                f"{self.path.name}: RSS {rss:.0f} MB exceeds ceiling "
+                f"{self.max_rss_mb:.0f} MB after page {page_idx + 1}"
+            )
+
+
+def has_ruling_lines(page):
+    """Cheap prefilter: can this page contain a ruled (lattice) table?
+
+    The default "lines" table strategy only finds tables bounded by drawn
+    lines, rects or curves, so a page without any of them cannot yield a
+    table and the TableFinder pass can be skipped.
+    """
+    return bool(page.lines or page.rects or page.curves)
+
+
+def extract_page(page, text=True, tables=True):
+    """Extract text lines and table cells from a page in one pass.
+
+    Returns a dict with:
+      text:   the page text (same as page.extract_text())
+      lines:  [{"text", "x0", "top", "x1", "bottom"}] in reading order
+      tables: [{"bbox", "rows"}] in top-to-bottom order, rows as returned by
+              Table.extract()
+    """
+    result = {"text": "", "lines": [], "tables": []}
+
+    if text:
+        # Both calls share the page's cached textmap
+        result["text"] = page.extract_text() or ""
+        result["lines"] = page.extract_text_lines(return_chars=False)
+
+    if tables and has_ruling_lines(page):
+        result["tables"] = [
+            {"bbox": t.bbox, "rows": t.extract()} for t in page.find_tables()
+        ]
+
+    return result
+
+
+def page_count(pdf_path):
+    """Number of pages in a PDF, without parsing any page content."""
+    entry = _warm_entry(pdf_path)
+    if entry is not None:
+        return len(entry["pdf"].pages)
+    with _pdfplumber().open(str(pdf_path)) as pdf:
+        return len(pdf.pages)
+
+
+def page_text(page):
+    """Plain page text, as page.extract_text(). Usable with map_pages()."""
+    return page.extract_text() or ""
+
+
+def _map_chunk(pdf_path, func, indices):
+    with PdfDocument(pdf_path) as doc:
+        return [func(page) for _, page in doc.iter_pages(indices)]
+
+
+def map_pages(pdf_path, func, indices=None, workers=PDF_WORKERS, min_pages_per_worker=4):
+    """Apply func(page) to pages of a PDF, sharded across worker processes.
+
+    Each worker opens the document itself and handles one contiguous page
+    range. Returns the results in page order. func must be a module-level
+    function so it can be pickled. Documents too small to be worth a process
+    pool (or workers=1) are handled in-process.
+
+    page_text is served from the extraction store when the document is in
+    it. With keep_warm() on, everything runs in-process on the warm document,
+    and results of this module's own page functions (page_text) are kept
+    with it: they depend only on the document, unlike a parser's func.
+    """
+    if func is page_text:
+        texts = _stored_texts(pdf_path)
+        if texts is not None:
+            return texts if indices is None else [texts[i] for i in indices]
+    indices = list(range(page_count(pdf_path)) if indices is None else indices)
+    if _warm is not None:
+        memo = {}
+        if func.__module__ == __name__:
+            memo = _warm_entry(pdf_path)["results"].setdefault(func.__name__, {})
+        todo = [i for i in indices if i not in memo]
+        if todo:
+            memo.update(zip(todo, _map_chunk(pdf_path, func, todo)))
+        return [memo[i] for i in indices]
+
+    n = min(workers, len(indices) // min_pages_per_worker)
+    if n <= 1:
+        return _map_chunk(pdf_path, func, indices)
+
+    size = -(-len(indices) // n)
+    chunks = [indices[i:i + size] for i in range(0, len(indices), size)]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        parts = pool.map(_map_chunk, repeat(pdf_path), repeat(func), chunks)
+        return [result for part in parts for result in part]
+
+
+def _store():
+    """Connection to the extraction store, or None when it is disabled."""
+    import extract_store
+    return extract_store.connect()
+
+
+def _stored_texts(pdf_path):
+    conn = _store()
+    if conn is None:
+        return None
+    try:
+        import extract_store
+        doc_id = extract_store.document_id(conn, pdf_path)
+        return None if doc_id is None else extract_store.page_texts(conn, doc_id)
+    finally:
+        conn.close()
+
+
+def extract_pages(pdf_path, workers=PDF_WORKERS):
+    """extract_page() of every page, as [{"text", "lines", "tables"}] (plus
+    "words", "width" and "height" when stored). Served from the extraction
+    store; a document not in it yet is extracted into it first. Without the
+    store the pages are extracted with map_pages()."""
+    import extract_store
+    conn = _store()
+    if conn is None:
+        return map_pages(pdf_path, extract_page, workers=workers)
+    try:
+        doc_id, _ = extract_store.ingest(pdf_path, conn, workers=workers)
+        return extract_store.load_pages(conn, doc_id)
+    finally:
+        conn.close()
@@ -0,0 +1,299 @@
+"""Registry of ingestion jobs and the build manifest used to skip them.
+
+Each job runs one parser script and maps its input documents (plus the
+parser code) to the public/data files it writes. After a successful run
+the inputs' and outputs' fingerprints are recorded in the manifest; a
+later build only reruns jobs whose fingerprints changed. The check uses
+only stat() and, when a file's size/mtime moved, its SHA-256, so a no-op
+build never imports pdfplumber or any other heavy dependency.
+
+This module must stay stdlib-only.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+DATA_DIR = PROJECT_ROOT / "public" / "data"
+KOPFLEISTE_DIR = DATA_DIR / "kopfleiste"
+PROVENANCE_DIR = DATA_DIR / "provenance"
+MANIFEST_PATH = PROJECT_ROOT / ".cache" / "build-manifest.json"
+
+# Library modules every parser imports; editing one invalidates all jobs
+SHARED_MODULES = [
+    "pdf_extract.py", "textnorm.py", "election_validate.py", "corrections.py", "data_writer.py",
+    "provenance.py", "sources.py", "doc_runner.py", "extract_store.py",
+]
+
+BAYERN_PDFS = {
+    "muenchen": "/tmp/muenchen-stadtrat-2026.pdf",
+    "nuernberg": "/tmp/nuernberg-stadtrat-2026.pdf",
+    "augsburg": "/tmp/augsburg-stadtrat-2026.pdf",
+    "regensburg": "/tmp/regensburg-stadtrat-2026.pdf",
+    "ingolstadt": "/tmp/ingolstadt-stadtrat-2026-wahlvorschlaege.pdf",
+    "wuerzburg": "/tmp/wuerzburg-stadtrat-2026.pdf",
+    "fuerth": [
+        f"/tmp/fuerth-parts/{f}" for f in (
+            "CSU.pdf", "FW.pdf", "AfD.pdf", "Gruene.pdf",
+            "SPD.pdf", "Die-Linke.pdf", "FDP.pdf", "Tierschutzpartei.pdf",
+        )
+    ],
+    "erlangen": "/tmp/erlangen-stadtrat-2026.pdf",
+    "bamberg": "/tmp/bamberg-stadtrat-2026-wahlvorschlaege.pdf",
+    "bayreuth": "/tmp/bayreuth-stadtrat-2026.pdf",
+}
+
+# Kreis -> (source PDF, data file), see KREISE in parse-hessen-kreistag.py
+HESSEN_KREISTAG_PDFS = {
+    "dadi": ("/tmp/dadi-kreistag.pdf", "dadi-kreistag.json"),
+}
+
+# Municipality -> (voteIT export, data file), see MUNICIPALITIES in parse-voteit.py
+VOTEIT_HTML = {
+    city: (f"/tmp/{city}-probe.html", f"{city}-stvv.json")
+    for city in ("kassel", "hanau", "offenbach", "giessen", "marburg", "fulda", "ruesselsheim")
+}
+
+HESSEN_KAV_CITIES = [
+    "darmstadt", "fulda", "giessen", "hanau", "kassel", "marburg", "offenbach",
+]
+
+
+class Glob:
+    """The files matching a pattern in a directory, listed anew every time a
+    job's files are looked at: jobs write new ones as the build goes on."""
+
+    def __init__(self, directory, pattern):
+        self.directory = Path(directory)
+        self.pattern = pattern
+
+    def paths(self):
+        return sorted(self.directory.glob(self.pattern))
+
+
+def with_sidecars(paths):
+    """Data files followed by their provenance sidecars (see provenance.py)."""
+    return [q for p in paths for q in (p, PROVENANCE_DIR / Path(p).name)]
+
+
+# name -> job. Keys:
+#   script:  parser in scripts/, run with the project root as cwd
+#   args:    extra command-line arguments
+#   batch:   stale jobs sharing a batch script are merged into one run
+#            (their args are concatenated)
+#   inputs:  source documents
+#   outputs: files the job writes, including provenance sidecars
+# Entries of inputs and outputs are paths or Globs; use job_inputs() and
+# job_outputs() to list them.
+JOBS = {
+    "frankfurt": {
+        "script": "parse-amtsblatt-s2.py",
+        "inputs": [
+            PROJECT_ROOT / "Amtsblatt S2 Wahlvorschlaege.pdf",
+            SCRIPTS_DIR / "corrections" / "stvv-candidates.json",
+        ],
+        "outputs": [
+            *with_sidecars([DATA_DIR / "stvv-candidates.json", DATA_DIR / "kav-candidates.json"]),
+            Glob(DATA_DIR, "ortsbeirat-*-candidates.json"),
+            Glob(PROVENANCE_DIR, "ortsbeirat-*-candidates.json"),
+        ],
+    },
+    "wiesbaden-stvv": {
+        "script": "parse-wiesbaden.py",
+        "inputs": ["/tmp/wiesbaden-wahlvorschlaege.pdf"],
+        "outputs": with_sidecars([DATA_DIR / "wiesbaden-stvv.json"]),
+    },
+    "hessen-kav": {
+        "script": "parse-hessen-kav.py",
+        "inputs": [f"/tmp/{city}-kav.pdf" for city in HESSEN_KAV_CITIES],
+        # Rüsselsheim's lists are hardcoded: no source, no sidecar
+        "outputs": [
+            *with_sidecars([DATA_DIR / f"{city}-kav.json" for city in HESSEN_KAV_CITIES]),
+            DATA_DIR / "ruesselsheim-kav.json",
+        ],
+    },
+    "bw-landtagswahl": {
+        "script": "parse-bw-landtagswahl.py",
+        "inputs": ["/tmp/bw-kreiswahlvorschlaege-2026.pdf"],
+        "outputs": with_sidecars([DATA_DIR / "bw-landtagswahl.json"]),
+    },
+}
+
+for _city, _pdfs in BAYERN_PDFS.items():
+    JOBS[f"{_city}-stadtrat"] = {
+        "script": "parse-bayern-stadtrat.py",
+        "args": [_city],
+        "batch": True,
+        "inputs": _pdfs if isinstance(_pdfs, list) else [_pdfs],
+        "outputs": with_sidecars([DATA_DIR / f"{_city}-stadtrat.json"]),
+    }
+
+for _kreis, (_pdf, _output) in HESSEN_KREISTAG_PDFS.items():
+    JOBS[_output.removesuffix(".json")] = {
+        "script": "parse-hessen-kreistag.py",
+        "args": [_kreis],
+        "batch": True,
+        "inputs": [_pdf],
+        "outputs": with_sidecars([DATA_DIR / _output]),
+    }
+
+for _city, (_html, _output) in VOTEIT_HTML.items():
+    JOBS[_output.removesuffix(".json")] = {
+        "script": "parse-voteit.py",
+        "args": [_city],
+        "batch": True,
+        "inputs": [_html],
+        "outputs": with_sidecars([DATA_DIR / _output]),
+    }
+
+# Derived from the data files, so it comes after every parser job
+JOBS["kopfleiste"] = {
+    "script": "build-kopfleiste.py",
+    "inputs": [Glob(DATA_DIR, "*.json")],
+    "outputs": [Glob(KOPFLEISTE_DIR, "*.json")],
+}
+
+
+def _expand(entries):
+    paths = []
+    for entry in entries:
+        paths.extend(entry.paths() if isinstance(entry, Glob) else [entry])
+    return paths
+
+
+def job_inputs(job):
+    return _expand(job["inputs"])
+
+
+def job_outputs(job):
+    return _expand(job["outputs"])
+
+
+def dependents(ran, names):
+    """The jobs among names, other than those in ran, with an input that one
+    of the jobs in ran writes; their status has to be checked again after
+    those ran."""
+    written = {_file_key(p) for name in ran for p in job_outputs(JOBS[name])}
+    return [
+        name for name in names
+        if name not in ran and any(_file_key(p) in written for p in job_inputs(JOBS[name]))
+    ]
+
+
+def completed_jobs(names, written):
+    """The jobs among names all of whose outputs are in written, the paths
+    data_writer wrote or found unchanged. A batch parser carries on past a
+    failed document, so after a failed batch run these still succeeded."""
+    keys = {_file_key(p) for p in written}
+    return [name for name in names if all(_file_key(p) in keys for p in job_outputs(JOBS[name]))]
+
+
+def job_code(job):
+    """Parser code files a job depends on."""
+    scripts = [job["script"]] + SHARED_MODULES
+    return [SCRIPTS_DIR / s for s in scripts]
+
+
+def plan_runs(names):
+    """Group stale jobs into commands. Jobs with "batch" sharing a script are
+    merged into one invocation."""
+    runs = []
+    batched = {}
+    for name in names:
+        job = JOBS[name]
+        if job.get("batch"):
+            if job["script"] not in batched:
+                batched[job["script"]] = {"script": job["script"], "args": [], "jobs": []}
+                runs.append(batched[job["script"]])
+            batched[job["script"]]["args"].extend(job.get("args", []))
+            batched[job["script"]]["jobs"].append(name)
+        else:
+            runs.append({"script": job["script"], "args": job.get("args", []), "jobs": [name]})
+    return runs
+
+
+def _file_key(path):
+    path = Path(path)
+    try:
+        return str(path.resolve().relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def fingerprint(path, previous=None):
+    """Fingerprint a file as {size, mtime_ns, sha256}, or None if missing.
+
+    The hash is reused from `previous` when size and mtime are unchanged.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if previous and previous["size"] == st.st_size and previous["mtime_ns"] == st.st_mtime_ns:
+        return previous
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha256_file(path)}
+
+
+def job_files(job):
+    return [*job_inputs(job), *job_code(job), *job_outputs(job)]
+
+
+def job_status(name, manifest):
+    """Return ("fresh" | "stale" | "missing", detail) for a job.
+
+    "missing" means a source document is not available locally, so the job
+    cannot run; its committed outputs are kept as they are.
+    """
+    job = JOBS[name]
+    for path in job_inputs(job):
+        if not os.path.exists(path):
+            return "missing", f"source missing: {path}"
+
+    recorded = manifest.get(name)
+    if not recorded:
+        return "stale", "never built"
+    for path in job_files(job):
+        key = _file_key(path)
+        previous = recorded.get(key)
+        if previous is None:
+            return "stale", f"new dependency: {key}"
+        fp = fingerprint(path, previous)
+        if fp is None:
+            return "stale", f"missing: {key}"
+        if fp["sha256"] != previous["sha256"]:
+            return "stale", f"changed: {key}"
+        # Same content, only the mtime moved: remember the new stat
+        recorded[key] = fp
+    return "fresh", ""
+
+
+def record_job(name, manifest):
+    """Record the current fingerprints of a job's files after a successful run."""
+    manifest[name] = {_file_key(p): fingerprint(p) for p in job_files(JOBS[name])}
@@ -0,0 +1,313 @@
+"""Provenance sidecars: where in its source document each candidate was read.
+
+Next to every data file a parser writes, write_sidecar() keeps a compact
+index in public/data/provenance/<file>, one candidate per line:
+
+    {"sources": ["/tmp/dadi-kreistag.pdf"], "unlocated": [], "candidates": {
+    "dd-kt-1-1": [0, 2, 56.7, 210.3, 181.2, 219.8],
+    ...
+    }}
+
+Each entry is the index into "sources", the 0-based page and the bounding
+box (x0, top, x1, bottom in PDF points from the top-left corner) of the
+text the candidate was read from. For an OCR source it is the region of
+the page image, converted to the same points.
+
+Parsers read their documents in very different ways (cropped columns,
+tables, regexes over page text), so instead of threading coordinates
+through each of them the candidates are located afterwards in the
+document's stored lines and words (see extract_store.py).
+
+A candidate's line is the one containing its name tokens. Lines with its
+first name and position number, and lines not taken by another candidate,
+are preferred. Among equally good lines the first one at or after the
+previous candidate's wins, since candidates follow the document order.
+The box is narrowed from the whole line to the words of the name (when
+the store is on and has the page's words), so in a two-column layout it
+covers one column only.
+
+Candidates read from an HTML export (voteIT, see parse-voteit.py) need no
+search: the parser knows the element each name came from, and the entry
+is the source index and that element's id instead of a page and box.
+
+Candidates that cannot be found (added by a correction, misread by OCR)
+are listed under "unlocated". validate-data.py and diff-elections.py
+print the location next to every problem or change that names a
+candidate (source#page=N, which PDF viewers open at that page, or
+source#element-id). The one data file without a sidecar is
+ruesselsheim-kav.json, whose lists are hardcoded in parse-hessen-kav.py
+rather than read from a document.
+"""
+
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+from data_writer import write_bytes
+from pipeline import PROJECT_ROOT, PROVENANCE_DIR
+
+# Words further than this from the last-name word are not part of the name
+# (e.g. the next column of the same text line)
+MAX_GAP = 120.0
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _tokens(s):
+    return _TOKEN.findall(unicodedata.normalize("NFC", str(s or "")).casefold())
+
+
+def sidecar_path(data_path):
+    return PROVENANCE_DIR / Path(data_path).name
+
+
+def iter_candidates(data):
+    """Yield (list number, position, candidate) for every candidate, numbered
+    as in election_diff.flatten()."""
+    if isinstance(data, dict) and "wahlkreise" in data:
+        for wk in data["wahlkreise"]:
+            for pos, c in enumerate(wk["candidates"], 1):
+                yield wk["number"], pos, c
+        for party in data.get("landeslisten", []):
+            for pos, c in enumerate(party.get("candidates", []), 1):
+                yield party["listNumber"], c.get("position", pos), c
+        return
+    parties = data.get("parties", []) if isinstance(data, dict) else data
+    for party in parties:
+        for i, c in enumerate(party.get("candidates", []), 1):
+            yield party["listNumber"], c.get("position", i), c
+
+
+def _key(list_number, position, c):
+    return str(c["id"]) if c.get("id") not in (None, "") else f"{list_number}-{position}"
+
+
+def ocr_page(tsv, dpi):
+    """A page in extract_pages() form (lines and words with boxes in PDF
+    points) from tesseract's TSV output of an image rendered at dpi."""
+    scale = 72.0 / dpi
+    words = []
+    lines = {}
+    for row in tsv.splitlines()[1:]:
+        cols = row.split("\t")
+        if len(cols) < 12 or cols[0] != "5" or not cols[11].strip():
+            continue  # only level 5 rows are words
+        left, top, width, height = (int(v) * scale for v in cols[6:10])
+        word = {"text": cols[11], "x0": left, "top": top, "x1": left + width, "bottom": top + height}
+        words.append(word)
+        lines.setdefault(tuple(cols[2:5]), []).append(word)
+    return {
+        "words": words,
+        "lines": [
+            {
+                "text": " ".join(w["text"] for w in ws),
+                "x0": min(w["x0"] for w in ws), "top": min(w["top"] for w in ws),
+                "x1": max(w["x1"] for w in ws), "bottom": max(w["bottom"] for w in ws),
+            }
+            for ws in lines.values()
+        ],
+    }
+
+
+class _Index:
+    """Text lines of a set of documents with an inverted token index."""
+
+    def __init__(self, documents):
+        self.lines = []     # (src, page, line, its tokens, words of the page)
+        self.postings = {}  # token -> [line number]
+        for src, pages in enumerate(documents):
+            for page_idx, page in enumerate(pages):
+                words = page.get("words")
+                for line in page["lines"]:
+                    n = len(self.lines)
+                    tokens = set(_tokens(line["text"]))
+                    self.lines.append((src, page_idx, line, tokens, words))
+                    for token in tokens:
+                        self.postings.setdefault(token, []).append(n)
+
+    def seek(self, patterns):
+        """Line number of the last of patterns found one after the other,
+        or 0 if one is missing."""
+        n = 0
+        for pattern in patterns:
+            regex = re.compile(pattern)
+            n = next((i for i in range(n, len(self.lines)) if regex.search(self.lines[i][2]["text"])), None)
+            if n is None:
+                print(f"  WARNING: provenance: {pattern!r} not found, searching the whole document")
+                return 0
+        return n
+
+    def find(self, last, first, position, cursor, used):
+        """Best line for a candidate, or None. cursor is the line number of
+        the previous candidate, used the lines taken by earlier ones."""
+        if not last:
+            return None
+        anchor = max(last, key=len)
+        best, best_score = None, None
+        for n in self.postings.get(anchor, ()):
+            tokens = self.lines[n][3]
+            score = (
+                sum(t in tokens for t in last),
+                first[0] in tokens if first else False,
+                position in tokens,
+                n not in used,
+                n >= cursor,
+            )
+            if best_score is None or score > best_score:
+                best, best_score = n, score
+        return best
+
+    def region(self, n, last, first, position):
+        """Source index, page and box of the candidate's text on line n."""
+        src, page, line, _, words = self.lines[n]
+        box = (line["x0"], line["top"], line["x1"], line["bottom"])
+        if words:
+            mid = (line["top"] + line["bottom"]) / 2
+            on_line = [w for w in words if w["top"] <= mid <= w["bottom"]]
+            anchor = max(last, key=len)
+            anchors = [w for w in on_line if anchor in _tokens(w["text"])]
+            if anchors:
+                a = anchors[0]
+                wanted = set(last) | set(first) | {position}
+                parts = [
+                    w for w in on_line
+                    if wanted & set(_tokens(w["text"]))
+                    and w["x0"] - a["x1"] < MAX_GAP and a["x0"] - w["x1"] < MAX_GAP
+                ]
+                box = (min(w["x0"] for w in parts), min(w["top"] for w in parts),
+                       max(w["x1"] for w in parts), max(w["bottom"] for w in parts))
+        return [src, page, *(round(float(v), 1) for v in box)]
+
+
+def locate(data, documents, after=()):
+    """Find every candidate of data in the documents (lists of pages in
+    extract_pages() form). Returns ({key: [src, page, x0, top, x1, bottom]},
+    [unlocated keys]), keyed by candidate id.
+
+    after are regexes found one after the other in the lines (e.g. a
+    section heading, then a sub-heading); the search starts at the last
+    one, for a data file that is one section of a larger document.
+    """
+    index = _Index(documents)
+    found = {}
+    unlocated = []
+    cursor = index.seek(after)
+    used = set()
+    for list_number, position, c in iter_candidates(data):
+        key = _key(list_number, position, c)
+        last = _tokens(c.get("lastName", c.get("name", "")))
+        first = _tokens(c.get("firstName", ""))
+        number = str(position)
+        n = index.find(last, first, number, cursor, used)
+        if n is None:
+            unlocated.append(key)
+            continue
+        found[key] = index.region(n, last, first, number)
+        cursor = n
+        used.add(n)
+    return found, unlocated
+
+
+def _source_name(source):
+    path = Path(source).resolve()
+    try:
+        return str(path.relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(source)
+
+
+def serialize(sources, found, unlocated):
+    """Sidecar bytes: canonical, one candidate per line."""
+    head = json.dumps({"sources": sources, "unlocated": unlocated}, ensure_ascii=False)[:-1]
+    entries = "".join(
+        f"{',' if i else ''}\n{json.dumps(key, ensure_ascii=False)}: {json.dumps(entry)}"
+        for i, (key, entry) in enumerate(found.items())
+    )
+    return f'{head}, "candidates": {{{entries}\n}}}}\n'.encode("utf-8")
+
+
+def write_sidecar(data_path, data, sources, after=()):
+    """Locate the candidates of data (as written to data_path) in their
+    sources and write the sidecar. sources are PDF paths, or (name, pages)
+    pairs for documents laid out by the parser itself (OCR); after as in
+    locate(). Returns the number of unlocated candidates."""
+    from pdf_extract import extract_pages
+
+    names, documents = [], []
+    for source in sources:
+        if isinstance(source, tuple):
+            name, pages = source
+        else:
+            name, pages = source, extract_pages(source)
+        names.append(_source_name(name))
+        documents.append(pages)
+    found, unlocated = locate(data, documents, after)
+    return _write(data_path, names, found, unlocated)
+
+
+def write_element_sidecar(data_path, data, source, elements):
+    """Write the sidecar of data read from the HTML export source, where
+    elements maps candidate ids to the id of the element each name was read
+    from. Returns the number of unlocated candidates."""
+    found, unlocated = {}, []
+    for list_number, position, c in iter_candidates(data):
+        key = _key(list_number, position, c)
+        if key in elements:
+            found[key] = [0, elements[key]]
+        else:
+            unlocated.append(key)
+    return _write(data_path, [_source_name(source)], found, unlocated)
+
+
+def _write(data_path, names, found, unlocated):
+    print(f"Provenance: {len(found)} of {len(found) + len(unlocated)} candidates located")
+    if unlocated:
+        print(f"  unlocated: {', '.join(unlocated[:10])}" + (" ..." if len(unlocated) > 10 else ""))
+    write_bytes(sidecar_path(data_path), serialize(names, found, unlocated))
+    return len(unlocated)
+
+
+def load_sidecar(data_path):
+    """The sidecar of a data file, or None."""
+    try:
+        with open(sidecar_path(data_path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def describe(sidecar, entry):
+    """Human-readable location of a sidecar entry."""
+    if len(entry) == 2:
+        src, element = entry
+        return f"{sidecar['sources'][src]}#{element}"
+    src, page, x0, top, x1, bottom = entry
+    return f"{sidecar['sources'][src]}#page={page + 1} [{x0:.0f},{top:.0f},{x1:.0f},{bottom:.0f}]"
+
+
+def by_position(data, sidecar):
+    """{(list number, position): location} for the candidates of data that
+    the sidecar locates."""
+    if not sidecar:
+        return {}
+    entries = sidecar.get("candidates", {})
+    result = {}
+    for list_number, position, c in iter_candidates(data):
+        entry = entries.get(_key(list_number, position, c))
+        if entry:
+            result.setdefault((list_number, position), describe(sidecar, entry))
+    return result
+
+
+def list_pages(data, sidecar):
+    """{list number: location of its first located candidate}."""
+    if not sidecar:
+        return {}
+    entries = sidecar.get("candidates", {})
+    result = {}
+    for list_number, position, c in iter_candidates(data):
+        entry = entries.get(_key(list_number, position, c))
+        if entry and list_number not in result:
+            result[list_number] = describe(sidecar, entry)
+    return result
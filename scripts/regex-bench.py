@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""Time every regex the parsers use and flag super-linear backtracking.
+
+Usage: python scripts/regex-bench.py [--max-length N] [--timeout S] [--lines N]
+                                     [--top N] [--json FILE] [script ...]
+
+Patterns are collected statically from the scripts (default: every
+scripts/*.py): each re.compile/match/search/... call whose pattern is a
+string literal, a concatenation or an f-string. Interpolated parts that
+are not module-level string constants (a party alternation, a list id)
+are replaced by \\w+ and the pattern is marked approximate.
+
+Each pattern is timed, in a worker process killed after --timeout
+seconds, with the operation it is used with (re.compile counts as
+search, the worst case):
+
+  real         every line of the locally available source documents of
+               the pipeline jobs (PDF text, HTML), at most --lines of
+               them plus the longest ones
+  adversarial  generated inputs of doubling length up to --max-length:
+               OCR garbage, runs of words, spaces, digits or "Name, "
+               fragments, and a real line stretched (the longest one
+               the pattern matches, else its slowest)
+
+For every adversarial family the growth exponent is fitted (log-log) over
+the three largest lengths that took measurable time (1 = linear,
+2 = quadratic). A pattern is
+flagged when an exponent exceeds --max-exponent or its worker times out;
+the worst inputs are reported with it. Exits with 1 if anything is flagged.
+"""
+
+import argparse
+import ast
+import json
+import math
+import multiprocessing
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from pipeline import JOBS, SCRIPTS_DIR, job_inputs
+
+# Stand-in for interpolated parts that cannot be resolved statically
+PLACEHOLDER = r"\w+"
+
+# re function -> positional index of its flags argument
+RE_FUNCS = {
+    "compile": 1, "match": 2, "fullmatch": 2, "search": 2, "findall": 2,
+    "finditer": 2, "split": 3, "sub": 4, "subn": 4,
+}
+
+# Stop growing an adversarial input once one call takes this long
+STOP_SECONDS = 0.2
+# Timings below this are too noisy (and too fast to matter) for an exponent
+NOISE_SECONDS = 1e-4
+
+OCR_ALPHABET = "abcdefghijklmnopqrstuvwxyzäöüßABCDEFGHIJKLMNOPRSTUVWZÄÖÜ    .,-'’/()|0123456789"
+
+
+# ---------------------------------------------------------------------------
+# Collection
+# ---------------------------------------------------------------------------
+
+def _flags(node):
+    """Value of a flags expression like re.M | re.DOTALL, or None."""
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "re":
+        value = getattr(re, node.attr, None)
+        return int(value) if isinstance(value, re.RegexFlag) else None
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        left, right = _flags(node.left), _flags(node.right)
+        return None if left is None or right is None else left | right
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return node.value
+    return None
+
+
+def _resolve(node, consts):
+    """(pattern, exact) for a pattern expression, or None."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value, True
+    if isinstance(node, ast.Name):
+        return consts.get(node.id)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = _resolve(node.left, consts), _resolve(node.right, consts)
+        if left is None and right is None:
+            return None
+        left, right = left or (PLACEHOLDER, False), right or (PLACEHOLDER, False)
+        return left[0] + right[0], left[1] and right[1]
+    if isinstance(node, ast.JoinedStr):
+        parts, exact = [], True
+        for value in node.values:
+            if isinstance(value, ast.FormattedValue):
+                resolved = _resolve(value.value, consts)
+                if resolved is None or value.format_spec or value.conversion != -1:
+                    resolved = (PLACEHOLDER, False)
+                parts.append(resolved[0])
+                exact = exact and resolved[1]
+            else:
+                parts.append(value.value)
+        return "".join(parts), exact
+    return None
+
+
+def collect_patterns(paths):
+    """[{"pattern", "flags", "op", "exact", "locations"}] for every regex call
+    in the given scripts, merged by (pattern, flags, op)."""
+    found = {}
+    for path in paths:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        consts = {}
+        for stmt in tree.body:
+            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                resolved = _resolve(stmt.value, consts)
+                if resolved is not None:
+                    consts[stmt.targets[0].id] = resolved
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and isinstance(node.func.value, ast.Name) and node.func.value.id == "re"
+                    and node.func.attr in RE_FUNCS and node.args):
+                continue
+            resolved = _resolve(node.args[0], consts)
+            if resolved is None:
+                continue
+            flags_node = next((k.value for k in node.keywords if k.arg == "flags"), None)
+            if flags_node is None and len(node.args) > RE_FUNCS[node.func.attr]:
+                flags_node = node.args[RE_FUNCS[node.func.attr]]
+            flags = _flags(flags_node) if flags_node is not None else 0
+            op = "search" if node.func.attr == "compile" else node.func.attr
+            try:
+                re.compile(resolved[0], flags or 0)
+            except re.error:
+                continue
+            key = (resolved[0], flags or 0, op)
+            entry = found.setdefault(key, {
+                "pattern": resolved[0], "flags": flags or 0, "op": op,
+                "exact": resolved[1], "locations": [],
+            })
+            entry["locations"].append(f"{path.name}:{node.lineno}")
+    return list(found.values())
+
+
+# ---------------------------------------------------------------------------
+# Inputs
+# ---------------------------------------------------------------------------
+
+def load_corpus(max_lines, rng):
+    """Lines of the locally available job inputs: a random sample of
+    max_lines plus the 100 longest."""
+    from pdf_extract import map_pages, page_text
+
+    lines = set()
+    sources = sorted({str(p) for job in JOBS.values() for p in job_inputs(job)})
+    for source in sources:
+        path = Path(source)
+        if not path.exists():
+            continue
+        if path.suffix == ".pdf":
+            text = "\n".join(map_pages(path, page_text))
+        elif path.suffix in (".html", ".txt"):
+            text = path.read_text(encoding="utf-8", errors="replace")
+        else:
+            continue
+        lines.update(line for line in text.splitlines() if line.strip())
+    lines = sorted(lines)
+    longest = sorted(lines, key=len)[-100:]
+    sample = rng.sample(lines, min(max_lines, len(lines)))
+    return list(dict.fromkeys(longest + sample))
+
+
+def adversarial_families(base):
+    """{family: function(length, rng) -> input}; base is the real line to
+    stretch."""
+
+    def repeat(unit):
+        return lambda n, rng: (unit * (n // len(unit) + 1))[:n]
+
+    return {
+        "ocr-garbage": lambda n, rng: "".join(rng.choice(OCR_ALPHABET) for _ in range(n)),
+        "words": lambda n, rng: " ".join(
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz-.'") for _ in range(rng.randint(1, 8)))
+            for _ in range(n // 5))[:n],
+        "spaces": repeat("a "),
+        "digits": repeat("1 "),
+        "name-fragments": repeat("Ab, "),
+        "real-stretched": repeat(base + " "),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Timing (in worker processes)
+# ---------------------------------------------------------------------------
+
+def _operation(regex, op):
+    if op == "findall":
+        return regex.findall
+    if op == "finditer":
+        return lambda s: list(regex.finditer(s))
+    if op in ("sub", "subn"):
+        return lambda s: regex.sub("", s)
+    if op == "split":
+        return regex.split
+    return getattr(regex, op)
+
+
+def _best_time(func, subject, repeat=5):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(subject)
+        best = min(best, time.perf_counter() - start)
+        if best > STOP_SECONDS:
+            break
+    return best
+
+
+def measure(entry, corpus, max_length, top, seed, conn):
+    """Time one pattern on the corpus and the adversarial inputs; send the
+    result dict through conn."""
+    run = _operation(re.compile(entry["pattern"], entry["flags"]), entry["op"])
+
+    real = []
+    total = 0.0
+    matched = ""
+    for line in corpus:
+        start = time.perf_counter()
+        hit = run(line)
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        real.append((elapsed, line))
+        if hit and len(line) > len(matched):
+            matched = line
+    real.sort(reverse=True)
+    # Stretch the longest line the pattern matches, else its slowest one
+    base = matched or (real[0][1] if real else "101 Müller-Lüdenscheidt, Hans Peter")
+
+    growth = {}
+    for family, make in adversarial_families(base).items():
+        rng = random.Random(f"{seed}-{family}")
+        points = []
+        n = 256
+        while n <= max_length:
+            elapsed = _best_time(run, make(n, rng))
+            points.append((n, elapsed))
+            conn.send(("progress", family, n, elapsed))
+            if elapsed > STOP_SECONDS:
+                break
+            n *= 2
+        growth_points = [(n, t) for n, t in points if t > NOISE_SECONDS][-3:]
+        exponent = None
+        if len(growth_points) > 1:
+            xs = [math.log(n) for n, _ in growth_points]
+            ys = [math.log(t) for _, t in growth_points]
+            mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+            exponent = (sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+                        / sum((x - mx) ** 2 for x in xs))
+        growth[family] = {"points": points, "exponent": exponent}
+
+    conn.send(("done", {
+        "realSeconds": total,
+        "worstReal": [(t, line[:200]) for t, line in real[:top]],
+        "growth": growth,
+    }))
+
+
+def run_measurement(entry, corpus, args):
+    """measure() in a worker, killed after args.timeout seconds. Returns the
+    result dict, with "timeout" and the last input reached if killed."""
+    ctx = multiprocessing.get_context("fork" if sys.platform.startswith("linux") else None)
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=measure, args=(entry, corpus, args.max_length, args.top, args.seed, send),
+                       daemon=True)
+    proc.start()
+    send.close()
+    deadline = time.monotonic() + args.timeout
+    last = None
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not recv.poll(remaining):
+                proc.kill()
+                return {"timeout": True, "lastInput": last}
+            try:
+                message = recv.recv()
+            except EOFError:
+                return {"timeout": True, "lastInput": last, "error": f"worker exited with code {proc.exitcode}"}
+            if message[0] == "done":
+                return message[1]
+            last = message[1:]
+    finally:
+        proc.join()
+        recv.close()
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def assess(result, max_exponent):
+    """(flagged, worst exponent, family with it)."""
+    if result.get("timeout"):
+        return True, math.inf, result["lastInput"][0] if result.get("lastInput") else None
+    worst, family = 0.0, None
+    for name, g in result["growth"].items():
+        if g["exponent"] is not None and g["exponent"] > worst:
+            worst, family = g["exponent"], name
+    return worst > max_exponent, worst, family
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("scripts", nargs="*", help="scripts to scan (default: scripts/*.py)")
+    ap.add_argument("--max-length", type=int, default=8192, help="longest adversarial input (default: 8192)")
+    ap.add_argument("--timeout", type=float, default=20.0, help="seconds per pattern before it counts as catastrophic")
+    ap.add_argument("--lines", type=int, default=20_000, help="real lines to sample (default: 20000)")
+    ap.add_argument("--max-exponent", type=float, default=1.5, help="growth exponent that flags a pattern")
+    ap.add_argument("--top", type=int, default=3, help="worst inputs to report per pattern")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="also write the full results to this file")
+    args = ap.parse_args()
+
+    paths = [Path(s) if "/" in s else SCRIPTS_DIR / s for s in args.scripts] or sorted(SCRIPTS_DIR.glob("*.py"))
+    entries = collect_patterns(paths)
+    corpus = load_corpus(args.lines, random.Random(args.seed))
+    print(f"{len(entries)} pattern(s) from {len(paths)} script(s), {len(corpus)} real line(s)\n", flush=True)
+
+    flagged = 0
+    for entry in entries:
+        result = run_measurement(entry, corpus, args)
+        entry.update(result)
+        bad, exponent, family = assess(result, args.max_exponent)
+        entry["flagged"] = bad
+        flagged += bad
+        where = entry["locations"][0] + (f" +{len(entry['locations']) - 1}" if len(entry["locations"]) > 1 else "")
+        approx = "" if entry["exact"] else " ~"
+        if result.get("timeout"):
+            status = f"TIMEOUT{approx}  last input: {result['lastInput']}"
+        else:
+            growth = f"n^{exponent:.1f} ({family})" if family else "flat"
+            status = f"{'FLAG' if bad else 'ok':4s}{approx}  {growth:28s} real {result['realSeconds'] * 1e3:8.1f} ms"
+        print(f"{where:32s} {entry['op']:8s} {status}", flush=True)
+        if bad:
+            print(f"    pattern: {entry['pattern'][:160]}")
+            if not result.get("timeout"):
+                n, t = result["growth"][family]["points"][-1]
+                print(f"    worst adversarial: {family} at {n} chars: {t * 1e3:.1f} ms")
+                for t, line in result["worstReal"]:
+                    print(f"    worst real line ({t * 1e3:.2f} ms): {line[:100]!r}")
+
+    print(f"\n{flagged} of {len(entries)} pattern(s) flagged"
+          f" (growth exponent > {args.max_exponent} or timeout; ~ = approximated pattern)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=1, default=str)
+            f.write("\n")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""Render the social preview and share QR card of every election.
+
+Usage: python scripts/render-assets.py [--out DIR] [--workers N] [--base-url URL]
+                                       [--no-qr] [election ...]
+
+For each election config (default: all) this writes into DIR/<slug>/:
+  og.png  1200x630 social preview in the election's theme colors, laid out
+          like scripts/generate-og-image.html, with the election's
+          subtitle from its de.json and a sample ballot of placeholder names
+          (a neutral voting aid shows no party's real candidates)
+  qr.png  the share card as ShareDialog.tsx draws it: a QR code of the
+          election's URL whose dark modules are colored by party, in
+          proportion to each list's candidates
+
+Elections are rendered in parallel processes. Each process loads fonts
+once, rasterizes every distinct text once and keeps the background layers
+(gradients, rounded-corner masks, the sample ballot with its drop shadow)
+for reuse across elections. A PNG is only rewritten when its bytes change.
+
+Needs Pillow, and qrcode for the QR cards (or pass --no-qr).
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFilter, ImageFont
+except ImportError as e:
+    sys.exit(f"{e.name} is not installed: pip install {'Pillow' if e.name == 'PIL' else e.name}")
+
+try:
+    import qrcode
+except ImportError:
+    qrcode = None
+
+from election_validate import load_configs
+from pipeline import DATA_DIR, PROJECT_ROOT
+
+DEFAULT_OUT = PROJECT_ROOT / ".cache" / "assets"
+DEFAULT_BASE_URL = "https://whlztl.de"
+SHARED_PARTY_COLORS = PROJECT_ROOT / "src" / "data" / "partyColors.ts"
+FALLBACK_PARTY_COLOR = "#9ca3af"
+
+# First choice is the site's font; DejaVu ships with most Linux systems
+FONT_FILES = {
+    False: ["Barlow-Regular.ttf", "DejaVuSans.ttf"],
+    True: ["Barlow-Bold.ttf", "DejaVuSans-Bold.ttf"],
+}
+
+OG_SIZE = (1200, 630)
+BALLOT_WIDTH = 340
+BALLOT_ROWS = 7
+# (filled circle, active dots) per sample ballot row, as in the HTML page
+BALLOT_MARKS = [(True, 3), (False, 0), (True, 2), (False, 0), (True, 1), (False, 0), (False, 1)]
+SAMPLE_NAMES = [
+    "Müller, Anna", "Schmidt, Thomas", "Weber, Julia", "Fischer, Michael",
+    "Wagner, Sarah", "Becker, Klaus", "Hoffmann, Lisa",
+]
+
+_PARTY_COLOR_RE = re.compile(r"'([^']+)':\s*'(#[0-9A-Fa-f]{3,8})'")
+
+
+# ---------------------------------------------------------------------------
+# Election inputs
+# ---------------------------------------------------------------------------
+
+def party_colors(path):
+    try:
+        return dict(_PARTY_COLOR_RE.findall(path.read_text(encoding="utf-8")))
+    except OSError:
+        return {}
+
+
+def election_job(config, data_file, shared_colors, base_url):
+    """Everything needed to render one election, as plain data."""
+    slug = config["slug"]
+    election_dir = config["path"].parent
+    with open(election_dir / "i18n" / "de.json", encoding="utf-8") as f:
+        texts = json.load(f)
+    with open(DATA_DIR / data_file, encoding="utf-8") as f:
+        data = json.load(f)
+    colors = {**shared_colors, **party_colors(election_dir / "parties.ts")}
+
+    parties = data if isinstance(data, list) else data.get("parties", [])
+    segments = [
+        (colors.get(p.get("shortName") or p.get("name"), FALLBACK_PARTY_COLOR), len(p["candidates"]))
+        for p in parties if p.get("candidates")
+    ]
+    return {
+        "slug": slug,
+        "url": f"{base_url.rstrip('/')}/{slug}",
+        "domain": f"{base_url.split('://')[-1].rstrip('/')}/{slug}",
+        "primary": config["themeColor"] or "#003870",
+        "dark": config["themeColorDark"] or "#002650",
+        "subtitle": texts.get("subtitle", ""),
+        "badge": texts.get("shareCardSubtitle", ""),
+        "cardTitle": texts.get("shareCardTitle", "Mein Wahlzettel"),
+        "cardSubtitle": texts.get("shareCardSubtitle", "Kommunalwahl 2026"),
+        "segments": sorted(segments, key=lambda s: -s[1]),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cached drawing primitives
+# ---------------------------------------------------------------------------
+
+def rgb(color):
+    color = color.lstrip("#")
+    if len(color) == 3:
+        color = "".join(ch * 2 for ch in color)
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+@lru_cache(maxsize=None)
+def font(size, bold=False):
+    for name in FONT_FILES[bold]:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+@lru_cache(maxsize=4096)
+def text_layer(text, size, bold, fill):
+    """Rasterize a text once. Returns (RGBA image cropped to the ink, offset
+    of its top-left corner from the left end of the baseline)."""
+    f = font(size, bold)
+    left, top, right, bottom = f.getbbox(text, anchor="ls")
+    layer = Image.new("RGBA", (max(right - left, 1), max(bottom - top, 1)), (0, 0, 0, 0))
+    ImageDraw.Draw(layer).text((-left, -top), text, font=f, fill=fill, anchor="ls")
+    return layer, (left, top)
+
+
+def draw_text(canvas, x, baseline, text, size, bold=False, fill=(255, 255, 255, 255), align="left"):
+    if align == "center":
+        x -= font(size, bold).getlength(text) / 2
+    layer, (dx, dy) = text_layer(text, size, bold, fill)
+    canvas.alpha_composite(layer, (round(x + dx), round(baseline + dy)))
+
+
+def fit_size(text, size, bold, width):
+    """Largest font size <= size at which text fits in width."""
+    while size > 10 and font(size, bold).getlength(text) > width:
+        size -= 2
+    return size
+
+
+def wrap(text, size, bold, width):
+    lines = []
+    for word in text.split():
+        if lines and font(size, bold).getlength(f"{lines[-1]} {word}") <= width:
+            lines[-1] += f" {word}"
+        else:
+            lines.append(word)
+    return lines
+
+
+@lru_cache(maxsize=64)
+def rounded_mask(size, radius):
+    mask = Image.new("L", size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle((0, 0, size[0] - 1, size[1] - 1), radius, fill=255)
+    return mask
+
+
+@lru_cache(maxsize=64)
+def gradient(size, stops, diagonal):
+    """RGBA linear gradient over stops ((position, "#rrggbb"), ...), top to
+    bottom or along CSS 135deg (top left to bottom right). The color only
+    depends on y, or on x + y, so one ramp of colors is interpolated and
+    indexed."""
+    w, h = size
+    steps = w + h - 1 if diagonal else h
+    t = np.arange(steps) / max(steps - 1, 1)
+    positions = [p for p, _ in stops]
+    ramp = np.empty((steps, 4), dtype=np.uint8)
+    for i in range(3):
+        ramp[:, i] = np.interp(t, positions, [rgb(c)[i] for _, c in stops]).round()
+    ramp[:, 3] = 255
+    if diagonal:
+        pixels = ramp[np.arange(h)[:, None] + np.arange(w)[None, :]]
+    else:
+        pixels = np.broadcast_to(ramp[:, None, :], (h, w, 4))
+    return Image.fromarray(np.ascontiguousarray(pixels), "RGBA")
+
+
+def darker(color, factor=0.7):
+    return "#{:02x}{:02x}{:02x}".format(*(round(c * factor) for c in rgb(color)))
+
+
+# ---------------------------------------------------------------------------
+# Social preview
+# ---------------------------------------------------------------------------
+
+BALLOT_PAD = 26
+BALLOT_HEADER = 44
+BALLOT_ROW = 37
+
+
+def ballot_height():
+    return 2 * BALLOT_PAD + BALLOT_HEADER + BALLOT_ROWS * BALLOT_ROW
+
+
+@lru_cache(maxsize=None)
+def ballot_base():
+    """The theme-independent part of the sample ballot: drop shadow, card,
+    row rules, empty circles and dots. Returns (layer, card offset)."""
+    blur = 30
+    h = ballot_height()
+    layer = Image.new("RGBA", (BALLOT_WIDTH + 4 * blur, h + 4 * blur), (0, 0, 0, 0))
+    ox, oy = 2 * blur, 2 * blur - 20
+    shadow = Image.new("RGBA", layer.size, (0, 0, 0, 0))
+    ImageDraw.Draw(shadow).rounded_rectangle(
+        (ox, oy + 20, ox + BALLOT_WIDTH, oy + 20 + h), 8, fill=(0, 0, 0, 102),
+    )
+    layer.alpha_composite(shadow.filter(ImageFilter.GaussianBlur(blur)))
+
+    draw = ImageDraw.Draw(layer)
+    draw.rounded_rectangle((ox, oy, ox + BALLOT_WIDTH, oy + h), 8, fill=(255, 255, 255, 235))
+    x0, x1 = ox + 24, ox + BALLOT_WIDTH - 24
+    for row in range(BALLOT_ROWS):
+        top = oy + BALLOT_PAD + BALLOT_HEADER + row * BALLOT_ROW
+        cy = top + BALLOT_ROW // 2
+        draw.ellipse((x0, cy - 11, x0 + 22, cy + 11), outline=(156, 163, 175, 255), width=2)
+        for k in range(3):
+            dx = x1 - 8 - (2 - k) * 12
+            draw.ellipse((dx, cy - 4, dx + 8, cy + 4), fill=(209, 213, 219, 255))
+        if row < BALLOT_ROWS - 1:
+            draw.line((x0, top + BALLOT_ROW, x1, top + BALLOT_ROW), fill=(229, 231, 235, 255))
+    return layer, (ox, oy)
+
+
+def draw_ballot(canvas, job, right, center_y):
+    base, (ox, oy) = ballot_base()
+    x = right - BALLOT_WIDTH - ox
+    y = center_y - ballot_height() // 2 - oy
+    canvas.alpha_composite(base, (x, y))
+
+    primary = rgb(job["primary"]) + (255,)
+    draw = ImageDraw.Draw(canvas)
+    left, cx = x + ox, x + ox + BALLOT_WIDTH / 2
+    top = y + oy + BALLOT_PAD
+    draw_text(canvas, cx, top + 14, "MUSTERSTIMMZETTEL", 14, True, primary, align="center")
+    draw.line((left + 24, top + 26, left + BALLOT_WIDTH - 24, top + 26), fill=primary, width=2)
+
+    x0, x1 = left + 24, left + BALLOT_WIDTH - 24
+    for row, (name, (filled, dots)) in enumerate(zip(SAMPLE_NAMES, BALLOT_MARKS)):
+        cy = top + BALLOT_HEADER + row * BALLOT_ROW + BALLOT_ROW // 2
+        if filled:
+            draw.ellipse((x0, cy - 11, x0 + 22, cy + 11), fill=primary)
+            draw_text(canvas, x0 + 11, cy + 5, "✓", 13, True, (255, 255, 255, 255), align="center")
+        for k in range(dots):
+            dx = x1 - 8 - (2 - k) * 12
+            draw.ellipse((dx, cy - 4, dx + 8, cy + 4), fill=primary)
+        size = fit_size(name, 14, False, x1 - 48 - (x0 + 34))
+        draw_text(canvas, x0 + 34, cy + 5, name, size, False, (55, 65, 81, 255))
+
+
+def render_og(job):
+    w, h = OG_SIZE
+    stops = ((0.0, job["primary"]), (0.6, job["dark"]), (1.0, darker(job["dark"])))
+    canvas = gradient(OG_SIZE, stops, True).copy()
+
+    text_width = w - 70 - BALLOT_WIDTH - 50 - 40
+    subtitle = wrap(job["subtitle"], 32, False, min(550, text_width))[:3]
+    badge_size = fit_size(job["badge"], 18, True, text_width - 36)
+    block = 82 + 20 + len(subtitle) * 42 + 24 + 42
+    y = (h - block) // 2
+
+    draw_text(canvas, 70, y + 66, "Wahlzettel", fit_size("Wahlzettel", 82, True, text_width), True)
+    y += 82 + 20
+    for line in subtitle:
+        draw_text(canvas, 70, y + 32, line, 32, False, (255, 255, 255, 217))
+        y += 42
+    if job["badge"]:
+        y += 24
+        badge_w = round(font(badge_size, True).getlength(job["badge"])) + 36
+        pill = Image.new("RGBA", (badge_w, 42), (255, 255, 255, 38))
+        region = (70, y, 70 + badge_w, y + 42)
+        canvas.paste(Image.alpha_composite(canvas.crop(region), pill), region[:2], rounded_mask((badge_w, 42), 21))
+        draw_text(canvas, 88, y + 28, job["badge"], badge_size, True)
+    draw_text(canvas, 70, h - 50, job["domain"], fit_size(job["domain"], 24, True, text_width), True,
+              (255, 255, 255, 153))
+
+    draw_ballot(canvas, job, w - 50, h // 2)
+    return canvas.convert("RGB")
+
+
+# ---------------------------------------------------------------------------
+# QR share card
+# ---------------------------------------------------------------------------
+
+QR_PAD = 48
+QR_SIZE = 360
+QR_MARGIN = 2
+
+
+def qr_modules(url):
+    """(n, n) bool module matrix at error correction level M, like the
+    app's QRCode.create(url, {errorCorrectionLevel: 'M'})."""
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=0)
+    qr.add_data(url)
+    qr.make(fit=True)
+    return np.array(qr.get_matrix(), dtype=bool)
+
+
+def colored_qr(modules, segments):
+    """drawColoredQR(): the dark modules, in reading order, take the party
+    colors in runs proportional to each party's share."""
+    dark = int(modules.sum())
+    palette = np.array([rgb(color) for color, _ in segments] or [(0, 0, 0)], dtype=np.uint8)
+    if segments:
+        total = sum(count for _, count in segments)
+        runs = [round(count / total * dark) for _, count in segments]
+        index = np.repeat(np.arange(len(segments)), runs)[:dark]
+        index = np.concatenate([index, np.full(dark - len(index), len(segments) - 1)])
+    else:
+        index = np.zeros(dark, dtype=np.int64)
+
+    n = len(modules) + 2 * QR_MARGIN
+    pixels = np.full((n, n, 3), 255, dtype=np.uint8)
+    inner = pixels[QR_MARGIN:n - QR_MARGIN, QR_MARGIN:n - QR_MARGIN]
+    inner[modules] = palette[index.astype(np.int64)]
+    image = Image.fromarray(pixels, "RGB").resize((QR_SIZE, QR_SIZE), Image.NEAREST).convert("RGBA")
+    image.putalpha(rounded_mask((QR_SIZE, QR_SIZE), 12))
+    return image
+
+
+def render_qr_card(job):
+    title_y = QR_PAD + 44
+    subtitle_y = title_y + 38
+    qr_y = subtitle_y + 36
+    size = (QR_SIZE + 2 * QR_PAD, qr_y + QR_SIZE + QR_PAD)
+
+    card = Image.new("RGBA", size, (0, 0, 0, 0))
+    card.paste(gradient(size, ((0.0, job["primary"]), (1.0, job["dark"])), False), (0, 0), rounded_mask(size, 24))
+    draw_text(card, size[0] / 2, title_y, job["cardTitle"], 36, True, align="center")
+    draw_text(card, size[0] / 2, subtitle_y, job["cardSubtitle"],
+              fit_size(job["cardSubtitle"], 20, False, size[0] - 2 * QR_PAD), False,
+              (255, 255, 255, 178), align="center")
+    card.alpha_composite(colored_qr(qr_modules(job["url"]), job["segments"]), (QR_PAD, qr_y))
+    return card
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def write_png(path, image):
+    """Write image as PNG unless the file already has those bytes. Returns
+    True if written."""
+    buf = io.BytesIO()
+    image.save(buf, "PNG")
+    content = buf.getvalue()
+    try:
+        if path.read_bytes() == content:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+    return True
+
+
+def render_election(job, out_dir, qr):
+    """Render one election's images. Returns (slug, names of changed files)."""
+    changed = []
+    target = Path(out_dir) / job["slug"]
+    if write_png(target / "og.png", render_og(job)):
+        changed.append("og.png")
+    if qr and write_png(target / "qr.png", render_qr_card(job)):
+        changed.append("qr.png")
+    return job["slug"], changed
+
+
+def _render_star(args):
+    return render_election(*args)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("elections", nargs="*", help="election slugs (default: all)")
+    ap.add_argument("--out", default=str(DEFAULT_OUT), help=f"output directory (default: {DEFAULT_OUT})")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    ap.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"site URL for the QR codes (default: {DEFAULT_BASE_URL})")
+    ap.add_argument("--no-qr", action="store_true", help="only render the social previews")
+    args = ap.parse_args()
+
+    if qrcode is None and not args.no_qr:
+        sys.exit("qrcode is not installed: pip install qrcode (or pass --no-qr)")
+
+    configs = {c["slug"]: (data_file, c) for data_file, c in load_configs().items()}
+    unknown = [s for s in args.elections if s not in configs]
+    if unknown:
+        ap.error(f"unknown election(s): {', '.join(unknown)}")
+    shared_colors = party_colors(SHARED_PARTY_COLORS)
+    jobs = [
+        election_job(configs[slug][1], configs[slug][0], shared_colors, args.base_url)
+        for slug in args.elections or sorted(configs)
+    ]
+    tasks = [(job, args.out, not args.no_qr) for job in jobs]
+
+    if args.workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(_render_star, tasks, chunksize=max(1, len(tasks) // (4 * args.workers))))
+    else:
+        results = [_render_star(t) for t in tasks]
+
+    n_changed = 0
+    for slug, changed in results:
+        if changed:
+            n_changed += 1
+            print(f"  wrote  {slug:24s} {' '.join(changed)}")
+    print(f"{len(results)} election(s) rendered to {args.out}, {n_changed} changed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
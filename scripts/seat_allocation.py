@@ -0,0 +1,157 @@
+"""Seat apportionment for whole batches of vote totals, using NumPy.
+
+The municipal councils in public/data elect as many members as each voter
+has Stimmen (totalStimmen), distributed over the lists by:
+
+  Hessen  Hare-Niemeyer (largest remainders) with the majority clause: a
+          list with more than half of the Stimmen but not more than half of
+          the seats takes the last remainder seat
+  Bayern  Sainte-Laguë/Schepers (divisor method, standard rounding)
+
+Both functions take a (S, L) array of Stimmen per list for S scenarios and
+return (S, L) int32 seats. Exact ties (equal remainders or quotients), for
+which the law has lots drawn, are broken arbitrarily. Lists get all their
+seats even when they have fewer candidates.
+
+simulate() runs Monte Carlo over vote-share uncertainty: list shares are
+drawn from a Dirichlet around the expected shares, apportioned, and the
+seat distribution per list is accumulated, together with how often one
+more ballot for a list (its full Stimmen) would change the outcome.
+"""
+
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("numpy is not installed: pip install numpy")
+
+# Scenarios apportioned per step; bounds the temporary (S, L) arrays
+SIMULATE_CHUNK = 1 << 16
+
+
+def _as_votes(votes):
+    votes = np.asarray(votes, dtype=np.float64)
+    return votes[None, :] if votes.ndim == 1 else votes
+
+
+def hare_niemeyer(votes, seats, majority_clause=True):
+    """Largest remainders: every list gets the integer part of its quota
+    votes * seats / total, the seats left go to the largest remainders."""
+    votes = _as_votes(votes)
+    n, n_lists = votes.shape
+    total = votes.sum(axis=1, keepdims=True)
+    quota = votes * seats / np.where(total > 0, total, 1)
+    alloc = np.floor(quota).astype(np.int32)
+    left = seats - alloc.sum(axis=1)
+
+    order = np.argsort(alloc - quota, axis=1, kind="stable")
+    extra = np.arange(n_lists)[None, :] < left[:, None]
+    rows = np.arange(n)[:, None]
+    alloc[rows, order] += extra
+
+    if majority_clause:
+        majority = 2 * votes > total
+        winner = np.argmax(majority, axis=1)
+        # Remainder seats of other lists, the last one handed out is taken
+        takeable = extra & (order != winner[:, None])
+        short = (majority & (2 * alloc <= seats)).any(axis=1) & takeable.any(axis=1)
+        if short.any():
+            r = np.flatnonzero(short)
+            last = n_lists - 1 - np.argmax(takeable[r, ::-1], axis=1)
+            alloc[r, winner[r]] += 1
+            alloc[r, order[r, last]] -= 1
+    return alloc
+
+
+def sainte_lague(votes, seats):
+    """Divisor method with standard rounding: seats = round(votes / d) for a
+    divisor d that hands out exactly `seats`. Starts from d = total / seats
+    and then moves one seat at a time along the highest quotients
+    votes / (seats + 0.5), as the highest-averages procedure would."""
+    votes = _as_votes(votes)
+    total = votes.sum(axis=1, keepdims=True)
+    alloc = np.floor(votes * seats / np.where(total > 0, total, 1) + 0.5).astype(np.int32)
+    diff = seats - alloc.sum(axis=1)
+    while diff.any():
+        grow = np.flatnonzero(diff > 0)
+        if len(grow):
+            quotient = votes[grow] / (alloc[grow] + 0.5)
+            alloc[grow, np.argmax(quotient, axis=1)] += 1
+        shrink = np.flatnonzero(diff < 0)
+        if len(shrink):
+            a = alloc[shrink]
+            quotient = np.where(a > 0, votes[shrink] / np.maximum(a - 0.5, 0.5), np.inf)
+            alloc[shrink, np.argmin(quotient, axis=1)] -= 1
+        diff = seats - alloc.sum(axis=1)
+    return alloc
+
+
+METHODS = {
+    "hare-niemeyer": hare_niemeyer,
+    "sainte-lague": sainte_lague,
+}
+
+
+def method_for(config):
+    """The apportionment method of an election config: Bayern (several list
+    crosses allowed) uses Sainte-Laguë, Hessen Hare-Niemeyer."""
+    return "sainte-lague" if config["allowMultipleListVotes"] else "hare-niemeyer"
+
+
+def ballot_stimmen(data, config):
+    """Stimmen one ballot with only a cross for each list gives that list:
+    Hessen cycles totalStimmen over the list, Bayern gives one per
+    candidate. Returns an array aligned with data["parties"]."""
+    sizes = np.array([len(p["candidates"]) for p in data["parties"]])
+    per_candidate = 1 if config["allowMultipleListVotes"] else data["maxPerCandidate"]
+    return np.minimum(data["totalStimmen"], per_candidate * sizes)
+
+
+def simulate(expected, seats, method, n, rng, concentration=None, ballot=None, chunk=SIMULATE_CHUNK):
+    """Monte Carlo over list shares.
+
+    expected: (L,) expected Stimmen per list; their sum is the Stimmen cast
+    in every scenario. Shares are drawn from Dirichlet(concentration *
+    expected share); without a concentration (no prior results) from the
+    flat Dirichlet, every share vector equally likely.
+
+    ballot: optional (L,) Stimmen of one more ballot per list; then the
+    scenarios are also apportioned with that ballot added to each list in
+    turn.
+
+    Returns {"seatCounts": (L, seats + 1) scenario counts per list and seat
+    number, "seatsSum": (L,), "pivot": (L,) scenarios in which the extra
+    ballot changes any seat, "gain": (L,) in which it wins its list a seat}.
+    """
+    allocate = METHODS[method]
+    expected = np.asarray(expected, dtype=np.float64)
+    n_lists = len(expected)
+    cast = expected.sum()
+    alpha = (
+        np.ones(n_lists) if concentration is None
+        else np.maximum(concentration * expected / cast, 1e-3)
+    )
+    counts = np.zeros((n_lists, seats + 1), dtype=np.int64)
+    seats_sum = np.zeros(n_lists, dtype=np.int64)
+    pivot = np.zeros(n_lists, dtype=np.int64)
+    gain = np.zeros(n_lists, dtype=np.int64)
+    offsets = np.arange(n_lists) * (seats + 1)
+
+    for start in range(0, n, chunk):
+        k = min(chunk, n - start)
+        shares = rng.standard_gamma(alpha, size=(k, n_lists))
+        votes = shares * (cast / shares.sum(axis=1, keepdims=True))
+        alloc = allocate(votes, seats)
+        counts += np.bincount((alloc + offsets).ravel(), minlength=counts.size).reshape(counts.shape)
+        seats_sum += alloc.sum(axis=0)
+        if ballot is None:
+            continue
+        for j in range(n_lists):
+            votes[:, j] += ballot[j]
+            after = allocate(votes, seats)
+            votes[:, j] -= ballot[j]
+            pivot[j] += (after != alloc).any(axis=1).sum()
+            gain[j] += (after[:, j] > alloc[:, j]).sum()
+
+    return {"seatCounts": counts, "seatsSum": seats_sum, "pivot": pivot, "gain": gain}
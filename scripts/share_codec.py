@@ -0,0 +1,305 @@
+"""Bulk encoder/decoder for the app's share-link vote state.
+
+Mirrors src/utils/shareState.ts. A binary share link (#b=) is base64url of
+a raw-deflated payload:
+
+  byte 0      [3:0] shareTypeCode of the election (only the low 4 bits)
+  byte 1      [7] list cross, [6:2] its list number - 1
+  if list:    struck count, then one byte per struck position
+  then:       vote count, then per vote a big-endian 16-bit word with
+              [15:11] list number - 1, [10:4] position - 1, [3:2] Stimmen - 1
+
+Legacy #v= links carry deflated JSON ({"e", "c", "l"}) instead.
+
+decode_payloads() inflates every payload and then parses all of them at
+once: the payloads are concatenated into one byte array and the header,
+struck and vote fields are unpacked with vectorized NumPy indexing. The
+result is matched to an election's candidates by (list number, position)
+into a ballot_engine batch, ready for Election.evaluate().
+
+Caveats from the app's format, reproduced here as they are:
+  - codes >= 16 are truncated to their low 4 bits, so links say e.g.
+    darmstadt-stvv (4) for bamberg-stadtrat (20). The URL path names the
+    election the link was made on; decode_log() trusts the path when there
+    is one.
+  - list numbers above 32 and positions above 128 wrap.
+  - the app reads the position from the candidate id's third dash-separated
+    field, which is only the position for ids like "stvv-1-5"; for
+    "b-sr-1-5" it is the list number. Links from those elections carry
+    that number. encode_batch() writes the real positions.
+"""
+
+import base64
+import binascii
+import json
+import re
+import zlib
+
+import numpy as np
+
+# Legacy share codes 0/1 and #v= election names
+LEGACY_SLUGS = {"stvv": "frankfurt-stvv", "kav": "frankfurt-kav"}
+
+SHARE_URL_RE = re.compile(
+    r"(?:/(?P<slug>[a-z][a-z0-9-]*))?#(?P<format>[bv])=(?P<payload>[A-Za-z0-9_-]+)"
+)
+
+MAX_LIST = 32
+MAX_POSITION = 128
+
+
+def _b64decode(s):
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def inflate(payload):
+    """Base64url + raw-deflate decode one payload. Returns bytes or None."""
+    try:
+        return zlib.decompress(_b64decode(payload), -15)
+    except (binascii.Error, ValueError, zlib.error):
+        return None
+
+
+def deflate(data):
+    c = zlib.compressobj(wbits=-15)
+    return _b64encode(c.compress(data) + c.flush())
+
+
+# ---------------------------------------------------------------------------
+# Decoding
+# ---------------------------------------------------------------------------
+
+def _ragged(starts, counts, stride):
+    """Byte indices of variable-length sections: for each record i,
+    starts[i] + stride * k for k < counts[i]. Returns (record, index)."""
+    record = np.repeat(np.arange(len(counts)), counts)
+    first = np.cumsum(counts) - counts
+    k = np.arange(len(record)) - np.repeat(first, counts)
+    return record, np.repeat(starts, counts) + stride * k
+
+
+def parse_binary(raws):
+    """Parse inflated binary payloads in one pass. Returns a dict of arrays:
+
+      per payload:  code, hasList, listNumber, ok (well-formed)
+      per vote:     voteRecord, voteList, votePosition, voteStimmen
+      per strike:   struckRecord, struckPosition
+
+    Malformed payloads (truncated, or None) have ok False and no votes.
+    """
+    n = len(raws)
+    lengths = np.array([len(r) if r is not None else 0 for r in raws], dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    # Padding so the header reads below can't run off the end
+    buf = np.frombuffer(b"".join(r for r in raws if r is not None) + b"\0" * 4, dtype=np.uint8)
+
+    byte0 = buf[starts]
+    byte1 = buf[starts + 1]
+    has_list = (byte1 & 0x80) != 0
+    n_struck = np.where(has_list, buf[starts + 2], 0).astype(np.int64)
+    vote_count_at = starts + 2 + np.where(has_list, 1 + n_struck, 0)
+    n_votes = buf[np.minimum(vote_count_at, len(buf) - 1)].astype(np.int64)
+    needed = vote_count_at - starts + 1 + 2 * n_votes
+    ok = (lengths >= 3) & (needed <= lengths)
+    n_struck = np.where(ok, n_struck, 0)
+    n_votes = np.where(ok, n_votes, 0)
+
+    struck_record, idx = _ragged(starts + 3, n_struck, 1)
+    struck_position = buf[idx].astype(np.int32)
+
+    vote_record, idx = _ragged(vote_count_at + 1, n_votes, 2)
+    word = (buf[idx].astype(np.int32) << 8) | buf[idx + 1]
+
+    return {
+        "code": (byte0 & 0x0F).astype(np.int32),
+        "hasList": has_list & ok,
+        "listNumber": np.where(has_list & ok, ((byte1 >> 2) & 0x1F) + 1, 0).astype(np.int32),
+        "ok": ok,
+        "voteRecord": vote_record,
+        "voteList": ((word >> 11) & 0x1F) + 1,
+        "votePosition": ((word >> 4) & 0x7F) + 1,
+        "voteStimmen": (((word >> 2) & 0x03) + 1).astype(np.uint8),
+        "struckRecord": struck_record,
+        "struckPosition": struck_position,
+    }
+
+
+def decode_payloads(payloads):
+    """Inflate and parse binary (#b=) payloads. See parse_binary()."""
+    return parse_binary([inflate(p) for p in payloads])
+
+
+def _candidate_lookup(election):
+    """(MAX_LIST + 1, MAX_POSITION + 1) array of candidate columns, -1 if none."""
+    lut = np.full((MAX_LIST + 1, MAX_POSITION + 1), -1, dtype=np.int32)
+    lists = election.list_numbers[election.party]
+    fits = (lists <= MAX_LIST) & (election.positions <= MAX_POSITION)
+    lut[lists[fits], election.positions[fits]] = np.flatnonzero(fits)
+    return lut
+
+
+def to_batch(election, parsed, records=None):
+    """Scatter parsed payloads (all, or the given record indices) into a
+    ballot_engine batch. Returns (batch, unmatched), unmatched counting
+    votes/strikes/list crosses that name no candidate or list of this
+    election."""
+    if records is None:
+        records = np.arange(len(parsed["code"]))
+    row_of = np.full(len(parsed["code"]), -1, dtype=np.int64)
+    row_of[records] = np.arange(len(records))
+    batch = election.empty(len(records))
+    lut = _candidate_lookup(election)
+    unmatched = 0
+
+    rows = row_of[parsed["voteRecord"]]
+    cols = lut[parsed["voteList"], parsed["votePosition"]]
+    hit = (rows >= 0) & (cols >= 0)
+    unmatched += int(((rows >= 0) & (cols < 0)).sum())
+    batch["votes"][rows[hit], cols[hit]] = parsed["voteStimmen"][hit]
+
+    list_col = np.full(MAX_LIST + 1, -1, dtype=np.int32)
+    fits = election.list_numbers <= MAX_LIST
+    list_col[election.list_numbers[fits]] = np.flatnonzero(fits)
+    crossed = list_col[parsed["listNumber"][records]]
+    has_list = parsed["hasList"][records]
+    unmatched += int((has_list & (crossed < 0)).sum())
+    ok = has_list & (crossed >= 0)
+    batch["lists"][np.flatnonzero(ok), crossed[ok]] = True
+
+    rows = row_of[parsed["struckRecord"]]
+    position = parsed["struckPosition"]
+    cols = np.where(
+        position <= MAX_POSITION,
+        lut[parsed["listNumber"][parsed["struckRecord"]], np.minimum(position, MAX_POSITION)],
+        -1,
+    )
+    hit = (rows >= 0) & (cols >= 0)
+    unmatched += int(((rows >= 0) & ~hit).sum())
+    batch["struck"][rows[hit], cols[hit]] = True
+    return batch, unmatched
+
+
+def decode_legacy(payload):
+    """Decode a #v= payload into (election slug, VoteState), or None."""
+    raw = inflate(payload)
+    if raw is None:
+        return None
+    try:
+        compact = json.loads(raw)
+    except ValueError:
+        return None
+    state = {"candidateVotes": {}, "listSelections": {}}
+    for cid, list_number, stimmen in compact.get("c") or []:
+        state["candidateVotes"][cid] = {"candidateId": cid, "partyListNumber": list_number, "stimmen": stimmen}
+    for list_number, struck in compact.get("l") or []:
+        state["listSelections"][str(list_number)] = {
+            "partyListNumber": list_number, "isSelected": True, "struckCandidateIds": struck or [],
+        }
+    raw_type = compact.get("e", "stvv")
+    return LEGACY_SLUGS.get(raw_type, raw_type), state
+
+
+def decode_log(lines, slugs_by_code):
+    """Find share links in log lines and decode them all.
+
+    slugs_by_code maps shareTypeCode -> slug. A link's election is taken
+    from its URL path when that is a known slug, otherwise from the code
+    in the payload (which has lost all but its low 4 bits).
+
+    Returns (parsed, slugs, legacy, stats): parse_binary() output for the
+    #b= links, their election slugs (array aligned with the records), the
+    decoded #v= links as [(slug, VoteState)], and counts.
+    """
+    known = set(slugs_by_code.values())
+    by_nibble = {}
+    for code, slug in sorted(slugs_by_code.items()):
+        by_nibble.setdefault(code & 0x0F, slug)
+
+    payloads, path_slugs, legacy = [], [], []
+    stats = {"links": 0, "malformed": 0, "codeMismatch": 0}
+    for line in lines:
+        for m in SHARE_URL_RE.finditer(line):
+            stats["links"] += 1
+            if m["format"] == "v":
+                decoded = decode_legacy(m["payload"])
+                if decoded is None:
+                    stats["malformed"] += 1
+                else:
+                    legacy.append(decoded)
+                continue
+            payloads.append(m["payload"])
+            path_slugs.append(m["slug"] if m["slug"] in known else None)
+
+    parsed = decode_payloads(payloads)
+    stats["malformed"] += int((~parsed["ok"]).sum())
+    code_of_slug = {slug: code for code, slug in slugs_by_code.items()}
+    slugs = []
+    for code, path_slug in zip(parsed["code"].tolist(), path_slugs):
+        if path_slug is not None:
+            if code_of_slug[path_slug] & 0x0F != code:
+                stats["codeMismatch"] += 1
+            slugs.append(path_slug)
+        else:
+            slugs.append(by_nibble.get(code))
+    return parsed, np.array(slugs, dtype=object), legacy, stats
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+def to_binary_batch(election, batch, code):
+    """Binary payloads (before deflate) for every ballot of a batch, built
+    with vectorized writes into one buffer. Like the app, only the first
+    crossed list (lowest list number) is stored."""
+    votes, lists, struck = batch["votes"], batch["lists"], batch["struck"]
+    list_numbers = election.list_numbers
+
+    order = np.argsort(list_numbers, kind="stable")
+    list_idx = order[np.argmax(lists[:, order], axis=1)]
+    has_list = lists.any(axis=1)
+    list_number = np.where(has_list, list_numbers[list_idx], 0)
+
+    # Struck candidates of the stored list
+    struck_mask = struck & has_list[:, None] & (election.party[None, :] == list_idx[:, None])
+    struck_mask &= (election.positions > 0) & (election.positions <= 255)
+    n_struck = struck_mask.sum(axis=1)
+    vote_mask = votes > 0
+    n_votes = vote_mask.sum(axis=1)
+
+    sizes = 2 + np.where(has_list, 1 + n_struck, 0) + 1 + 2 * n_votes
+    starts = np.cumsum(sizes) - sizes
+    buf = np.zeros(int(sizes.sum()), dtype=np.uint8)
+    buf[starts] = code & 0x0F
+    buf[starts + 1] = np.where(has_list, 0x80 | (((list_number - 1) & 0x1F) << 2), 0)
+    buf[(starts + 2)[has_list]] = n_struck[has_list] & 0xFF
+
+    rec, cand = np.nonzero(struck_mask)
+    first = np.cumsum(n_struck) - n_struck
+    buf[starts[rec] + 3 + (np.arange(len(rec)) - first[rec])] = election.positions[cand] & 0xFF
+
+    count_at = starts + 2 + np.where(has_list, 1 + n_struck, 0)
+    buf[count_at] = n_votes & 0xFF
+    rec, cand = np.nonzero(vote_mask)
+    first = np.cumsum(n_votes) - n_votes
+    at = count_at[rec] + 1 + 2 * (np.arange(len(rec)) - first[rec])
+    word = (
+        (((list_numbers[election.party[cand]] - 1) & 0x1F) << 11)
+        | (((election.positions[cand] - 1) & 0x7F) << 4)
+        | (((votes[rec, cand].astype(np.int32) - 1) & 0x03) << 2)
+    )
+    buf[at] = word >> 8
+    buf[at + 1] = word & 0xFF
+
+    data = buf.tobytes()
+    return [data[s:s + z] for s, z in zip(starts.tolist(), sizes.tolist())]
+
+
+def encode_batch(election, batch, code):
+    """#b= payloads for every ballot of a batch."""
+    return [deflate(raw) for raw in to_binary_batch(election, batch, code)]
+
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Simulate seat allocations and precompute what one ballot can change.
+
+Usage: python scripts/simulate-seats.py [--results FILE] [--count N] [--pivot-count N]
+                                        [--concentration C] [--voters N] [--seed S]
+                                        [--out DIR] [--bench] [election ...]
+
+For every list-vote election (or the ones given), draws --count vote-share
+scenarios, apportions the seats (Hare-Niemeyer for Hessen, Sainte-Laguë
+for Bayern, see seat_allocation.py) and writes DIR/<slug>.json with, per
+list, the expected seats, the seat distribution and how often one more
+ballot crossing the list changes the council (pivotProbability) or wins
+the list a seat (gainProbability). The ballot effects are measured on
+--pivot-count of the scenarios.
+
+--results is a JSON file {slug: {listNumber: Stimmen}} of expected (e.g.
+previous or polled) totals; shares then vary around them with a Dirichlet
+of the given concentration (larger is tighter). Elections without results
+use a flat prior over shares and --voters ballots.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from election_validate import load_configs, select_elections
+from pipeline import DATA_DIR, PROJECT_ROOT
+from seat_allocation import ballot_stimmen, method_for, simulate
+
+DEFAULT_OUT = PROJECT_ROOT / ".cache" / "seat-simulations"
+
+
+def expected_stimmen(data, results, voters):
+    """(expected Stimmen per list, concentration used?) for an election."""
+    list_numbers = [p["listNumber"] for p in data["parties"]]
+    if results is None:
+        cast = voters * data["totalStimmen"]
+        return np.full(len(list_numbers), cast / len(list_numbers)), False
+    return np.array([float(results.get(str(n), 0)) for n in list_numbers]), True
+
+
+def table(data, method, seats, count, pivot_count, sim):
+    parties = []
+    for j, party in enumerate(data["parties"]):
+        dist = sim["seatCounts"][j] / count
+        cdf = np.cumsum(dist)
+        parties.append({
+            "listNumber": party["listNumber"],
+            "shortName": party["shortName"],
+            "seatsMean": round(float(sim["seatsSum"][j]) / count, 3),
+            "seatsP05": int(np.searchsorted(cdf, 0.05)),
+            "seatsP95": int(np.searchsorted(cdf, 0.95)),
+            # probability per seat count, up to the last one that occurs
+            "seatProbabilities": [round(float(p), 5) for p in dist[:np.flatnonzero(dist)[-1] + 1]],
+            "pivotProbability": float(sim["pivot"][j]) / pivot_count if pivot_count else None,
+            "gainProbability": float(sim["gain"][j]) / pivot_count if pivot_count else None,
+        })
+    return {"method": method, "seats": seats, "scenarios": count, "pivotScenarios": pivot_count, "parties": parties}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("elections", nargs="*", help="data files or slugs (default: all with list votes)")
+    ap.add_argument("--results", help="JSON {slug: {listNumber: Stimmen}} of expected totals")
+    ap.add_argument("--count", type=int, default=1_000_000, help="scenarios per election")
+    ap.add_argument("--pivot-count", type=int, default=100_000, help="scenarios to measure ballot effects on")
+    ap.add_argument("--concentration", type=float, default=2000.0,
+                    help="Dirichlet concentration around --results (default: 2000)")
+    ap.add_argument("--voters", type=int, default=20_000, help="ballots cast, for elections without results")
+    ap.add_argument("--seed", type=int, default=0, help="random seed")
+    ap.add_argument("--out", default=str(DEFAULT_OUT), help=f"output directory (default: {DEFAULT_OUT})")
+    ap.add_argument("--bench", action="store_true", help="only measure throughput, no ballot effects")
+    args = ap.parse_args()
+
+    try:
+        selected = select_elections(args.elections, load_configs())
+    except ValueError as e:
+        ap.error(str(e))
+    results = {}
+    if args.results:
+        with open(args.results, encoding="utf-8") as f:
+            results = json.load(f)
+
+    out_dir = Path(args.out)
+    if not args.bench:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    pivot_count = 0 if args.bench else min(args.pivot_count, args.count)
+
+    for slug, data_file, config in selected:
+        with open(DATA_DIR / data_file, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or "parties" not in data:
+            print(f"{slug:24s} skipped: not a list election")
+            continue
+        method = method_for(config)
+        seats = data["totalStimmen"]
+        expected, informed = expected_stimmen(data, results.get(slug), args.voters)
+        concentration = args.concentration if informed else None
+        rng = np.random.default_rng([args.seed, *slug.encode()])
+
+        start = time.perf_counter()
+        sim = simulate(expected, seats, method, args.count - pivot_count, rng, concentration)
+        if pivot_count:
+            effects = simulate(expected, seats, method, pivot_count, rng, concentration,
+                               ballot=ballot_stimmen(data, config))
+            sim = {key: sim[key] + effects[key] for key in sim}
+        elapsed = time.perf_counter() - start
+
+        print(f"{slug:24s} {method:14s} {seats:3d} seats {len(expected):3d} lists  "
+              f"{args.count / elapsed:>10,.0f} scenarios/s{'' if informed else '  (flat prior)'}", flush=True)
+        if args.bench:
+            continue
+        out = table(data, method, seats, args.count, pivot_count, sim)
+        out["prior"] = "results" if informed else "flat"
+        with open(out_dir / f"{slug}.json", "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""Registry of source documents and a fetcher that mirrors them locally.
+
+scripts/sources.json maps a source name to its URL, the path the parser
+reads it from and, once pinned, the expected SHA-256:
+
+    "bw-landtagswahl": {"url": "https://...", "path": "/tmp/bw-....pdf", "sha256": null}
+
+Downloads land in a content-addressed mirror under .cache/sources/objects
+(<sha256[:2]>/<sha256>) and are then copied to the entry's path. Per
+source the fetcher remembers the ETag and Last-Modified of the last
+download, so a refresh is a conditional request that usually ends in a 304.
+An interrupted transfer is kept as a .part file and resumed with a Range
+request (guarded by If-Range, so a changed document restarts from zero).
+
+Sources are fetched concurrently, at most PER_HOST at a time from one
+server. This module must stay stdlib-only.
+"""
+
+import http.client
+import json
+import os
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from pipeline import PROJECT_ROOT, SCRIPTS_DIR, sha256_file
+
+SOURCES_FILE = SCRIPTS_DIR / "sources.json"
+MIRROR_DIR = PROJECT_ROOT / ".cache" / "sources"
+OBJECTS_DIR = MIRROR_DIR / "objects"
+PARTIAL_DIR = MIRROR_DIR / "partial"
+STATE_PATH = MIRROR_DIR / "state.json"
+
+FETCH_WORKERS = 8
+PER_HOST = 2
+TIMEOUT = 30
+RETRIES = 3
+CHUNK_SIZE = 1 << 16
+USER_AGENT = "wahlzettel-data-fetch/1.0"
+
+
+class FetchError(Exception):
+    """A failed fetch. retry is False when trying again can't help."""
+
+    def __init__(self, message, retry=True):
+        super().__init__(message)
+        self.retry = retry
+
+
+def load_registry(path=SOURCES_FILE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_registry(registry, path=SOURCES_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(registry, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def load_state():
+    try:
+        with open(STATE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, STATE_PATH)
+
+
+def object_path(sha256):
+    return OBJECTS_DIR / sha256[:2] / sha256
+
+
+def materialize(sha256, target):
+    """Copy a mirrored object to the path a parser reads it from, unless the
+    file there already has that content."""
+    target = Path(target)
+    src = object_path(sha256)
+    try:
+        if target.stat().st_size == src.stat().st_size and sha256_file(target) == sha256:
+            return
+    except OSError:
+        pass
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.tmp")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, target)
+
+
+def _request(url, headers):
+    """urlopen() that returns 304/416 responses instead of raising them."""
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **headers})
+    try:
+        return urllib.request.urlopen(req, timeout=TIMEOUT)
+    except urllib.error.HTTPError as e:
+        if e.code in (304, 416):
+            return e
+        raise FetchError(f"HTTP {e.code} {e.reason}", retry=e.code >= 500 or e.code == 429) from None
+
+
+def _download(name, entry, previous, force):
+    """One attempt at fetching a source. Returns (status, state entry).
+
+    status is "unchanged", "downloaded" or "resumed".
+    """
+    part = PARTIAL_DIR / f"{name}.part"
+    part_meta = PARTIAL_DIR / f"{name}.part.json"
+    headers = {}
+    offset = 0
+
+    resume = None
+    if part.exists() and part_meta.exists():
+        with open(part_meta, encoding="utf-8") as f:
+            resume = json.load(f)
+    if resume and resume["url"] == entry["url"] and (resume["etag"] or resume["lastModified"]):
+        offset = part.stat().st_size
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = resume["etag"] or resume["lastModified"]
+    elif previous and not force and object_path(previous["sha256"]).exists():
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("lastModified"):
+            headers["If-Modified-Since"] = previous["lastModified"]
+
+    with _request(entry["url"], headers) as resp:
+        if resp.status == 304:
+            return "unchanged", previous
+        if resp.status == 416:
+            # Our partial file is no prefix of the current document
+            part.unlink(missing_ok=True)
+            part_meta.unlink(missing_ok=True)
+            raise FetchError("range not satisfiable, restarting")
+
+        if resp.status == 206:
+            content_range = resp.headers.get("Content-Range", "")
+            if not content_range.startswith(f"bytes {offset}-"):
+                raise FetchError(f"unexpected Content-Range {content_range!r}")
+            mode = "ab"
+        else:
+            offset = 0
+            mode = "wb"
+            PARTIAL_DIR.mkdir(parents=True, exist_ok=True)
+            with open(part_meta, "w", encoding="utf-8") as f:
+                json.dump({
+                    "url": entry["url"],
+                    "etag": resp.headers.get("ETag"),
+                    "lastModified": resp.headers.get("Last-Modified"),
+                }, f)
+            resume = None
+
+        length = resp.headers.get("Content-Length")
+        with open(part, mode) as f:
+            for chunk in iter(lambda: resp.read(CHUNK_SIZE), b""):
+                f.write(chunk)
+        if length is not None and part.stat().st_size != offset + int(length):
+            raise FetchError(f"transfer cut off at {part.stat().st_size} bytes")
+
+        with open(part_meta, encoding="utf-8") as f:
+            validators = json.load(f)
+
+    sha256 = sha256_file(part)
+    if entry.get("sha256") and sha256 != entry["sha256"]:
+        part.unlink()
+        part_meta.unlink()
+        raise FetchError(f"sha256 {sha256[:12]} does not match the pinned {entry['sha256'][:12]}", retry=False)
+
+    dest = object_path(sha256)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(part, dest)
+    part_meta.unlink()
+    status = "resumed" if resume else "downloaded"
+    return status, {
+        "url": entry["url"],
+        "sha256": sha256,
+        "size": dest.stat().st_size,
+        "etag": validators["etag"],
+        "lastModified": validators["lastModified"],
+    }
+
+
+def fetch_source(name, entry, previous=None, force=False, host_slots=None):
+    """Fetch one source into the mirror and copy it to its path, retrying
+    transient failures (a retry resumes the partial download).
+
+    Returns a result dict {"name", "status", "state", "detail", "seconds"};
+    status "error" leaves the previous state in place.
+    """
+    start = time.perf_counter()
+    slot = host_slots[urlsplit(entry["url"]).netloc] if host_slots else threading.Semaphore()
+    status, state, detail = "error", previous, ""
+    with slot:
+        for attempt in range(1, RETRIES + 1):
+            try:
+                result = _download(name, entry, previous, force)
+                materialize(result[1]["sha256"], entry["path"])
+                (status, state), detail = result, ""
+                break
+            except (FetchError, http.client.HTTPException, OSError) as e:
+                detail = str(getattr(e, "reason", e))
+                if not getattr(e, "retry", True):
+                    break
+                if attempt < RETRIES:
+                    time.sleep(attempt)
+    return {
+        "name": name, "status": status, "state": state, "detail": detail,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def fetch_all(registry, names=None, workers=FETCH_WORKERS, force=False):
+    """Fetch sources concurrently and record their state. Returns the
+    results in registry order."""
+    names = list(names or registry)
+    state = load_state()
+    host_slots = {
+        urlsplit(registry[n]["url"]).netloc: threading.Semaphore(PER_HOST) for n in names
+    }
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names)))) as pool:
+        futures = [
+            pool.submit(fetch_source, n, registry[n], state.get(n), force, host_slots) for n in names
+        ]
+        results = [f.result() for f in futures]
+    for result in results:
+        if result["state"]:
+            state[result["name"]] = result["state"]
+    save_state(state)
+    return results
+
+
+def ensure_source(name):
+    """Return the local path of a registered source, fetching it if it is
+    not there yet."""
+    entry = load_registry()[name]
+    path = Path(entry["path"])
+    if path.exists():
+        return path
+    print(f"Fetching {name} from {entry['url']}")
+    result = fetch_all({name: entry})[0]
+    if result["status"] == "error":
+        raise FetchError(f"{name}: {result['detail']}")
+    return path
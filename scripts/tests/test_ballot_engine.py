@@ -0,0 +1,147 @@
+"""Fuzz the NumPy ballot engine against the app's own voteCalculator.ts.
+
+The TypeScript module is loaded into node with its type annotations
+stripped (strip_types() handles the annotations that file uses; anything
+new shows up as a SyntaxError). Skipped when node is not installed.
+
+Run with: python -m unittest discover scripts/tests
+"""
+
+import json
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ballot_engine import Election  # noqa: E402
+from pipeline import DATA_DIR, PROJECT_ROOT  # noqa: E402
+
+VOTE_CALCULATOR = PROJECT_ROOT / "src" / "utils" / "voteCalculator.ts"
+BALLOTS = 1500
+
+# Evaluates {"election", "allowMultipleListVotes", "states"} from stdin:
+# the derived state of every VoteState and, without multiple list votes,
+# the Kopfleiste allocation of each crossed list
+DRIVER = """
+import { readFileSync } from 'node:fs';
+import { calculateDerivedState, calculateListVoteDistribution } from './voteCalculator.mjs';
+
+const { election, allowMultipleListVotes, states } = JSON.parse(readFileSync(0, 'utf8'));
+const out = states.map(state => {
+  const derived = calculateDerivedState(state, election, allowMultipleListVotes);
+  const allocations = {};
+  if (!allowMultipleListVotes) {
+    const individual = Object.values(state.candidateVotes).reduce((s, v) => s + v.stimmen, 0);
+    for (const selection of Object.values(state.listSelections)) {
+      const party = election.parties.find(p => p.listNumber === selection.partyListNumber);
+      if (!selection.isSelected || !party || election.totalStimmen - individual <= 0) continue;
+      allocations[selection.partyListNumber] = calculateListVoteDistribution(
+        party, selection.struckCandidateIds, state.candidateVotes, election.totalStimmen - individual);
+    }
+  }
+  return { derived, allocations };
+});
+process.stdout.write(JSON.stringify(out));
+"""
+
+
+def strip_types(ts):
+    """voteCalculator.ts as plain JavaScript."""
+    js = []
+    in_signature = False
+    for line in ts.splitlines():
+        if line.startswith("import type "):
+            continue
+        if re.match(r"export function \w+\($", line):
+            in_signature = True
+        elif in_signature and line.startswith(")"):
+            in_signature = False
+            line = re.sub(r"^\): .+ \{$", ") {", line)
+        elif in_signature:
+            line = re.sub(r"^(\s+\w+)\??: .+,$", r"\1,", line)
+        line = re.sub(r"\b((?:const|let) \w+): [^=;]+?( =|;)", r"\1\2", line)
+        js.append(line)
+    return "\n".join(js) + "\n"
+
+
+def synthetic_election(sizes, total, prefix):
+    """A small election with lists of the given sizes (0 for an empty list)."""
+    return {
+        "totalStimmen": total,
+        "maxPerCandidate": 3,
+        "parties": [
+            {
+                "listNumber": j + 1,
+                "candidates": [
+                    {"id": f"{prefix}-{j + 1}-{k + 1}", "position": k + 1, "lastName": f"N{k}", "firstName": ""}
+                    for k in range(size)
+                ],
+            }
+            for j, size in enumerate(sizes)
+        ],
+    }
+
+
+@unittest.skipUnless(shutil.which("node"), "node is not installed")
+class VoteCalculatorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+        (cls.tmp / "voteCalculator.mjs").write_text(strip_types(VOTE_CALCULATOR.read_text("utf-8")), "utf-8")
+        (cls.tmp / "driver.mjs").write_text(DRIVER, "utf-8")
+
+    def node(self, data, allow_multiple, states):
+        payload = {"election": data, "allowMultipleListVotes": allow_multiple, "states": states}
+        proc = subprocess.run(
+            ["node", str(self.tmp / "driver.mjs")], input=json.dumps(payload),
+            capture_output=True, text=True, check=True,
+        )
+        return json.loads(proc.stdout)
+
+    def compare(self, data, allow_multiple, seed, extra_crosses=False):
+        election = Election(data, allow_multiple)
+        rng = np.random.default_rng(seed)
+        batch = election.random_ballots(BALLOTS, rng)
+        if extra_crosses and election.n_lists:
+            # Several crossed lists, which the Hessen ballot does not allow
+            # but voteCalculator.ts still evaluates
+            batch["lists"] |= rng.random(batch["lists"].shape) < 0.3
+        result = election.evaluate(batch, per_candidate=True)
+        states = [election.to_vote_state(batch, i) for i in range(BALLOTS)]
+
+        # Stops at the first mismatch: the ballot is reproduced by the seed
+        for i, expected in enumerate(self.node(data, allow_multiple, states)):
+            self.assertEqual(election.derived_state(result, i), expected["derived"], f"ballot {i}")
+            for list_number, allocation in expected["allocations"].items():
+                j = election._list_index[int(list_number)]
+                start, end = election.list_start[j], election.list_end[j]
+                listed = result["candidateStimmen"][i, start:end] - batch["votes"][i, start:end]
+                self.assertEqual(
+                    {election.candidate_ids[start + k]: int(v) for k, v in enumerate(listed) if v},
+                    allocation, f"ballot {i}, Liste {list_number}",
+                )
+
+    def test_frankfurt(self):
+        with open(DATA_DIR / "stvv-candidates.json", encoding="utf-8") as f:
+            self.compare(json.load(f), False, 1)
+
+    def test_muenchen(self):
+        with open(DATA_DIR / "muenchen-stadtrat.json", encoding="utf-8") as f:
+            self.compare(json.load(f), True, 2)
+
+    def test_small_hessen_with_several_list_crosses(self):
+        self.compare(synthetic_election([4, 0, 7, 2], 9, "h"), False, 3, extra_crosses=True)
+
+    def test_small_bayern_with_empty_list(self):
+        self.compare(synthetic_election([5, 0, 3, 6], 8, "b"), True, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Tests of the batch seat apportionment against brute-force references.
+
+Run with: python -m unittest discover scripts/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import seat_allocation  # noqa: E402
+
+CASES = 2000
+
+
+def highest_averages(votes, seats):
+    """Sainte-Laguë as counted by hand: each seat to the highest quotient
+    votes / (2s + 1), s being the list's seats so far."""
+    alloc = [0] * len(votes)
+    for _ in range(seats):
+        best = max(range(len(votes)), key=lambda i: votes[i] / (2 * alloc[i] + 1))
+        alloc[best] += 1
+    return alloc
+
+
+def largest_remainders(votes, seats):
+    """Hare-Niemeyer as counted by hand, with the majority clause: a list
+    with more than half of the votes but not more than half of the seats
+    takes the remainder seat handed out last to another list."""
+    total = sum(votes)
+    quotas = [v * seats / total for v in votes]
+    alloc = [int(q) for q in quotas]
+    by_remainder = sorted(range(len(votes)), key=lambda i: alloc[i] - quotas[i])
+    remainder_seats = by_remainder[:seats - sum(alloc)]
+    for i in remainder_seats:
+        alloc[i] += 1
+    for winner, v in enumerate(votes):
+        if 2 * v > total and 2 * alloc[winner] <= seats:
+            others = [i for i in remainder_seats if i != winner]
+            if others:
+                alloc[winner] += 1
+                alloc[others[-1]] -= 1
+    return alloc
+
+
+def random_case(rng):
+    """Votes of 2-9 lists and a seat count. Every third case has one list
+    near or above half of the votes, where the majority clause applies."""
+    n_lists = int(rng.integers(2, 10))
+    votes = rng.random(n_lists) * 10000
+    if rng.random() < 1 / 3:
+        votes[rng.integers(n_lists)] = votes.sum() * rng.uniform(0.9, 1.3)
+    return votes, int(rng.integers(1, 94))
+
+
+class ApportionmentTest(unittest.TestCase):
+    def test_sainte_lague_matches_highest_averages(self):
+        rng = np.random.default_rng(40)
+        for _ in range(CASES):
+            votes, seats = random_case(rng)
+            with self.subTest(votes=votes.tolist(), seats=seats):
+                self.assertEqual(seat_allocation.sainte_lague(votes, seats)[0].tolist(),
+                                 highest_averages(votes.tolist(), seats))
+
+    def test_hare_niemeyer_matches_largest_remainders(self):
+        rng = np.random.default_rng(41)
+        for _ in range(CASES):
+            votes, seats = random_case(rng)
+            with self.subTest(votes=votes.tolist(), seats=seats):
+                self.assertEqual(seat_allocation.hare_niemeyer(votes, seats)[0].tolist(),
+                                 largest_remainders(votes.tolist(), seats))
+
+    def test_batch_matches_single_scenarios(self):
+        rng = np.random.default_rng(42)
+        votes = rng.random((500, 6)) * 10000
+        for method in seat_allocation.METHODS.values():
+            batch = method(votes, 31)
+            for row, scenario in zip(batch, votes):
+                self.assertEqual(row.tolist(), method(scenario, 31)[0].tolist())
+
+    def test_majority_clause(self):
+        # Quotas 5.1, 2, 1.5, 1.4: the remainder seat goes to the third
+        # list, but the first has more than half of the votes and only 5 of
+        # 10 seats, so it takes that seat
+        votes = [5100, 2000, 1500, 1400]
+        self.assertEqual(seat_allocation.hare_niemeyer(votes, 10)[0].tolist(), [6, 2, 1, 1])
+        self.assertEqual(seat_allocation.hare_niemeyer(votes, 10, majority_clause=False)[0].tolist(),
+                         [5, 2, 2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+"""Tests of the source fetcher against a local stand-in HTTP server.
+
+Run with: python -m unittest discover scripts/tests
+"""
+
+import hashlib
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sources  # noqa: E402
+
+
+class Document:
+    def __init__(self, content, etag):
+        self.content = content
+        self.etag = etag
+        self.last_modified = "Sun, 01 Mar 2026 12:00:00 GMT"
+        # Bytes to send before dropping the connection, for the next GET only
+        self.cut_after = None
+        # (content, etag) the document changes to once that happened
+        self.changed = None
+        self.delay = 0.0
+
+
+class StandIn(ThreadingHTTPServer):
+    """Serves self.documents by path, honouring Range/If-Range and
+    If-None-Match like the Wahlamt servers, and records every request."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.documents = {}
+        self.requests = []  # (path, headers)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            self._respond(server.documents.get(self.path))
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _respond(self, doc):
+        if doc is None:
+            self.send_error(404)
+            return
+        if doc.delay:
+            threading.Event().wait(doc.delay)
+        if self.headers.get("If-None-Match") == doc.etag:
+            self.send_response(304)
+            self.send_header("ETag", doc.etag)
+            self.end_headers()
+            return
+
+        body, status = doc.content, 200
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") in (doc.etag, doc.last_modified):
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+            if start >= len(doc.content):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body, status = doc.content[start:], 206
+
+        self.send_response(status)
+        self.send_header("ETag", doc.etag)
+        self.send_header("Last-Modified", doc.last_modified)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{len(doc.content) - 1}/{len(doc.content)}")
+        self.end_headers()
+        if doc.cut_after is not None:
+            self.wfile.write(body[:doc.cut_after])
+            doc.cut_after = None
+            if doc.changed:
+                doc.content, doc.etag = doc.changed
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+def sha256(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+class FetchTest(unittest.TestCase):
+    def setUp(self):
+        self.server = StandIn()
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        tmp = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.tmp = tmp
+        mirror = tmp / "mirror"
+        for name, value in [
+            ("MIRROR_DIR", mirror),
+            ("OBJECTS_DIR", mirror / "objects"),
+            ("PARTIAL_DIR", mirror / "partial"),
+            ("STATE_PATH", mirror / "state.json"),
+        ]:
+            self.enterContext(mock.patch.object(sources, name, value))
+        # Retries back off for seconds; the stand-in needs none
+        self.enterContext(mock.patch.object(sources.time, "sleep"))
+
+    def add(self, name, content, etag='"v1"'):
+        doc = Document(content, etag)
+        self.server.documents[f"/{name}.pdf"] = doc
+        entry = {
+            "url": self.server.url(f"/{name}.pdf"), "path": str(self.tmp / f"{name}.pdf"), "sha256": None,
+        }
+        return doc, entry
+
+    def test_download_and_materialize(self):
+        content = b"%PDF-1.7 " + bytes(range(256)) * 100
+        _, entry = self.add("doc", content)
+        result = sources.fetch_source("doc", entry)
+        self.assertEqual(result["status"], "downloaded")
+        self.assertEqual(result["state"]["sha256"], sha256(content))
+        self.assertEqual(Path(entry["path"]).read_bytes(), content)
+        self.assertEqual(sources.object_path(sha256(content)).read_bytes(), content)
+
+    def test_resume_with_range_and_if_range(self):
+        content = bytes(range(256)) * 1024
+        doc, entry = self.add("doc", content)
+        cut = 3 * sources.CHUNK_SIZE + 100
+        doc.cut_after = cut
+        result = sources.fetch_source("doc", entry)
+
+        self.assertEqual(result["status"], "resumed", result["detail"])
+        self.assertEqual(Path(entry["path"]).read_bytes(), content)
+        (_, first), (_, second) = self.server.requests
+        self.assertNotIn("Range", first)
+        self.assertEqual(second["Range"], f"bytes={cut}-")
+        self.assertEqual(second["If-Range"], '"v1"')
+        self.assertFalse(any(sources.PARTIAL_DIR.iterdir()))
+
+    def test_changed_document_restarts_from_zero(self):
+        doc, entry = self.add("doc", b"a" * 4 * sources.CHUNK_SIZE)
+        # The document changes while the transfer is interrupted: If-Range
+        # no longer matches, so the server sends all of it again
+        doc.cut_after = 2 * sources.CHUNK_SIZE
+        doc.changed = (b"b" * 3 * sources.CHUNK_SIZE, '"v2"')
+        result = sources.fetch_source("doc", entry)
+
+        self.assertEqual(result["status"], "downloaded", result["detail"])
+        self.assertEqual(Path(entry["path"]).read_bytes(), b"b" * 3 * sources.CHUNK_SIZE)
+        self.assertEqual(self.server.requests[1][1]["If-Range"], '"v1"')
+
+    def test_unchanged_on_304(self):
+        content = b"%PDF-1.7 unchanged"
+        _, entry = self.add("doc", content)
+        first = sources.fetch_source("doc", entry)
+        second = sources.fetch_source("doc", entry, previous=first["state"])
+
+        self.assertEqual(second["status"], "unchanged")
+        self.assertEqual(second["state"], first["state"])
+        self.assertEqual(self.server.requests[1][1]["If-None-Match"], '"v1"')
+        self.assertEqual(Path(entry["path"]).read_bytes(), content)
+
+    def test_force_skips_conditional_request(self):
+        _, entry = self.add("doc", b"%PDF-1.7 forced")
+        first = sources.fetch_source("doc", entry)
+        second = sources.fetch_source("doc", entry, previous=first["state"], force=True)
+        self.assertEqual(second["status"], "downloaded")
+        self.assertNotIn("If-None-Match", self.server.requests[1][1])
+
+    def test_hash_mismatch_is_not_retried(self):
+        content = b"%PDF-1.7 tampered"
+        _, entry = self.add("doc", content)
+        entry["sha256"] = sha256(b"%PDF-1.7 original")
+        result = sources.fetch_source("doc", entry)
+
+        self.assertEqual(result["status"], "error")
+        self.assertIn("does not match the pinned", result["detail"])
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertFalse(Path(entry["path"]).exists())
+        self.assertFalse(sources.object_path(sha256(content)).exists())
+        self.assertFalse(any(sources.PARTIAL_DIR.iterdir()))
+
+    def test_per_host_limit(self):
+        registry = {}
+        for i in range(6):
+            doc, registry[f"doc{i}"] = self.add(f"doc{i}", f"%PDF-1.7 {i}".encode())
+            doc.delay = 0.2
+        results = sources.fetch_all(registry, workers=6)
+
+        self.assertEqual([r["status"] for r in results], ["downloaded"] * 6)
+        self.assertEqual(self.server.max_active, sources.PER_HOST)
+        state = sources.load_state()
+        self.assertEqual(sorted(state), sorted(registry))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Shared text normalization for candidate names and table cells.
+
+Every parser cleans the same kinds of strings: table cells with rendering
+artifacts, names with academic titles or nobility particles, nicknames in
+parentheses. The helpers here do that in one place, fold everything to
+Unicode NFC (some PDFs emit decomposed umlauts) and memoize the results in
+bounded LRU caches, since header cells and common names repeat across
+pages and documents.
+
+All cached functions return strings or tuples so cached values can't be
+mutated by callers.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+CACHE_SIZE = 16384
+
+# Academic titles as printed in front of a name, e.g. "Dr.", "Prof. Dr.",
+# "apl. Prof. Dr. med. habil.", "Dr. Dr.". A bare "Prof." also counts.
+TITLE_RE = re.compile(
+    r'^((?:apl\.\s*)?(?:Prof\.\s*)?'
+    r'(?:Dr\.(?:\s*(?:med|phil|jur|rer|Ing)\.(?:\s*(?:nat|pol)\.)?)?\s*)*'
+    r'(?:habil\.\s*)?)'
+)
+
+# Lowercase name particles, longest first so "von der" wins over "von"
+NOBILITY_PREFIXES = [
+    "von der", "von den", "van der", "van den",
+    "von", "van", "zu", "de", "della", "del", "di", "el", "al",
+]
+_NOBILITY_RE = re.compile(r'^(' + "|".join(re.escape(p) for p in NOBILITY_PREFIXES) + r')\s+')
+
+# A run of three or more identical characters, left behind by PDFs that
+# draw each glyph several times (fake bold)
+_REPEAT_RE = re.compile(r'(.)\1{2,}')
+
+# („Nickname“) after the first name
+_NICKNAME_RE = re.compile(r'\s*\(„[^)]*\)\s*')
+
+_WS_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def nfc(s: str) -> str:
+    """NFC-fold a string."""
+    return unicodedata.normalize("NFC", s)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_cell(s) -> str:
+    """Normalize a table cell: NFC, whitespace collapsed (including line
+    breaks inside the cell), stripped. None becomes ""."""
+    if not s:
+        return ""
+    return _WS_RE.sub(" ", nfc(s)).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_artifacts(s) -> str:
+    """Collapse tripled/quadrupled characters from rendering artifacts
+    ("DDDDrrrr" -> "Dr") and strip."""
+    if not s:
+        return ""
+    return _REPEAT_RE.sub(r'\1', nfc(s)).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def split_title(name: str) -> tuple[str, str]:
+    """Split a leading academic title off a name: (title, rest)."""
+    m = TITLE_RE.match(name)
+    if not m or not m.group(1):
+        return "", name
+    return m.group(1).strip(), name[m.end():].strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def split_nobility(name: str) -> tuple[str, str]:
+    """Split a leading lowercase particle off a name: ("von der", "Leyen")."""
+    m = _NOBILITY_RE.match(name)
+    if not m:
+        return "", name
+    return m.group(1), name[m.end():]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def strip_nickname(s: str) -> str:
+    """Remove parenthetical nicknames like („Bäppi La Belle“)."""
+    return _NICKNAME_RE.sub('', s).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def split_comma_name(name: str) -> tuple[str, str]:
+    """Split 'LastName, FirstName' into (lastName, firstName). Without a
+    comma the whole string is the last name."""
+    if "," not in name:
+        return name.strip(), ""
+    last_name, first_name = name.split(",", 1)
+    return last_name.strip(), first_name.strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_name(raw_name: str) -> tuple[str, str]:
+    """Parse 'LastName FirstName' or 'LastName, FirstName' into (lastName, firstName).
+
+    A leading academic title is kept in front of the last name, as printed
+    on the ballot: "Dr. Menges Evelyne" -> ("Dr. Menges", "Evelyne").
+    """
+    name = nfc(raw_name).strip().rstrip(",").strip()
+    title, name = split_title(name)
+
+    if "," in name:
+        last_name, first_name = split_comma_name(name)
+    else:
+        parts = name.split()
+        last_name = parts[0] if parts else ""
+        first_name = " ".join(parts[1:])
+
+    if title:
+        last_name = f"{title} {last_name}"
+    return last_name, first_name
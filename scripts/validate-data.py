@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Validate every election data file against the schema and invariants.
+
+Usage: python scripts/validate-data.py [--strict] [--workers N] [file ...]
+
+Checks all of public/data by default (see election_validate.py for what is
+checked). Files are validated in parallel. Problems that name a list or
+a candidate are followed by where it was read in the source document,
+from the file's provenance sidecar (see provenance.py). Exits with status
+1 if any file has errors, or with --strict also warnings.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from election_validate import load_configs, print_problems, validate_file
+from pipeline import DATA_DIR
+from provenance import by_position, list_pages, load_sidecar
+
+# "Liste 3 (SPD) #12" in a problem names a candidate, a leading
+# "Liste 3 (SPD)" a list (see election_validate._list_label)
+CANDIDATE_REF = re.compile(r"Liste (\d+) \(.*?\) #(\d+)")
+LIST_REF = re.compile(r"^Liste (\d+) \(")
+
+
+def locate_problems(path, problems):
+    """Append the source location of the lists and candidates each problem
+    names, if the file has a provenance sidecar."""
+    sidecar = load_sidecar(path)
+    if not sidecar:
+        return problems
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        positions, lists = by_position(data, sidecar), list_pages(data, sidecar)
+    except (OSError, ValueError, KeyError, TypeError):
+        return problems
+    located = []
+    for level, message in problems:
+        where = [positions.get((int(ln), int(pos))) for ln, pos in CANDIDATE_REF.findall(message)]
+        m = LIST_REF.match(message)
+        if not where and m:
+            where = [lists.get(int(m.group(1)))]
+        where = [w for w in where if w]
+        located.append((level, message + "".join(f"\n      at {w}" for w in where)))
+    return located
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("files", nargs="*", help="data files (default: public/data/*.json)")
+    ap.add_argument("--strict", action="store_true", help="fail on warnings too")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = ap.parse_args()
+
+    files = args.files or sorted(DATA_DIR.glob("*.json"))
+    paths = {os.path.basename(f): f for f in files}
+    check = partial(validate_file, configs=load_configs())
+    if args.workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(check, files, chunksize=max(1, len(files) // (args.workers * 4))))
+    else:
+        results = [check(f) for f in files]
+
+    n_errors = n_warnings = 0
+    for name, problems in results:
+        if not problems:
+            continue
+        print(name)
+        print_problems(locate_problems(paths[name], problems))
+        n_errors += sum(1 for level, _ in problems if level == "error")
+        n_warnings += sum(1 for level, _ in problems if level == "warning")
+
+    n_bad = sum(1 for _, problems in results if problems)
+    print(f"\n{len(results)} file(s) checked, {len(results) - n_bad} clean: "
+          f"{n_errors} error(s), {n_warnings} warning(s)")
+    if n_errors or (args.strict and n_warnings):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Watch source documents, parsers and election configs; rebuild on change.
+
+Usage: python scripts/watch-data.py [--force] [--interval SECONDS] [job ...]
+
+A long-running companion to build-data.py for parser work. Parsers run in
+this process (via runpy) instead of as subprocesses, and pdf_extract keeps
+every document it opened warm, so re-running a parser after a regex edit
+skips PDF layout analysis. Only jobs whose inputs, parser script, shared
+modules or config.ts changed are re-run, and each changed output is
+reported as a diff against what was on disk before the run.
+
+Edited shared modules (pdf_extract.py, textnorm.py, ...) are reloaded.
+Successful runs are recorded in the build manifest, so a later
+build-data.py knows they are up to date. Stop with Ctrl-C.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import runpy
+import sys
+import time
+import traceback
+from pathlib import Path
+
+import data_writer
+import election_validate
+import pdf_extract
+from election_diff import diff_data, is_empty, summarize
+from pipeline import (
+    JOBS, PROJECT_ROOT, SCRIPTS_DIR, SHARED_MODULES, completed_jobs, dependents, job_code, job_inputs,
+    job_outputs, job_status, load_manifest, plan_runs, record_job, save_manifest,
+)
+
+# Wait for files to stop changing for this long before rebuilding, so an
+# editor's save (truncate + write, or write + rename) is seen as one change
+SETTLE_SECONDS = 0.2
+
+
+def watched_files(names, configs):
+    """{path: [job, ...]} for every file a change of which affects a job."""
+    files = {}
+    outputs = {}
+    for name in names:
+        job = JOBS[name]
+        for path in [*job_inputs(job), *job_code(job)]:
+            files.setdefault(Path(path), []).append(name)
+        for path in job_outputs(job):
+            outputs[Path(path).name] = name
+    for data_file, config in configs.items():
+        if data_file in outputs:
+            files.setdefault(config["path"], []).append(outputs[data_file])
+    return files
+
+
+def stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def read_bytes(path):
+    try:
+        return Path(path).read_bytes()
+    except OSError:
+        return None
+
+
+def run_script(script, args):
+    """Run a parser script in this process. Returns True on success."""
+    path = SCRIPTS_DIR / script
+    saved_argv = sys.argv
+    sys.argv = [str(path), *args]
+    try:
+        runpy.run_path(str(path), run_name="__main__")
+    except SystemExit as e:
+        if e.code in (None, 0):
+            return True
+        if isinstance(e.code, str):
+            print(e.code)
+        return False
+    except Exception:
+        traceback.print_exc()
+        return False
+    finally:
+        sys.argv = saved_argv
+    return True
+
+
+def report_changes(before):
+    """Print a diff for every output whose bytes changed during the run."""
+    n_changed = 0
+    for path, old in before.items():
+        new = read_bytes(path)
+        if new == old:
+            continue
+        n_changed += 1
+        if old is None or new is None:
+            print(f"{path.name}: file {'added' if old is None else 'removed'}")
+            continue
+        diff = diff_data(json.loads(old), json.loads(new))
+        # Only formatting changed, e.g. a file normalized by data_writer
+        print(summarize(path.name, diff) if not is_empty(diff) else f"{path.name}: reformatted")
+    if not n_changed:
+        print("No output changed")
+
+
+def rebuild(names, manifest):
+    """Run the given jobs in-process and report what changed."""
+    start = time.perf_counter()
+    failed = []
+    for run in plan_runs(names):
+        outputs = [Path(p) for name in run["jobs"] for p in job_outputs(JOBS[name])]
+        before = {path: read_bytes(path) for path in outputs}
+        for paths in data_writer.STATS.values():
+            paths.clear()
+
+        print(f"\n$ {run['script']} {' '.join(run['args'])}".rstrip(), flush=True)
+        ok = run_script(run["script"], run["args"])
+        missing = [p for p in outputs if not p.exists()]
+        for path in missing:
+            print(f"ERROR: expected output not written: {path}")
+        print()
+        report_changes(before)
+
+        if ok and not missing:
+            succeeded = run["jobs"]
+        elif JOBS[run["jobs"][0]].get("batch"):
+            written = [p for paths in data_writer.STATS.values() for p in paths]
+            succeeded = completed_jobs(run["jobs"], written)
+        else:
+            succeeded = []
+        for name in run["jobs"]:
+            if name in succeeded:
+                record_job(name, manifest)
+            else:
+                failed.append(name)
+    save_manifest(manifest)
+
+    status = f"FAILED: {', '.join(failed)}" if failed else "ok"
+    print(f"[{time.strftime('%H:%M:%S')}] {', '.join(names)}: "
+          f"{time.perf_counter() - start:.1f}s, {status}", flush=True)
+
+
+def reload_shared(changed):
+    """Reload edited shared modules, in dependency order."""
+    for module_file in SHARED_MODULES:
+        if SCRIPTS_DIR / module_file in changed:
+            name = Path(module_file).stem
+            if name in sys.modules:
+                print(f"Reloading {module_file}")
+                importlib.reload(sys.modules[name])
+    # A reload resets the module's settings; the warm documents survive it
+    pdf_extract.keep_warm()
+
+
+def wait_for_changes(stamps, interval):
+    """Block until watched files change and settle. Returns the changed paths."""
+    while True:
+        time.sleep(interval)
+        changed = {path for path, old in stamps.items() if stamp(path) != old}
+        if not changed:
+            continue
+        # Let the writer finish; pick up anything else saved meanwhile
+        while True:
+            time.sleep(SETTLE_SECONDS)
+            more = {path for path, old in stamps.items() if stamp(path) != old} - changed
+            if not more:
+                break
+            changed |= more
+        for path in changed:
+            stamps[path] = stamp(path)
+        return changed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("jobs", nargs="*", help=f"jobs to watch (default: all): {', '.join(JOBS)}")
+    ap.add_argument("--force", action="store_true", help="run every watched job once at startup")
+    ap.add_argument("--interval", type=float, default=0.25, help="polling interval in seconds")
+    args = ap.parse_args()
+
+    unknown = [j for j in args.jobs if j not in JOBS]
+    if unknown:
+        ap.error(f"unknown job(s): {', '.join(unknown)}")
+
+    # Parsers expect the project root as cwd, as under build-data.py
+    os.chdir(PROJECT_ROOT)
+    pdf_extract.keep_warm()
+
+    names = args.jobs or list(JOBS)
+    files = watched_files(names, election_validate.load_configs())
+    stamps = {path: stamp(path) for path in files}
+    manifest = load_manifest()
+
+    def runnable(candidates, force):
+        selected = []
+        for name in names:
+            if name not in candidates:
+                continue
+            status, detail = job_status(name, manifest)
+            if status == "missing":
+                print(f"  skip   {name:22s} {detail}")
+            elif status == "stale" or force:
+                print(f"  stale  {name:22s} {detail or 'changed'}")
+                selected.append(name)
+        return selected
+
+    def rebuild_with_dependents(selected):
+        nonlocal files
+        ran = []
+        while selected:
+            rebuild(selected, manifest)
+            ran.extend(selected)
+            # Jobs reading what was just written (kopfleiste) are due now
+            selected = runnable(set(dependents(ran, names)), False)
+        # Globbed inputs and outputs may have gained files; the ones just
+        # written are not changes to react to
+        files = watched_files(names, election_validate.load_configs())
+        written = {Path(p) for name in ran for p in job_outputs(JOBS[name])}
+        for path in files:
+            if path not in stamps or path in written:
+                stamps[path] = stamp(path)
+
+    initial = runnable(set(names), args.force)
+    if initial:
+        rebuild_with_dependents(initial)
+    print(f"\nWatching {len(files)} file(s) for {len(names)} job(s). Ctrl-C to stop.", flush=True)
+
+    try:
+        while True:
+            changed = wait_for_changes(stamps, args.interval)
+            for path in sorted(changed):
+                print(f"\nChanged: {path}")
+            reload_shared(changed)
+            configs_changed = any(p.name == "config.ts" for p in changed)
+            if configs_changed:
+                # check_output() caches the configs
+                importlib.reload(election_validate)
+            affected = {name for path in changed for name in files[path]}
+            # Config edits only affect validation, so those jobs are forced
+            forced = {name for path in changed if path.name == "config.ts" for name in files[path]}
+            selected = runnable(affected - forced, False) + runnable(forced, True)
+            if selected:
+                rebuild_with_dependents(selected)
+            else:
+                print("Nothing to rebuild")
+    except KeyboardInterrupt:
+        save_manifest(manifest)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())